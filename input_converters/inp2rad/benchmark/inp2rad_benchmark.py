@@ -0,0 +1,327 @@
+# Copyright 1986-2026 Altair Engineering Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+# IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+import sys
+import json
+import time
+import shutil
+import filecmp
+import argparse
+import subprocess
+
+#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|
+#-  Benchmark for inp2rad: generates synthetic .inp decks of a given element count (size tiers),
+#-  converts them with inp2rad --profile, records stage times, throughput and peak memory and
+#-  compares the .rad output byte for byte against a stored baseline
+#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|
+inp2rad_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "inp2rad", "inp2rad.py")
+default_tiers = [10000, 100000, 1000000, 10000000]
+write_chunk_lines = 100000
+
+
+####################################################################################################
+# Function to write deck lines in chunks                                                           #
+####################################################################################################
+def write_lines(deck_file, lines):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= write_chunk_lines:
+            deck_file.write(''.join(chunk))
+            chunk = []
+    deck_file.write(''.join(chunk))
+
+
+####################################################################################################
+# Function to write a list of ids as data lines, 16 per line                                       #
+####################################################################################################
+def id_lines(ids):
+    for start in range(0, len(ids), 16):
+        yield ', '.join(str(value) for value in ids[start:start + 16]) + '\n'
+
+
+####################################################################################################
+# Function to generate a synthetic deck with about 'element_count' elements:                       #
+# 50% C3D8R brick block, 10% C3D10 tets, 30% S4R plate, 10% S3 plate, with nested and generated    #
+# NSET/ELSET, element based surfaces, *CONTACT PAIR, *TIE, *AMPLITUDE and *BOUNDARY cards          #
+####################################################################################################
+def generate_deck(deck_path, element_count):
+    brick_side = max(2, round((element_count * 0.5) ** (1.0 / 3.0)))
+    tet_count = max(1, element_count // 10)
+    quad_side = max(2, round((element_count * 0.3) ** 0.5))
+    tria_side = max(2, round((element_count * 0.05) ** 0.5))
+
+    node_id = 0
+    element_id = 0
+    with open(deck_path, "w") as deck_file:
+        deck_file.write("*HEADING\nsynthetic inp2rad benchmark deck\n")
+
+        # Brick block nodes and elements
+        deck_file.write("*NODE\n")
+        brick_nodes = brick_side + 1
+        brick_node_base = node_id
+        write_lines(deck_file, (
+            f"{brick_node_base + 1 + i + brick_nodes * (j + brick_nodes * k)}, {i * 1.0}, {j * 1.0}, {k * 1.0}\n"
+            for k in range(brick_nodes) for j in range(brick_nodes) for i in range(brick_nodes)
+            ))
+        node_id += brick_nodes ** 3
+
+        def brick_node(i, j, k):
+            return brick_node_base + 1 + i + brick_nodes * (j + brick_nodes * k)
+
+        deck_file.write("*ELEMENT, TYPE=C3D8R, ELSET=SOLID\n")
+        brick_element_base = element_id
+        write_lines(deck_file, (
+            f"{brick_element_base + 1 + i + brick_side * (j + brick_side * k)}, "
+            f"{brick_node(i, j, k)}, {brick_node(i + 1, j, k)}, {brick_node(i + 1, j + 1, k)}, {brick_node(i, j + 1, k)}, "
+            f"{brick_node(i, j, k + 1)}, {brick_node(i + 1, j, k + 1)}, {brick_node(i + 1, j + 1, k + 1)}, {brick_node(i, j + 1, k + 1)}\n"
+            for k in range(brick_side) for j in range(brick_side) for i in range(brick_side)
+            ))
+        element_id += brick_side ** 3
+        top_layer_first = brick_element_base + 1 + brick_side * brick_side * (brick_side - 1)
+        top_layer_last = brick_element_base + brick_side ** 3
+
+        # Quadratic tets, each with its own 10 nodes, in a row next to the brick block
+        deck_file.write("*NODE\n")
+        tet_corners = ((0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+        tet_edges = ((0, 1), (1, 2), (2, 0), (0, 3), (1, 3), (2, 3))
+        tet_points = list(tet_corners) + [
+            tuple((tet_corners[a][axis] + tet_corners[b][axis]) / 2.0 for axis in range(3)) for a, b in tet_edges
+            ]
+        tet_node_base = node_id
+        write_lines(deck_file, (
+            f"{tet_node_base + 10 * tet + point + 1}, {brick_side + 2.0 + 1.5 * tet + x}, {y}, {z}\n"
+            for tet in range(tet_count) for point, (x, y, z) in enumerate(tet_points)
+            ))
+        node_id += 10 * tet_count
+
+        deck_file.write("*ELEMENT, TYPE=C3D10, ELSET=TETS\n")
+        tet_element_base = element_id
+        write_lines(deck_file, (
+            f"{tet_element_base + tet + 1}, "
+            + ', '.join(str(tet_node_base + 10 * tet + point + 1) for point in range(10)) + '\n'
+            for tet in range(tet_count)
+            ))
+        element_id += tet_count
+
+        # Quad plate above the brick block
+        deck_file.write("*NODE\n")
+        quad_nodes = quad_side + 1
+        quad_node_base = node_id
+        quad_step = brick_side / quad_side
+        write_lines(deck_file, (
+            f"{quad_node_base + 1 + i + quad_nodes * j}, {i * quad_step}, {j * quad_step}, {brick_side + 0.5}\n"
+            for j in range(quad_nodes) for i in range(quad_nodes)
+            ))
+        node_id += quad_nodes ** 2
+
+        deck_file.write("*ELEMENT, TYPE=S4R, ELSET=PLATE\n")
+        quad_element_base = element_id
+        write_lines(deck_file, (
+            f"{quad_element_base + 1 + i + quad_side * j}, {quad_node_base + 1 + i + quad_nodes * j}, "
+            f"{quad_node_base + 2 + i + quad_nodes * j}, {quad_node_base + 2 + i + quad_nodes * (j + 1)}, "
+            f"{quad_node_base + 1 + i + quad_nodes * (j + 1)}\n"
+            for j in range(quad_side) for i in range(quad_side)
+            ))
+        element_id += quad_side ** 2
+
+        # Tria plate below the brick block
+        deck_file.write("*NODE\n")
+        tria_nodes = tria_side + 1
+        tria_node_base = node_id
+        tria_step = brick_side / tria_side
+        write_lines(deck_file, (
+            f"{tria_node_base + 1 + i + tria_nodes * j}, {i * tria_step}, {j * tria_step}, -0.5\n"
+            for j in range(tria_nodes) for i in range(tria_nodes)
+            ))
+        node_id += tria_nodes ** 2
+
+        def tria_node(i, j):
+            return tria_node_base + 1 + i + tria_nodes * j
+
+        deck_file.write("*ELEMENT, TYPE=S3, ELSET=TRIAS\n")
+        tria_element_base = element_id
+        write_lines(deck_file, (
+            f"{tria_element_base + 1 + 2 * (i + tria_side * j) + half}, "
+            + (f"{tria_node(i, j)}, {tria_node(i + 1, j)}, {tria_node(i + 1, j + 1)}\n" if half == 0
+               else f"{tria_node(i, j)}, {tria_node(i + 1, j + 1)}, {tria_node(i, j + 1)}\n")
+            for j in range(tria_side) for i in range(tria_side) for half in range(2)
+            ))
+        element_id += 2 * tria_side ** 2
+
+        # Node and element sets, generated and nested by name
+        deck_file.write(f"*NSET, NSET=FIXED, GENERATE\n{brick_node(0, 0, 0)}, {brick_node(brick_side, 0, 0)}, 1\n")
+        deck_file.write("*NSET, NSET=LOADED\n")
+        write_lines(deck_file, id_lines([quad_node_base + 1 + i for i in range(quad_nodes)]))
+        deck_file.write("*NSET, NSET=MONITOR\nFIXED, LOADED\n")
+        deck_file.write(f"*ELSET, ELSET=SOLID_TOP, GENERATE\n{top_layer_first}, {top_layer_last}, 1\n")
+        deck_file.write(f"*ELSET, ELSET=SOLID_BOTTOM, GENERATE\n{brick_element_base + 1}, "
+                        f"{brick_element_base + brick_side * brick_side}, 1\n")
+        deck_file.write("*ELSET, ELSET=SHELLS\nPLATE, TRIAS\n")
+
+        # Materials and sections
+        deck_file.write("*MATERIAL, NAME=STEEL\n*DENSITY\n7.85e-09\n*ELASTIC\n210000., 0.3\n"
+                        "*PLASTIC\n250., 0.\n350., 0.1\n")
+        deck_file.write("*MATERIAL, NAME=ALU\n*DENSITY\n2.7e-09\n*ELASTIC\n70000., 0.33\n")
+        deck_file.write("*SOLID SECTION, ELSET=SOLID, MATERIAL=STEEL\n")
+        deck_file.write("*SOLID SECTION, ELSET=TETS, MATERIAL=STEEL\n")
+        deck_file.write("*SHELL SECTION, ELSET=PLATE, MATERIAL=ALU\n1.0, 5\n")
+        deck_file.write("*SHELL SECTION, ELSET=TRIAS, MATERIAL=ALU\n1.5, 5\n")
+
+        # Element based surfaces, contact and tie
+        deck_file.write("*SURFACE, NAME=S_SOLID_TOP, TYPE=ELEMENT\nSOLID_TOP, S2\n")
+        deck_file.write("*SURFACE, NAME=S_SOLID_BOTTOM, TYPE=ELEMENT\nSOLID_BOTTOM, S1\n")
+        deck_file.write("*SURFACE, NAME=S_PLATE, TYPE=ELEMENT\nPLATE, SNEG\n")
+        deck_file.write("*SURFACE, NAME=S_TRIAS, TYPE=ELEMENT\nTRIAS, SPOS\n")
+        deck_file.write("*SURFACE INTERACTION, NAME=FRIC\n*FRICTION\n0.1\n")
+        deck_file.write("*CONTACT PAIR, INTERACTION=FRIC\nS_PLATE, S_SOLID_TOP\n")
+        deck_file.write("*TIE, NAME=TIE_TRIAS\nS_TRIAS, S_SOLID_BOTTOM\n")
+        deck_file.write("*AMPLITUDE, NAME=RAMP\n0., 0., 0.01, 1.\n")
+
+        # Step with boundary conditions
+        deck_file.write("*STEP\n*DYNAMIC, EXPLICIT\n, 0.01\n")
+        deck_file.write("*BOUNDARY\nFIXED, ENCASTRE\n")
+        deck_file.write("*BOUNDARY, AMPLITUDE=RAMP, TYPE=VELOCITY\nLOADED, 3, 3, -1000.\n")
+        deck_file.write("*END STEP\n")
+
+    return node_id, element_id
+
+
+####################################################################################################
+# Function to convert one deck with inp2rad in a separate process, returns the profile report,     #
+# the wall time and the peak RSS of the conversion process                                         #
+####################################################################################################
+def convert_deck(deck_path, inp2rad_args):
+    command = [sys.executable, inp2rad_script, os.path.basename(deck_path), "--profile"] + inp2rad_args
+
+    start_time = time.perf_counter()
+    # inp2rad waits for Enter at the end of a command line run
+    completed = subprocess.run(command, cwd=os.path.dirname(deck_path), input="\n", text=True,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    wall_time = time.perf_counter() - start_time
+
+    if completed.returncode != 0 or "### ERROR ###" in completed.stdout:
+        print(completed.stdout)
+        raise RuntimeError(f"inp2rad failed on {deck_path}")
+
+    profile_path = os.path.splitext(deck_path)[0] + "_profile.json"
+    with open(profile_path) as profile_file:
+        profile = json.load(profile_file)
+
+    # peak RSS is sampled by inp2rad at every stage checkpoint (None where the resource module is missing)
+    stage_peaks = [stage['peak_rss_kb'] for stage in profile['stages'] if stage['peak_rss_kb'] is not None]
+    peak_rss_kb = max(stage_peaks) if stage_peaks else None
+
+    return profile, wall_time, peak_rss_kb
+
+
+####################################################################################################
+# Function to compare (or store) the .rad output of a tier against the baseline directory          #
+####################################################################################################
+def compare_baseline(deck_path, baseline_dir, save_baseline):
+    deck_base = os.path.splitext(deck_path)[0]
+    rad_files = [deck_base + "_0000.rad", deck_base + "_0001.rad"]
+
+    if save_baseline:
+        os.makedirs(baseline_dir, exist_ok=True)
+        for rad_file in rad_files:
+            shutil.copy(rad_file, baseline_dir)
+        return "saved"
+
+    for rad_file in rad_files:
+        baseline_file = os.path.join(baseline_dir, os.path.basename(rad_file))
+        if not os.path.exists(baseline_file):
+            return "no baseline"
+        if not filecmp.cmp(rad_file, baseline_file, shallow=False):
+            return f"DIFFERS ({os.path.basename(rad_file)})"
+    return "identical"
+
+
+####################################################################################################
+# Run the benchmark over the size tiers                                                            #
+####################################################################################################
+def run_benchmark(tiers, work_dir, baseline_dir, save_baseline, inp2rad_args, keep_decks):
+    os.makedirs(work_dir, exist_ok=True)
+    results = []
+
+    for tier in tiers:
+        deck_path = os.path.abspath(os.path.join(work_dir, f"bench_{tier}.inp"))
+        start_time = time.perf_counter()
+        node_count, element_count = generate_deck(deck_path, tier)
+        generate_time = time.perf_counter() - start_time
+        deck_mb = os.path.getsize(deck_path) / 1e6
+        print(f"Tier {tier:>10}: {element_count} elements, {node_count} nodes, {deck_mb:.1f} MB "
+              f"(generated in {generate_time:.1f} s)")
+
+        profile, wall_time, peak_rss_kb = convert_deck(deck_path, inp2rad_args)
+
+        baseline = None
+        if baseline_dir:
+            baseline = compare_baseline(deck_path, os.path.join(baseline_dir, str(tier)), save_baseline)
+
+        result = {
+            'tier': tier,
+            'elements': element_count,
+            'nodes': node_count,
+            'deck_mb': round(deck_mb, 3),
+            'wall_time_s': round(wall_time, 3),
+            'elements_per_s': round(element_count / wall_time),
+            'deck_mb_per_s': round(deck_mb / wall_time, 3),
+            'peak_rss_kb': peak_rss_kb,
+            'baseline': baseline,
+            'stages': profile['stages'],
+            }
+        results.append(result)
+
+        slowest = sorted(profile['stages'], key=lambda stage: stage['wall_time_s'], reverse=True)[:3]
+        print(f"                 {wall_time:8.3f} s, {result['elements_per_s']} elements/s, "
+              f"peak RSS {peak_rss_kb if peak_rss_kb is not None else '-'} KB"
+              + (f", baseline: {baseline}" if baseline else ""))
+        print("                 slowest stages: "
+              + ", ".join(f"{stage['stage']} {stage['wall_time_s']:.3f} s" for stage in slowest))
+
+        if not keep_decks:
+            os.remove(deck_path)
+
+    results_path = os.path.join(work_dir, "benchmark_results.json")
+    with open(results_path, "w") as results_file:
+        json.dump({'inp2rad_args': inp2rad_args, 'results': results}, results_file, indent=2)
+    print(f"Results written to: {results_path}")
+
+    return all(result['baseline'] in (None, "identical", "saved") for result in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="inp2rad benchmark with synthetic .inp decks")
+    parser.add_argument('--tiers', type=int, nargs='+', default=default_tiers,
+                        help="Element counts of the generated decks")
+    parser.add_argument('--work-dir', default="inp2rad_benchmark", help="Directory for decks and results")
+    parser.add_argument('--baseline', help="Baseline directory to compare the .rad output with")
+    parser.add_argument('--save-baseline', action='store_true', help="Store the .rad output as the baseline")
+    parser.add_argument('--keep-decks', action='store_true', help="Keep the generated .inp decks")
+    parser.add_argument('--jobs', '-j', type=int, default=1, help="Passed on to inp2rad --jobs")
+    parser.add_argument('--mmap', action='store_true', help="Passed on to inp2rad --mmap")
+    args = parser.parse_args()
+    if args.save_baseline and not args.baseline:
+        parser.error('--save-baseline needs --baseline DIR')
+
+    inp2rad_args = ["--jobs", str(args.jobs)] + (["--mmap"] if args.mmap else [])
+    all_identical = run_benchmark(args.tiers, args.work_dir, args.baseline, args.save_baseline,
+                                  inp2rad_args, args.keep_decks)
+    sys.exit(0 if all_identical else 1)
@@ -23,6 +23,21 @@ import sys
 import re
 import time
 import argparse
+import csv
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import freeze_support
+from itertools import repeat
+import locale
+import mmap
+import hashlib
+from array import array
+try:
+    import resource
+except ImportError:  # not available on Windows, peak RSS is then not reported
+    resource = None
+from bisect import bisect_right
 
 #---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|
 #-  GLOBAL VARIABLES SECTION
@@ -43,10 +58,170 @@ radversion = 2025 #2023: for compatibility with HM 2025 and Radioss <2024
 
 debug_mode = False # enables writing of commments and intermediate files for debugging
 
+mmap_bulk_data = False # memory map the deck files and parse *NODE data straight from the file buffer
+bulk_node_blocks = [] # node tables parsed from memory mapped *NODE blocks, referenced by 'BULK BLOCK='
+output_buffer_size = 1048576 # write buffer size for the Radioss deck files
+conversion_jobs = 1 # worker processes for the conversion (--jobs), 1 runs everything in this process
+conversion_executor = None # process pool shared by the conversion, see 'conversion_pool'
+parse_chunk_lines = 50000 # *NODE / *ELEMENT data lines per chunk when parsing in worker processes
+profile_report = False # write a per stage profile (_profile.json and _profile.csv) next to the .rad files
+profile_records = [] # one record per conversion stage, filled by 'stage_checkpoint'
+profile_checkpoint = (0.0, 0.0, None) # wall time, CPU time and peak RSS at the previous stage checkpoint
+incremental_state_dir = None # directory of the parse state per deck / include file (--incremental), None = off
+incremental_state_used = set() # state entries (file hashes) read or written by this conversion
+save_model_file = False # write the converted model (_model.json and _model.bin) next to the .rad files
+model_column_min_length = 64 # integer lists at least this long are stored as binary columns in the model
+
 #---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|
 # Functions to convert aspects of the .inp Model
 #---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|
 
+####################################################################################################
+# Functions for the stage timer (--timer) and stage profile (--profile): 'stage_checkpoint' is     #
+# called at the end of each stage, profile records hold the wall time, CPU time and peak RSS       #
+# change since the previous checkpoint plus the lines scanned and objects produced by the stage    #
+####################################################################################################
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        peak_rss //= 1024  # reported in bytes on macOS
+    return peak_rss
+
+
+def start_profile():
+    global profile_checkpoint
+    profile_records.clear()
+    profile_checkpoint = (time.perf_counter(), time.process_time(), peak_rss_kb())
+
+
+def stage_checkpoint(stage_label, lines_scanned=None, objects_produced=None):
+    global profile_checkpoint
+    if run_timer:
+        elapsed_time = time.time() - start_time
+        print(f"{stage_label + ':':<25}{elapsed_time:8.3f} seconds")
+
+    if profile_report:
+        wall_time, cpu_time, peak_rss = time.perf_counter(), time.process_time(), peak_rss_kb()
+        last_wall_time, last_cpu_time, last_peak_rss = profile_checkpoint
+        profile_records.append({
+            'stage': stage_label,
+            'wall_time_s': round(wall_time - last_wall_time, 6),
+            'cpu_time_s': round(cpu_time - last_cpu_time, 6),
+            'peak_rss_kb': peak_rss,
+            'peak_rss_delta_kb': None if peak_rss is None else peak_rss - last_peak_rss,
+            'lines_scanned': lines_scanned,
+            'objects_produced': objects_produced,
+            })
+        profile_checkpoint = (wall_time, cpu_time, peak_rss)
+
+
+def write_profile_report(report_path_base):
+    with open(report_path_base + "_profile.json", "w") as json_file:
+        json.dump({'jobs': conversion_jobs, 'stages': profile_records}, json_file, indent=2)
+
+    with open(report_path_base + "_profile.csv", "w", newline='') as csv_file:
+        csv_writer = csv.DictWriter(csv_file, fieldnames=[
+            'stage', 'wall_time_s', 'cpu_time_s', 'peak_rss_kb', 'peak_rss_delta_kb',
+            'lines_scanned', 'objects_produced'
+            ])
+        csv_writer.writeheader()
+        csv_writer.writerows(profile_records)
+
+    print(f"Stage profile written to: {report_path_base}_profile.json/.csv")
+
+
+####################################################################################################
+# Functions to get the process pool shared by the conversion (created on first use with --jobs)    #
+# and to close it at the end of the conversion. The workers may be started by spawn (Windows,      #
+# macOS, frozen executable) and only get their task arguments, not the globals set from argv       #
+####################################################################################################
+def conversion_pool():
+    global conversion_executor
+    if conversion_executor is None:
+        conversion_executor = ProcessPoolExecutor(max_workers=conversion_jobs)
+    return conversion_executor
+
+
+def close_conversion_pool():
+    global conversion_executor
+    if conversion_executor is not None:
+        conversion_executor.shutdown(cancel_futures=True)
+        conversion_executor = None
+
+
+####################################################################################################
+# Fixed width card formatting shared by the node, element, group and surface writers: integer      #
+# fields are 10 wide, coordinates 20 wide (15 significant digits). Whole rows are formatted with   #
+# one prebuilt format call and id lists in one buffer that is then cut into card lines             #
+####################################################################################################
+int_field_format = "{:>10}".format
+int_row_formats = {}
+
+def int_row_format(field_count, lead='', id_newline=False):
+    row_key = (field_count, lead, id_newline)
+    if row_key not in int_row_formats:
+        id_separator = '\n' if id_newline else ''
+        int_row_formats[row_key] = (lead + "{:>10}" + id_separator + "{:>10}" * (field_count - 1)).format
+    return int_row_formats[row_key]
+
+
+def format_id_rows(values, per_line=10):
+    # all fields in one buffer, cut in card lines when no value is wider than its field
+    text = ''.join(map(int_field_format, values))
+    if len(text) != 10 * len(values):
+        return '\n'.join(''.join(map(int_field_format, values[start:start + per_line]))
+                         for start in range(0, len(values), per_line))
+    line_length = 10 * per_line
+    return '\n'.join([text[start:start + line_length] for start in range(0, len(text), line_length)])
+
+
+node_row_format = "{:>10}{:>20.15g}{:>20.15g}{:>20.15g}".format
+
+def format_node_rows(node_ids, node_coords, start, end):
+    return '\n'.join(map(
+        node_row_format, node_ids[start:end], node_coords[3 * start:3 * end:3],
+        node_coords[3 * start + 1:3 * end:3], node_coords[3 * start + 2:3 * end:3]
+        ))
+
+
+def format_segment_row(nodes):
+    if not nodes:
+        return ' ' * 10
+    return int_row_format(len(nodes), ' ' * 10)(*nodes)
+
+
+####################################################################################################
+# Function to tokenize a '*KEYWORD, PARAM=VALUE, ...' header line once into a normalized record:   #
+# keyword is upper case with single spaces, param names are upper case, values keep their case     #
+####################################################################################################
+header_field_split = re.compile(r'\s*,\s*')
+header_space_split = re.compile(r'\s+')
+
+def parse_keyword_header(line):
+    header_fields = header_field_split.split(line.strip())
+    keyword_field, has_value, first_value = header_fields[0].partition('=')
+    keyword_words = header_space_split.split(keyword_field.strip())
+    params = {}
+
+    # Headers written without a comma, e.g. '*SYSTEM ID=1' from preprocessing
+    if has_value and len(keyword_words) > 1:
+        params[keyword_words.pop().upper()] = first_value.strip()
+
+    for field in header_fields[1:]:
+        param_name, _, param_value = field.partition('=')
+        param_name = ' '.join(header_space_split.split(param_name.strip())).upper()
+        if param_name:
+            params[param_name] = param_value.strip()
+
+    keyword = ' '.join(keyword_words).upper()
+    if keyword.startswith('* '):
+        keyword = '*' + keyword[2:]
+
+    return keyword, params
+
+
 ####################################################################################################
 # Function to identify nodes defined in systems                                                    #
 ####################################################################################################
@@ -65,7 +240,7 @@ def convert_transforms(input_lines):
                 transform_id = parts[1].strip()
 
             i += 1
-            coords_line = input_lines[i].strip()
+            coords_line = input_lines[i].strip() if i < len(input_lines) else "*"
             if coords_line.startswith("*"):
                 transform_id = 0
 
@@ -132,13 +307,13 @@ def read_nodes(input_lines):
                 transform_id = parts[1].strip()
             inside_node_section = False
 
-        if (
-            line.lower().startswith('*node')
-            and 'print' not in line.lower()
-            and 'output' not in line.lower()
-            and 'file' not in line.lower()
-            ):
+        if is_node_data_header(line):
             inside_node_section = True
+            # Node data already parsed from the memory mapped deck
+            bulk_block = parse_keyword_header(line)[1].get('BULK BLOCK')
+            if bulk_block is not None:
+                node_data.setdefault(transform_id, []).append(bulk_node_blocks[int(bulk_block)])
+                line = line[:line.rfind(', BULK BLOCK=')] + '\n'
 
         elif inside_node_section and line.startswith('*'):
             inside_node_section = False
@@ -169,23 +344,109 @@ def read_nodes(input_lines):
 
 
 ####################################################################################################
-# Function to convert nodes                                                                        #
+# Function to check if a line is a *NODE header followed by node data lines                        #
+####################################################################################################
+def is_node_data_header(line):
+    line = line.lower()
+    return (
+        line.startswith('*node')
+        and 'print' not in line
+        and 'output' not in line
+        and 'file' not in line
+        )
+
+
+####################################################################################################
+# Function to parse a block of node lines in bulk into an array backed node table:                 #
+# int64 node IDs and float64 X,Y,Z coordinates stored flat (3 values per node)                     #
+####################################################################################################
+def parse_node_block(lines):
+    # Regular 'id, x, y, z' blocks (3 commas on every line) are converted in one go, anything else
+    # line by line; the per line check keeps a 3 and a 5 field line from passing as two nodes
+    if {line.count(',') for line in lines} == {3}:
+        fields = ','.join(lines).split(',')
+        node_ids = array('q', map(int, fields[0::4]))
+        del fields[0::4]
+        node_coords = array('d', map(float, fields))
+        return node_ids, node_coords
+
+    node_ids = array('q')
+    node_coords = array('d')
+    for line in lines:
+        nodes = line.strip().split(',')
+        coords = [float(coord.strip()) for coord in nodes[1:]]
+        # Missing coordinates are zero, as on the .inp side
+        coords.extend([0.0] * (3 - len(coords)))
+        node_ids.append(int(nodes[0]))
+        node_coords.extend(coords[:3])
+
+    return node_ids, node_coords
+
+
+####################################################################################################
+# Function to parse a block of node lines, split in chunks over the worker processes when large    #
+####################################################################################################
+def parse_node_block_chunks(lines):
+    if conversion_jobs < 2 or len(lines) < 2 * parse_chunk_lines:
+        return parse_node_block(lines)
+
+    line_chunks = [lines[start:start + parse_chunk_lines] for start in range(0, len(lines), parse_chunk_lines)]
+    node_ids, node_coords = array('q'), array('d')
+    for chunk_ids, chunk_coords in conversion_pool().map(parse_node_block, line_chunks):
+        node_ids.extend(chunk_ids)
+        node_coords.extend(chunk_coords)
+    return node_ids, node_coords
+
+
+####################################################################################################
+# Function to convert nodes, keeps one node table per transform (system) ID                        #
 ####################################################################################################
 def convert_nodes(node_data):
     node_lines = {}
     for transform_id, nodes in node_data.items():
-        node_lines[transform_id] = []
-        for line in nodes:
-            # Process the node data
-            nodes = line.strip().split(',')
-            node_id = nodes[0].strip()
-            coords = [float(coord.strip()) for coord in nodes[1:]]
-            radioss_coords = ''.join(f"{coord:>20.15g}" for coord in coords)
-            node_lines[transform_id].append(f"{node_id:>10}{radioss_coords}")
+        # node data is a mix of text lines and (ids, coords) tables from memory mapped blocks
+        node_tables = []
+        node_text_lines = []
+        for node_item in nodes:
+            if isinstance(node_item, str):
+                node_text_lines.append(node_item)
+                continue
+            if node_text_lines:
+                node_tables.append(node_text_lines)
+                node_text_lines = []
+            node_tables.append(node_item)
+        if node_text_lines or not node_tables:
+            node_tables.append(node_text_lines)
+
+        # Text blocks are parsed here, large ones in chunks of lines by the worker processes (--jobs)
+        node_tables = [
+            parse_node_block_chunks(node_table) if isinstance(node_table, list) else node_table
+            for node_table in node_tables
+            ]
+
+        node_ids, node_coords = node_tables[0]
+        if len(node_tables) > 1:
+            node_ids, node_coords = array('q'), array('d')
+            for table_ids, table_coords in node_tables:
+                node_ids.extend(table_ids)
+                node_coords.extend(table_coords)
+        node_lines[transform_id] = {'ids': node_ids, 'coords': node_coords}
 
     return node_lines
 
 
+####################################################################################################
+# Function to write a node table as /NODE card lines in bulk                                       #
+####################################################################################################
+def write_node_table(output_file, node_table, chunk_size=100000):
+    node_ids = node_table['ids']
+    node_coords = node_table['coords']
+
+    for start in range(0, len(node_ids), chunk_size):
+        end = min(start + chunk_size, len(node_ids))
+        output_file.write(format_node_rows(node_ids, node_coords, start, end) + '\n')
+
+
 ####################################################################################################
 # Function to preprocess ELEMENT D3COUP and COUPLNG DISTRIBUTION lines for easier handling         #
 ####################################################################################################
@@ -328,6 +589,7 @@ def convert_nsets(input_lines, nset_references):
     nset_counter = 0  # Counter to assign unique IDs to NSETs
     output_lines = []  # Store all lines to write back (debug feature)
     nested_nset = False
+    nested_nset_lines = {}  # output line position of each nested NSET, filled once all NSETs are read
 
     i = 0  # Line index for iteration
     while i < len(input_lines):
@@ -390,9 +652,7 @@ def convert_nsets(input_lines, nset_references):
             nset_name = re.search(r'nset\s*=\s*([^,]+)', line, re.IGNORECASE).group(1).strip()
             nsets[nset_name] = {'id': None, 'values': [], 'is_referenced': False}
 
-            for parents in nset_references.items():
-                if nset_name in parents:
-                    nested_nset = True
+            nested_nset = nset_name in nset_references
 
             # Move to the next line(s) to gather the NSET values
             i += 1
@@ -421,31 +681,9 @@ def convert_nsets(input_lines, nset_references):
 
             elif nested_nset is True:
 
-                for referenced_nset in nset_references.get(nset_name, []):
-
-                    # Retrieve values from `nsets` for each referenced NSET, if it exists
-                    contained_values = []
-
-                    if referenced_nset in nsets:
-                        contained_values.extend(nsets[referenced_nset].get('values', []))
-
-                    # Extend the main nset_values list with the contained values
-                    nset_values.extend(contained_values)
-                    #print(f"The new set content is: {nset_values}") #for debug
-
-                # Store the collected values in the `nsets` dictionary
-                nsets[nset_name]['values'].extend(
-                    [
-                        value.strip() if isinstance(value, str) else value
-                        for value in nset_values
-                        if str(value).strip()
-                    ]
-                )
-
-                # Add the collected NSET values to the output
+                # Values of the referenced NSETs are filled in once all NSETs are read
                 output_lines.append(line + '\n')
-                for j in range(0, len(nset_values), 8):
-                    output_lines.append(', '.join(map(str, nset_values[j:j + 8])) + '\n')
+                nested_nset_lines[len(output_lines)] = nset_name
 
                 # Reset `nested_nset` after processing
                 nested_nset = False
@@ -575,6 +813,24 @@ def convert_nsets(input_lines, nset_references):
             output_lines.append(line + '\n')
             i += 1
 
+    # Resolve the nested NSETs (also referencing NSETs defined later) and add their values to the output
+    if nested_nset_lines:
+        nset_items = {name: nset_data['values'] for name, nset_data in nsets.items()}
+        nset_items.update(nset_references)
+        resolved_nsets = resolve_set_references(nset_items, "NSET", nested_nset_lines.values())
+
+        filled_lines = []
+        line_start = 0
+        for position, nset_name in sorted(nested_nset_lines.items()):
+            filled_lines.extend(output_lines[line_start:position])
+            nset_values = resolved_nsets[nset_name].tolist()
+            nsets[nset_name]['values'].extend(nset_values)
+            for j in range(0, len(nset_values), 8):
+                filled_lines.append(', '.join(map(str, nset_values[j:j + 8])) + '\n')
+            line_start = position
+        filled_lines.extend(output_lines[line_start:])
+        output_lines = filled_lines
+
     # Assign unique IDs to each NSET
     for nset_name in nsets:
         nset_counter += 1
@@ -608,11 +864,8 @@ def create_nblocks(nsets):
         grnod_block = "#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|\n"
         grnod_block += f"/GRNOD/NODE/{nset_counter}\n"
         grnod_block += f"{nset_name}\n"
-        for i in range(0, len(nset_values), 10):
-            row_values = nset_values[i:i+10]
-            # Right-justified columns
-            formatted_row = ''.join(f"{value:>10}" for value in row_values)
-            grnod_block += formatted_row + '\n'
+        if nset_values:
+            grnod_block += format_id_rows(nset_values) + '\n'
 
         thnod_block = ""
         if nset_data['is_referenced']:
@@ -622,8 +875,7 @@ def create_nblocks(nsets):
             thnod_block += "#     var1      var2      var3      var4      var5      var6      var7      var8      var9     var10\n"
             thnod_block += "DEF       REACX     REACY     REACZ\n"
             thnod_block += "#    NODid     Iskew                                           NODname\n"
-            formatted_values = '\n'.join(f"{value:>10}" for value in nset_values)
-            thnod_block += formatted_values + '\n'
+            thnod_block += format_id_rows(nset_values, 1) + '\n'
 
         nset_blocks.append((grnod_block, thnod_block))
 
@@ -650,47 +902,33 @@ def convert_materials(input_lines, nset_counter):
     while i < len(input_lines):
         line = input_lines[i].strip()
 
-        material_line_pattern = r'^\s*\*MATERIAL\s*,?\s*NAME\s*=\s*[^,]+(?:\s*,\s*.+)?$'
-        material_line_match = re.search(material_line_pattern, line, re.IGNORECASE)
-
-        rigid_line_pattern = r'^\s*\*ELEMENT\s*,?\s*TYPE\s*=\s*R3D[34]\b.*$'
-        rigid_line_match = re.search(rigid_line_pattern, line, re.IGNORECASE)
-
-        superelastic_pattern = r'^\*\s*superelastic\b'
-        superelastic_line_match = re.search(superelastic_pattern, line, re.IGNORECASE)
-
-        damping_pattern = r'^\*\s*damping\b'
-        damping_line_match = re.search(damping_pattern, line, re.IGNORECASE)
-
-        viscoelastic_pattern = r'^\*\s*viscoelastic\s*,?\s*time\s*=\s*prony\b'
-        viscoelastic_line_match = re.search(viscoelastic_pattern, line, re.IGNORECASE)
-
-        neohooke_pattern = r'^\*\s*hyperelastic\b.*,\s*neo hooke'
-        neohooke_line_match = re.search(neohooke_pattern, line, re.IGNORECASE)
-
-        ogden_pattern = r'^\*\s*hyperelastic\b.*,\s*ogden'
-        ogden_line_match = re.search(ogden_pattern, line, re.IGNORECASE)
-
-        marlow_pattern = r'^\*\s*hyperelastic\b.*,\s*marlow'
-        marlow_line_match = re.search(marlow_pattern, line, re.IGNORECASE)
-
-        reducedpoly_pattern = r'^\*\s*hyperelastic\b.*,\s*reduced polynomial'
-        reducedpoly_line_match = re.search(reducedpoly_pattern, line, re.IGNORECASE)
-
-        poly_pattern = r'^\*\s*hyperelastic\b.*,\s*polynomial'
-        poly_line_match = re.search(poly_pattern, line, re.IGNORECASE)
-
-        mooney_rivlin_pattern = r'^\*\s*hyperelastic\b.*,\s*mooney-rivlin'
-        mooney_rivlin_line_match = re.search(mooney_rivlin_pattern, line, re.IGNORECASE)
-
-        mass_line_pattern = r'^\s*\*mass\s*,?\s*elset\s*=\s*[^,]+(?:\s*,\s*.+)?$'
-        mass_line_match = re.search(mass_line_pattern, line, re.IGNORECASE)
+        # only keyword lines can open a material entry, data lines are read by their keyword below
+        if not line.startswith('*'):
+            i += 1
+            continue
 
-        damage_init_jc_pattern = r'^\s*\*damage\s+initiation\s*,\s*criterion\s*=\s*johnson\s+cook\b.*$'
-        damage_init_jc_line_match = re.search(damage_init_jc_pattern, line, re.IGNORECASE)
+        keyword, params = parse_keyword_header(line)
+        hyperelastic_line = keyword == '*HYPERELASTIC'
+
+        material_line_match = keyword == '*MATERIAL' and 'NAME' in params
+        rigid_line_match = keyword == '*ELEMENT' and params.get('TYPE', '').upper() in ('R3D3', 'R3D4')
+        superelastic_line_match = keyword == '*SUPERELASTIC'
+        damping_line_match = keyword == '*DAMPING'
+        viscoelastic_line_match = keyword == '*VISCOELASTIC' and params.get('TIME', '').upper() == 'PRONY'
+        neohooke_line_match = hyperelastic_line and 'NEO HOOKE' in params
+        ogden_line_match = hyperelastic_line and 'OGDEN' in params
+        marlow_line_match = hyperelastic_line and 'MARLOW' in params
+        reducedpoly_line_match = hyperelastic_line and 'REDUCED POLYNOMIAL' in params
+        poly_line_match = hyperelastic_line and 'POLYNOMIAL' in params
+        mooney_rivlin_line_match = hyperelastic_line and 'MOONEY-RIVLIN' in params
+        mass_line_match = keyword == '*MASS' and bool(params.get('ELSET'))
+        damage_init_jc_line_match = (
+            keyword == '*DAMAGE INITIATION'
+            and ' '.join(params.get('CRITERION', '').split()).upper() == 'JOHNSON COOK'
+            )
 
         if material_line_match:
-            material_name = line.split('=')[1].strip()#.lower()
+            material_name = params['NAME']
 
             # Assign a material ID to the material
             material_names[material_name] = {'material_id': material_id}
@@ -705,15 +943,12 @@ def convert_materials(input_lines, nset_counter):
         #special treatment for rigid entities, we create a mat void,
         #since in .inp, there is no material
         if rigid_line_match:
-            # regular expression to find 'elset =' or 'elset='
-            elset_pattern = r'\bELSET\s*=\s*("([\w\-+/ ]+)"|[\w\-+/ ]+)'
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
             #this_check_added since rigid elements don't need to be in an elset
             #but should have been assigned one by now!
-            if elset_match is None:
+            if not params.get('ELSET'):
                 print("Something went wrong")
             else:
-                material_name = elset_match.group(1).strip()
+                material_name = params['ELSET']
                 if material_name not in other_rigid_mats_processed_list:
                     # Assign a material ID to the material
                     material_names[material_name] = {'material_id': material_id}
@@ -728,10 +963,7 @@ def convert_materials(input_lines, nset_counter):
 
         # mass
         elif mass_line_match:
-            # regular expression to find 'elset =' or 'elset='
-            elset_pattern = r'\bELSET\s*=\s*("([\w\-+/ ]+)"|[\w\-+/ ]+)'
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
-            material_name = elset_match.group(1).strip()
+            material_name = params['ELSET']
             if material_name:
                 material_id += 1  # Increment the material ID
                 material_names[material_name] = {'material_id': material_id}
@@ -747,7 +979,7 @@ def convert_materials(input_lines, nset_counter):
             continue
 
         # density
-        elif current_material_name and line.lower().startswith('*density'):
+        elif current_material_name and keyword == '*DENSITY':
             i += 1
             density_line = input_lines[i].strip()
             
@@ -770,9 +1002,9 @@ def convert_materials(input_lines, nset_counter):
         # elastic
         elif (
                 current_material_name
-                and line.strip().lower().startswith('*elastic')
-                and not 'traction' in line.strip().lower()
-                and not 'engineering constants' in line.strip().lower()
+                and keyword == '*ELASTIC'
+                and not 'TRACTION' in params.get('TYPE', '').upper()
+                and not 'ENGINEERING CONSTANTS' in params.get('TYPE', '').upper()
             ):
             i += 1
             elastic_line = input_lines[i].strip()
@@ -801,9 +1033,9 @@ def convert_materials(input_lines, nset_counter):
         # in future we may look to implement orthotropy along with orthotropic property
         elif (
                 current_material_name
-                and line.strip().lower().startswith('*elastic')
-                and not 'traction' in line.strip().lower()
-                and 'engineering constants' in line.strip().lower()
+                and keyword == '*ELASTIC'
+                and not 'TRACTION' in params.get('TYPE', '').upper()
+                and 'ENGINEERING CONSTANTS' in params.get('TYPE', '').upper()
              ):
             print("**************************************************************************")
             print("### WARNING ###: Engineering Constants (Orthotropy) Defined In Material:")
@@ -837,9 +1069,9 @@ def convert_materials(input_lines, nset_counter):
         # connect/cohesive
         elif (
                 current_material_name
-                and line.strip().lower().startswith('*elastic')
-                and not 'engineering constants' in line.strip().lower()
-                and 'traction' in line.strip().lower()
+                and keyword == '*ELASTIC'
+                and not 'ENGINEERING CONSTANTS' in params.get('TYPE', '').upper()
+                and 'TRACTION' in params.get('TYPE', '').upper()
              ):
             i += 1
             cohesive_line = input_lines[i].strip()
@@ -865,7 +1097,7 @@ def convert_materials(input_lines, nset_counter):
                 print("*************************************************************************")
 
         # hyperfoam
-        elif current_material_name and line.lower().startswith('*hyperfoam'):
+        elif current_material_name and keyword == '*HYPERFOAM':
             hyperfoam_line = input_lines[i].strip()
 
             # Default value for Poisson's ratio in case one is not defined in data
@@ -937,7 +1169,7 @@ def convert_materials(input_lines, nset_counter):
                     material_names[current_material_name][f'pr{j+1}'] = pr_values[j]
 
         # uniaxial test
-        elif current_material_name and line.lower().startswith('*uniaxial test data'):
+        elif current_material_name and keyword == '*UNIAXIAL TEST DATA':
             i += 1
             uniaxial_data = []  # Initialize uniaxial_data for the current material
             while i < len(input_lines) and not input_lines[i].startswith('*'):
@@ -1058,7 +1290,7 @@ def convert_materials(input_lines, nset_counter):
                 extra_material_names[current_material_name]['dampbeta'] = beta_value
 
         # plastic
-        elif current_material_name and line.strip().lower().startswith('*plastic'):
+        elif current_material_name and keyword == '*PLASTIC':
             # Check if there's rate data and extract the rate value if it exists
             rate_data = 'rate=' in line.lower()
             rate_value = 1.0  # Default rate value
@@ -1114,7 +1346,7 @@ def convert_materials(input_lines, nset_counter):
             i -= 1  # Adjust index to account for the last increment
 
         # ogden params
-        elif current_material_name and ogden_line_match and not 'test data input' in line.lower():
+        elif current_material_name and ogden_line_match and 'TEST DATA INPUT' not in params:
             i += 1
             ogden_line = input_lines[i].strip()
             ogden_values = ogden_line.split(',')[0:3]
@@ -1131,7 +1363,7 @@ def convert_materials(input_lines, nset_counter):
             material_names[current_material_name]['neohooke_mu'] = neohooke_mu
 
         # ogden test_data
-        elif current_material_name and ogden_line_match and 'test data input' in line.lower():
+        elif current_material_name and ogden_line_match and 'TEST DATA INPUT' in params:
             # Set default values
             ogden_n = 1
             poissrat = 0.45
@@ -1169,7 +1401,7 @@ def convert_materials(input_lines, nset_counter):
 
 
         # reduced_polynomial test_data (converts to ogden)
-        elif current_material_name and reducedpoly_line_match and 'test data input' in line.lower():
+        elif current_material_name and reducedpoly_line_match and 'TEST DATA INPUT' in params:
             # Set default values
             ogden_n = 1
             poissrat = 0.45
@@ -1189,7 +1421,7 @@ def convert_materials(input_lines, nset_counter):
             material_names[current_material_name]['poissrat'] = poissrat
 
         # polynomial test_data (converts to ogden)
-        elif current_material_name and poly_line_match and 'test data input' in line.lower():
+        elif current_material_name and poly_line_match and 'TEST DATA INPUT' in params:
             # Set default values
             ogden_n = 1
             poissrat = 0.45
@@ -1209,7 +1441,7 @@ def convert_materials(input_lines, nset_counter):
             material_names[current_material_name]['poissrat'] = poissrat
 
         # polynomial with n terms (converts to bergstrom boyce)
-        elif current_material_name and poly_line_match and 'test data input' not in line.lower():
+        elif current_material_name and poly_line_match and 'TEST DATA INPUT' not in params:
             # Set default values
             poly_n = 0
             poly_c10 = 0.0
@@ -1278,7 +1510,7 @@ def convert_materials(input_lines, nset_counter):
             material_names[current_material_name]['poly_d3'] = poly_d3
 
         # reduced polynomial with n terms (converts to bergstrom boyce)
-        elif current_material_name and reducedpoly_line_match and 'test data input' not in line.lower():
+        elif current_material_name and reducedpoly_line_match and 'TEST DATA INPUT' not in params:
             # Set default values
             poly_n = 0
             poly_c10 = 0.0
@@ -1960,8 +2192,6 @@ def convert_props(input_lines, material_names, non_numeric_references=None, else
     property_names = {}  # initializes a dictionary of Property name relationships
     other_rigid_props_processed_list = []
     i = 0  # Initialize an index for iterating through input_lines
-    # Regular expression pattern for ELSET matching
-    elset_pattern = r'\bELSET\s*=\s*("([\w\-+/ ]+)"|[\w\-+/ ]+)'
 
     # Set default for non_numeric_references if not provided (for backwards compatibility)
     if non_numeric_references is None:
@@ -1972,39 +2202,31 @@ def convert_props(input_lines, material_names, non_numeric_references=None, else
     while i < len(input_lines):
         line = input_lines[i].strip()
 
-        #define pattern matches for various element types (+ rigid elements)
-        shell_line_pattern = r'^\s*\*SHELL\s+SECTION\s*,\s*ELSET\s*=\s*[^,]+\s*,?.*$'
-        shell_line_match = re.search(shell_line_pattern, line, re.IGNORECASE)
-        shell_general_pattern = r'^\s*\*SHELL\s+GENERAL\s+SECTION\s*,\s*ELSET\s*=\s*[^,]+\s*,?.*$'
-        shell_general_match = re.search(shell_general_pattern, line, re.IGNORECASE)
-        membrane_line_pattern = r'^\s*\*membrane\s+SECTION\s*,\s*ELSET\s*=\s*[^,]+\s*,?.*$'
-        membrane_line_match = re.search(membrane_line_pattern, line, re.IGNORECASE)
-        solid_line_pattern = r'^\s*\*solid\s+SECTION\s*,\s*ELSET\s*=\s*[^,]+\s*,?.*$'
-        solid_line_match = re.search(solid_line_pattern, line, re.IGNORECASE)
-        cohesive_line_pattern = r'^\s*\*cohesive\s+SECTION\s*,\s*ELSET\s*=\s*[^,]+\s*,?.*$'
-        cohesive_line_match = re.search(cohesive_line_pattern, line, re.IGNORECASE)
-        connector_line_pattern = r'^\s*\*connector\s+SECTION\s*,\s*ELSET\s*=\s*[^,]+\s*,?.*$'
-        connector_line_match = re.search(connector_line_pattern, line, re.IGNORECASE)
-        rigid_line_pattern = r'^\s*\*ELEMENT\s*,?\s*TYPE\s*=\s*R3D[34]\b.*$'
-        rigid_line_match = re.search(rigid_line_pattern, line, re.IGNORECASE)
-        massdef_line_pattern = r'^\s*\*MASS\s*,\s*ELSET\s*=\s*[^,]+\s*,?.*$'
-        massdef_line_match = re.search(massdef_line_pattern, line, re.IGNORECASE)
-        dcoup_line_pattern = r'^\s*\*ELEMENT\s*,?\s*TYPE\s*=\s*DCOUP3D\b.*$'
-        dcoup_line_match = re.search(dcoup_line_pattern, line, re.IGNORECASE)
-        spring_line_pattern = r'^\s*\*SPRING\s*,\s*ELSET\s*=\s*[^,]+\s*,?.*$'
-        spring_line_match = re.search(spring_line_pattern, line, re.IGNORECASE)
+        # only section/element keyword lines define properties, skip the data lines
+        if not line.startswith('*'):
+            i += 1
+            continue
+
+        #define matches for various element types (+ rigid elements) from the header record
+        keyword, params = parse_keyword_header(line)
+        has_elset = bool(params.get('ELSET'))
+        element_type = params.get('TYPE', '').upper() if keyword == '*ELEMENT' else ''
+        shell_line_match = keyword == '*SHELL SECTION' and has_elset
+        shell_general_match = keyword == '*SHELL GENERAL SECTION' and has_elset
+        membrane_line_match = keyword == '*MEMBRANE SECTION' and has_elset
+        solid_line_match = keyword == '*SOLID SECTION' and has_elset
+        cohesive_line_match = keyword == '*COHESIVE SECTION' and has_elset
+        connector_line_match = keyword == '*CONNECTOR SECTION' and has_elset
+        rigid_line_match = element_type in ('R3D3', 'R3D4')
+        massdef_line_match = keyword == '*MASS' and has_elset
+        dcoup_line_match = element_type == 'DCOUP3D'
+        spring_line_match = keyword == '*SPRING' and has_elset
 
         if shell_line_match or shell_general_match:
             section_type = 'shell'
-            # regular expression to find 'material =' or 'material='
-            mat_pattern = r'material\s*=\s*([^,]+)'
-            match = re.search(mat_pattern, line, re.IGNORECASE)
-            # regular expression to find 'elset =' or 'elset='
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
-            if elset_match:
-                property_name = elset_match.group(1).strip()
-            if match:
-                material_name = match.group(1).strip()
+            property_name = params['ELSET']
+            if 'MATERIAL' in params:
+                material_name = params['MATERIAL']
             i += 1 # Move to the next line
             if i < len(input_lines):
                 next_line = input_lines[i].strip()
@@ -2012,15 +2234,9 @@ def convert_props(input_lines, material_names, non_numeric_references=None, else
 
         elif membrane_line_match:
             section_type = 'membrane'
-            # regular expression to find 'material =' or 'material='
-            mat_pattern = r'material\s*=\s*([^,]+)'
-            match = re.search(mat_pattern, line, re.IGNORECASE)
-            # regular expression to find 'elset =' or 'elset='
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
-            if elset_match:
-                property_name = elset_match.group(1).strip()
-            if match:
-                material_name = match.group(1).strip()
+            property_name = params['ELSET']
+            if 'MATERIAL' in params:
+                material_name = params['MATERIAL']
             i += 1 # Move to the next line
             if i < len(input_lines):
                 next_line = input_lines[i].strip()
@@ -2028,35 +2244,20 @@ def convert_props(input_lines, material_names, non_numeric_references=None, else
 
         elif solid_line_match:
             section_type = 'solid'
-            # regular expression to find 'material =' or 'material='
-            mat_pattern = r'material\s*=\s*([^,]+)'
-            match = re.search(mat_pattern, line, re.IGNORECASE)
-            # regular expression to find 'elset =' or 'elset='
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
-            if elset_match:
-                property_name = elset_match.group(1).strip()
-            if match:
-                material_name = match.group(1).strip()
+            property_name = params['ELSET']
+            if 'MATERIAL' in params:
+                material_name = params['MATERIAL']
 
         elif cohesive_line_match:
             section_type = 'cohesive'
-            # regular expression to find 'material =' or 'material='
-            mat_pattern = r'material\s*=\s*([^,]+)'
-            match = re.search(mat_pattern, line, re.IGNORECASE)
-            # regular expression to find 'elset =' or 'elset='
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
-            if elset_match:
-                property_name = elset_match.group(1).strip()
-            if match:
-                material_name = match.group(1).strip()
+            property_name = params['ELSET']
+            if 'MATERIAL' in params:
+                material_name = params['MATERIAL']
 
         elif connector_line_match:
             section_type = 'connector'
-            # regular expression to find 'elset =' or 'elset='
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
-            if elset_match:
-                property_name = elset_match.group(1).strip()
-                material_name = elset_match.group(1).strip()
+            property_name = params['ELSET']
+            material_name = params['ELSET']
             i += 1 # Move to the next line
             if i < len(input_lines):
                 next_line = input_lines[i].strip()
@@ -2064,11 +2265,8 @@ def convert_props(input_lines, material_names, non_numeric_references=None, else
 
         elif spring_line_match:
             section_type = 'spring'
-            # regular expression to find 'elset =' or 'elset='
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
-            if elset_match:
-                property_name = elset_match.group(1).strip()
-                material_name = elset_match.group(1).strip()
+            property_name = params['ELSET']
+            material_name = params['ELSET']
             i += 2 # Move on 2 lines
             if i < len(input_lines):
                 next_line = input_lines[i].strip()
@@ -2076,32 +2274,24 @@ def convert_props(input_lines, material_names, non_numeric_references=None, else
 
         elif massdef_line_match:
             section_type = 'massdef'
-            # regular expression to find 'elset =' or 'elset='
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
-            if elset_match:
-                property_name = elset_match.group(1).strip()
-                material_name = elset_match.group(1).strip()
+            property_name = params['ELSET']
+            material_name = params['ELSET']
 
         elif dcoup_line_match:
             section_type = 'dcoup'
-            # regular expression to find 'elset =' or 'elset='
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
-
-            if elset_match:
+            if params.get('ELSET'):
                 property_name = "this_is_a_dcoup3d"
 
 
         #deal with rigid bodies
         elif rigid_line_match:
-            # regular expression to find 'elset =' or 'elset='
-            elset_match = re.search(elset_pattern, line, re.IGNORECASE)
             #this_check_added since rigid elements don't need to be in an elset
             #but should have been assigned one by now!
-            if elset_match is None:
+            if not params.get('ELSET'):
                 print ("Something Went Wrong")
             else:
                 section_type = 'void_for_rigid'
-                material_name = elset_match.group(1).strip()
+                material_name = params['ELSET']
 
         else:
             section_type = None
@@ -2291,7 +2481,7 @@ def convert_props(input_lines, material_names, non_numeric_references=None, else
             property_name = None
 
         elif section_type == 'void_for_rigid':
-            property_name = elset_match.group(1).strip()
+            property_name = params['ELSET']
             if property_name not in other_rigid_props_processed_list:
                 # Assign a property ID to the property
                 property_names[property_name] = {'prop_id': prop_id, 'part_id': part_id_counter}
@@ -2607,6 +2797,41 @@ def convert_connbeams(property_names):
     return conn_beams
 
 
+####################################################################################################
+# Function to build the name indexes matching ELSET names to properties, built once after the      #
+# properties are converted and shared by the element, part and surface conversion:                 #
+#   'property': normalized name (no spaces, lower case) -> property name                           #
+#   'property_lower': lower case name -> property names                                            #
+#   'grouping': normalized referenced ELSET name -> first grouping ELSET referencing it            #
+#   'part_grouping': referenced ELSET name -> first grouping ELSET that is a property (part)       #
+####################################################################################################
+def normalized_name(name):
+    return name.replace(" ", "").lower()
+
+
+def build_name_indexes(property_names, non_numeric_references):
+    property_index = {}
+    property_lower_index = {}
+    for property_name in property_names:
+        property_index.setdefault(normalized_name(property_name), property_name)
+        property_lower_index.setdefault(property_name.lower(), []).append(property_name)
+
+    grouping_index = {}
+    part_grouping_index = {}
+    for grouping_elset, referenced_elsets in non_numeric_references.items():
+        for referenced_elset in referenced_elsets:
+            grouping_index.setdefault(normalized_name(referenced_elset), grouping_elset)
+            if grouping_elset in property_names:
+                part_grouping_index.setdefault(referenced_elset, grouping_elset)
+
+    return {
+        'property': property_index,
+        'property_lower': property_lower_index,
+        'grouping': grouping_index,
+        'part_grouping': part_grouping_index,
+        }
+
+
 ####################################################################################################
 # Function to extract standalone *ELSET (not prop linked), used by (Some) TIE, RBODY and DLOAD     #
 #   and elsets referenced by name by those types that ARE prop linked,                             #
@@ -2615,10 +2840,22 @@ def convert_connbeams(property_names):
 def prepare_elsets(input_lines, elsets_for_expansion_dict, relsets_for_expansion_dict):
     elset_dicts = {} #initialize a dictionary to track elsets being processed between defs
     elset_processing_list = []
+    elset_directory = {} # normalized elset name -> list of (first data line, end line) spans
 
     inside_surface_section = False
+    open_elset_span = None
 
-    for line in input_lines:
+    for line_index, line in enumerate(input_lines):
+
+        if line.startswith('*'):
+            # close the data span of the previous *ELSET and record a new one
+            if open_elset_span is not None:
+                open_elset_span.append(line_index)
+                open_elset_span = None
+            keyword, params = parse_keyword_header(line)
+            if keyword == '*ELSET' and params.get('ELSET'):
+                open_elset_span = [line_index + 1]
+                elset_directory.setdefault(params['ELSET'].upper(), []).append(open_elset_span)
 
         stype_pattern = r'^\*SURFACE\s*,\s*(?!.*TYPE\s*=\s*NODE)(?:NAME\s*=\s*[^\s,]+|TYPE\s*=\s*[^\s,]+)'
 
@@ -2647,6 +2884,9 @@ def prepare_elsets(input_lines, elsets_for_expansion_dict, relsets_for_expansion
             elset_processing_list.append(elset_name)
             continue
 
+    if open_elset_span is not None:
+        open_elset_span.append(len(input_lines))
+
     for elset_name, elements in elsets_for_expansion_dict.items():
         elset_values = []
         elset_values.extend(list(elements))
@@ -2657,10 +2897,8 @@ def prepare_elsets(input_lines, elsets_for_expansion_dict, relsets_for_expansion
         elset_values.extend(list(elements))
         elset_dicts[elset_name] = elset_values
 
-# this section creates a dictionary of elset element ids recorded against their elset_name
-    inside_elset_section = False
-    elset_name = None
-
+# this section creates a dictionary of elset element ids recorded against their elset_name,
+# each name is looked up in the elset directory built above
     for elset_name in elset_processing_list:
 
         if elset_name == 'IGNORE Automatic Surf All':
@@ -2669,32 +2907,22 @@ def prepare_elsets(input_lines, elsets_for_expansion_dict, relsets_for_expansion
         if elset_name in elset_dicts.keys():
             continue
 
-        elset_line_pattern = r'^\s*\*ELSET\s*,?\s*ELSET\s*=\s*{}\b'.format(re.escape(elset_name))
-        elset_found = False
-        if run_timer and elset_name:
-            elapsed_time = time.time() - start_time
-            print(f"Elsets being built:      {elapsed_time:8.3f} seconds: ({elset_name} done)")
-
-        for line in input_lines:
-            elset_line_match = re.search(elset_line_pattern, line, re.IGNORECASE)
-            if elset_line_match:
-                inside_elset_section = True
-                elset_values = []
-                elset_found = True
-                continue
-
-            if inside_elset_section and line.startswith('*'):
-                inside_elset_section = False
-                continue
+        elset_values = []
+        for span_start, span_end in elset_directory.get(elset_name.upper(), []):
+            span_values = []
+            for line in input_lines[span_start:span_end]:
+                if line.strip():  # Skip empty lines
+                    values = line.split(',')
+                    span_values.extend([value.strip() for value in values if value.strip()])
+            # a later definition of the same elset replaces an earlier one
+            if span_values:
+                elset_values = span_values
 
-            if inside_elset_section and line.strip():  # Skip empty lines
-                values = line.split(',')
-                elset_values.extend([value.strip() for value in values if value.strip()])
-                elset_dicts[elset_name] = elset_values
+        elset_dicts[elset_name] = elset_values
 
-        if not elset_found:
-            elset_values = []
-            elset_dicts[elset_name] = elset_values
+    if run_timer:
+        elapsed_time = time.time() - start_time
+        print(f"Elsets being built:      {elapsed_time:8.3f} seconds: ({len(elset_processing_list)} referenced)")
 
     return elset_dicts
 
@@ -2703,7 +2931,7 @@ def prepare_elsets(input_lines, elsets_for_expansion_dict, relsets_for_expansion
 # Function to parse element data, has sub functions                                                #
 # 'process_element_block' and 'convert_elements'                                                   #
 ####################################################################################################
-def parse_element_data(input_lines, elset_dicts, property_names, non_numeric_references, nsets, nset_counter):
+def parse_element_data(input_lines, elset_dicts, property_names, nsets, nset_counter, name_indexes):
     max_elem_id = 0  # Initialize the maximum element ID
     element_dicts = {}  # Dictionary to store element type dictionaries
     current_element_type = None
@@ -2718,22 +2946,22 @@ def parse_element_data(input_lines, elset_dicts, property_names, non_numeric_ref
         if match: #Instance of a *ELEMENT line
             #calls 'process_element_block' subdef below
             if any(current_element_block):
-                element_dict, max_elem_id = process_element_block(
+                element_store, max_elem_id = process_element_block(
                     current_element_block, current_element_type, max_elem_id
                     )
 
-                if element_dict:
+                if element_store['ids']:
                     current_element_dicts = element_dicts.get(current_element_type, [])
                     #print(current_element_type)
                     try:
                         property_id = property_names[prop_match]['prop_id']
                         part_id = property_names[prop_match].get('part_id', property_id)  # Get part_id or fallback to prop_id
                         current_element_dicts.append(
-                            {"ELSET": elset, "PROP_ID": property_id, "PART_ID": part_id, "elements": element_dict}
+                            {"ELSET": elset, "PROP_ID": property_id, "PART_ID": part_id, "elements": element_store}
                             )
                     except:
                         current_element_dicts.append(
-                            {"ELSET": elset, "PROP_ID": 0, "PART_ID": 0, "elements": element_dict}
+                            {"ELSET": elset, "PROP_ID": 0, "PART_ID": 0, "elements": element_store}
                             )
                         print (f"### WARNING ###: No Property Found for Elements in Elset: {elset}")
                         print ("                 Property may not have been recognised")
@@ -2765,20 +2993,14 @@ def parse_element_data(input_lines, elset_dicts, property_names, non_numeric_ref
                 elset = elset_match.group(1).strip()
 
                 # Normalize elset for comparison: remove spaces and convert to lowercase
-                normalized_elset = elset.replace(" ", "").lower()
+                normalized_elset = normalized_name(elset)
 
                 # Find the property in a case-insensitive and space-agnostic way
-                prop_match = next(
-                    (key for key in property_names
-                     if key.replace(" ", "").lower() == normalized_elset), None
-                )
+                prop_match = name_indexes['property'].get(normalized_elset)
 
                 if not prop_match:
                     # Check in non_numeric_references with similar normalization
-                    prop_match = next(
-                        (key for key, values in non_numeric_references.items()
-                         if normalized_elset in [v.replace(" ", "").lower() for v in values]), None
-                    )
+                    prop_match = name_indexes['grouping'].get(normalized_elset)
 
                 if prop_match:
                     property_id = property_names[prop_match]['prop_id']
@@ -2797,7 +3019,7 @@ def parse_element_data(input_lines, elset_dicts, property_names, non_numeric_ref
             remaining_lines.append(line)
             #calls 'process_element_block' subdef below
             if any(current_element_block):
-                element_dict, max_elem_id = process_element_block(
+                element_store, max_elem_id = process_element_block(
                     current_element_block, current_element_type, max_elem_id
                     )
                 current_element_dicts = element_dicts.get(current_element_type, [])
@@ -2805,11 +3027,11 @@ def parse_element_data(input_lines, elset_dicts, property_names, non_numeric_ref
                     property_id = property_names[prop_match]['prop_id']
                     part_id = property_names[prop_match].get('part_id', property_id)  # Get part_id or fallback to prop_id
                     current_element_dicts.append(
-                        {"ELSET": elset, "PROP_ID": property_id, "PART_ID": part_id, "elements": element_dict}
+                        {"ELSET": elset, "PROP_ID": property_id, "PART_ID": part_id, "elements": element_store}
                         )
                 except:
                     current_element_dicts.append(
-                        {"ELSET": elset, "PROP_ID": 0, "PART_ID": 0, "elements": element_dict}
+                        {"ELSET": elset, "PROP_ID": 0, "PART_ID": 0, "elements": element_store}
                         )
                     print (f"### WARNING ###: No Property Found for Elements in Elset: {elset}")
                     print ("                 Property may not have been recognised")
@@ -2825,8 +3047,8 @@ def parse_element_data(input_lines, elset_dicts, property_names, non_numeric_ref
 
     #calls the 'convert elements' subdef below (format for output)
     (elset_dicts, element_lines, sh3n_list, shell_list, brick_list,
-     nsets, nset_counter) = convert_elements(non_numeric_references, elset_dicts,
-     element_dicts, property_names, nsets, nset_counter
+     nsets, nset_counter) = convert_elements(elset_dicts, element_dicts, nsets, nset_counter,
+     name_indexes
      )
 
     if not debug_mode:
@@ -2853,24 +3075,24 @@ def parse_element_data(input_lines, elset_dicts, property_names, non_numeric_ref
 
 
 ####################################################################################################
-# SubFunction to process the element block passed by 'parse_element_data'                          #
+# Number of nodes per element for each supported element type                                      #
 ####################################################################################################
-def process_element_block(current_element_block, current_element_type, max_elem_id):
-    element_list = []  # List to store dictionaries for element IDs and nodes
+element_type_nodes = {
+    'MASS': 1, 'DCOUP3D': 1, 'CONN3D2': 2, 'SPRINGA': 2, 'S3': 3, 'S3R': 3, 'M3D3': 3,
+    'R3D3': 3, 'S4': 4, 'S4R': 4, 'R3D4': 4, 'M3D4R': 4, 'C3D4': 4,
+    'C3D6': 6, 'COH3D6': 6, 'SC6R': 6, 'SC8R': 8, 'C3D8': 8,
+    'C3D8I': 8, 'COH3D8': 8,'C3D8R': 8, 'C3D10': 10, 'C3D10M': 10
+}
 
-    # Concatenate lines into a single string, removing newlines and whitespaces
-    element_data_str = ''.join(current_element_block)
-    element_data_str = element_data_str.replace(' ', '')
 
-    # Determine the number of nodes based on the element_type
-    element_type_nodes = {
-        'MASS': 1, 'DCOUP3D': 1, 'CONN3D2': 2, 'SPRINGA': 2, 'S3': 3, 'S3R': 3, 'M3D3': 3,
-        'R3D3': 3, 'S4': 4, 'S4R': 4, 'R3D4': 4, 'M3D4R': 4, 'C3D4': 4,
-        'C3D6': 6, 'COH3D6': 6, 'SC6R': 6, 'SC8R': 8, 'C3D8': 8,
-        'C3D8I': 8, 'COH3D8': 8,'C3D8R': 8, 'C3D10': 10, 'C3D10M': 10
-    }
+####################################################################################################
+# SubFunction to process the element block passed by 'parse_element_data'                          #
+# elements are stored in flat arrays: 'ids' (one per element) and 'nodes' (nnodes per element)     #
+####################################################################################################
+def process_element_block(current_element_block, current_element_type, max_elem_id):
 
     num_nodes = element_type_nodes.get(current_element_type.upper(), 0)
+    element_store = {'ids': array('q'), 'nodes': array('q'), 'nnodes': num_nodes}
 
     if num_nodes == 0:
         print("")
@@ -2891,7 +3113,59 @@ def process_element_block(current_element_block, current_element_type, max_elem_
             input("Press Enter to continue...")
             print ("")
 
-        return [element_list, max_elem_id]
+        return element_store, max_elem_id
+
+    # Large blocks with one element per line are parsed in chunks by the worker processes
+    if conversion_jobs > 1 and len(current_element_block) >= 2 * parse_chunk_lines:
+        line_chunks = [
+            current_element_block[start:start + parse_chunk_lines]
+            for start in range(0, len(current_element_block), parse_chunk_lines)
+            ]
+        chunk_stores = list(conversion_pool().map(parse_element_chunk, line_chunks, repeat(num_nodes)))
+        if all(chunk_store is not None for chunk_store in chunk_stores):
+            for chunk_ids, chunk_nodes in chunk_stores:
+                element_store['ids'].extend(chunk_ids)
+                element_store['nodes'].extend(chunk_nodes)
+            if element_store['ids']:
+                max_elem_id = max(max_elem_id, max(element_store['ids']))
+            return element_store, max_elem_id
+
+    elements = element_block_values(current_element_block)
+    stride = num_nodes + 1
+
+    if len(elements) % stride == 0:
+        # Complete block, convert ids and connectivity in one pass each
+        element_store['ids'] = array('q', map(int, elements[0::stride]))
+        del elements[0::stride]
+        element_store['nodes'] = array('q', map(int, elements))
+        if element_store['ids']:
+            max_elem_id = max(max_elem_id, max(element_store['ids']))
+        return element_store, max_elem_id
+
+    # Iterate through the elements with step size of num_nodes + 1 (1 for element ID + nodes)
+    for i in range(0, len(elements), stride):
+        # If we can't get the full set of element ID + nodes, mark it as incomplete
+        if i + stride > len(elements):
+            incomplete_element = elements[i:]
+            print(f"### WARNING ###: Incomplete element definition at index {i}")
+            print(f"Incomplete element data: {incomplete_element}")
+            continue
+
+        element_id = int(elements[i])
+        max_elem_id = max(max_elem_id, element_id)
+        element_store['ids'].append(element_id)
+        element_store['nodes'].extend(map(int, elements[i + 1: i + stride]))
+
+    return element_store, max_elem_id
+
+
+####################################################################################################
+# Function to split element data lines into their values (element ID and nodes, as strings)        #
+####################################################################################################
+def element_block_values(element_block):
+    # Concatenate lines into a single string, removing newlines and whitespaces
+    element_data_str = ''.join(element_block)
+    element_data_str = element_data_str.replace(' ', '')
 
     # Remove trailing '\n' and replace newlines with commas
     element_data_str = element_data_str.rstrip('\n').replace('\n', ',').replace(',,', ',')
@@ -2900,66 +3174,130 @@ def process_element_block(current_element_block, current_element_type, max_elem_
     if element_data_str.endswith(','):
     # Remove trailing comma
         element_data_str = element_data_str.rstrip(',')
-    else:
-        element_data_str = element_data_str
 
     # Split the concatenated string into element and node data
     elements = element_data_str.split(',')
+    if '' in elements:
+        elements = [value for value in elements if value]
+    return elements
 
-    # Iterate through the elements with step size of num_nodes + 1 (1 for element ID + nodes)
-    for i in range(0, len(elements), num_nodes + 1):
-        # If we can't get the full set of element ID + nodes, mark it as incomplete
-        if i + num_nodes + 1 > len(elements):
-            incomplete_element = elements[i:]
-            print(f"### WARNING ###: Incomplete element definition at index {i}")
-            print(f"Incomplete element data: {incomplete_element}")
-            continue
 
+####################################################################################################
+# Worker function to parse a chunk of element lines, returns None unless each line holds exactly   #
+# one complete element (the chunk then starts and ends on element boundaries)                      #
+####################################################################################################
+def parse_element_chunk(element_lines, num_nodes):
+    elements = element_block_values(element_lines)
+    stride = num_nodes + 1
+    if len(elements) != stride * len(element_lines):
+        return None
+
+    element_ids = array('q', map(int, elements[0::stride]))
+    del elements[0::stride]
+    return element_ids, array('q', map(int, elements))
 
-        element_id = int(elements[i])
-        max_elem_id = max(max_elem_id, element_id)
 
-        # Extract nodes and validate their count
-        nodes = elements[i + 1: i + num_nodes + 1]
-        if len(nodes) != num_nodes:
-            print(f"### WARNING ###: Element {element_id} has an incorrect number of nodes ({len(nodes)} instead of {num_nodes})")
-            print(f"Element data: ID = {element_id}, Nodes = {nodes}")
-            continue  # Skip malformed elements
+####################################################################################################
+# Accessors for the element stores built by 'process_element_block'                                #
+####################################################################################################
+def element_count(element_store):
+    return len(element_store['ids'])
 
-        element_data = {
-            'element_id': element_id,
-            'nodes': nodes
-        }
-        element_list.append(element_data)
 
-    return element_list, max_elem_id
+def element_nodes(element_store, index):
+    nnodes = element_store['nnodes']
+    return element_store['nodes'][index * nnodes:(index + 1) * nnodes]
+
+
+def element_order_by_id(element_store):
+    element_ids = element_store['ids']
+    return sorted(range(len(element_ids)), key=element_ids.__getitem__)
+
+
+def iter_elements(element_store, sort_by_id=False):
+    element_ids = element_store['ids']
+    nodes = element_store['nodes']
+    nnodes = element_store['nnodes']
+    if sort_by_id:
+        order = element_order_by_id(element_store)
+    else:
+        order = range(len(element_ids))
+    for index in order:
+        yield element_ids[index], nodes[index * nnodes:(index + 1) * nnodes]
+
+
+####################################################################################################
+# Radioss element card layouts: (comment text, card keyword, node order, element list, id newline) #
+####################################################################################################
+element_card_layouts = {
+    'CONN3D2': ('Spring Elements', 'SPRING', None, 'spring', False),
+    'SPRINGA': ('Spring Elements', 'SPRING', None, 'spring', False),
+    'S3': ('3 Noded Shell Elements', 'SH3N', None, 'sh3n', False),
+    'S3R': ('3 Noded Shell Elements', 'SH3N', None, 'sh3n', False),
+    'R3D3': ('3 Noded Shell Elements', 'SH3N', None, 'sh3n', False),
+    'M3D3': ('3 Noded Shell Elements', 'SH3N', None, 'sh3n', False),
+    'S4': ('4 Noded Shell Elements', 'SHELL', None, 'shell', False),
+    'S4R': ('4 Noded Shell Elements', 'SHELL', None, 'shell', False),
+    'R3D4': ('4 Noded Shell Elements', 'SHELL', None, 'shell', False),
+    'M3D4R': ('4 Noded Shell Elements', 'SHELL', None, 'shell', False),
+    'C3D4': ('4 Noded Tetrahedral Elements', 'TETRA4', (0, 2, 1, 3), 'brick', False),
+    'C3D6': ('6 Noded Degenerated Penta Elements', 'BRICK', (0, 1, 2, 2, 3, 4, 5, 5), 'brick', False),
+    'COH3D6': ('6 Noded Degenerated Penta Cohesive Elements', 'BRICK', (0, 1, 2, 2, 3, 4, 5, 5), 'brick', False),
+    'SC6R': ('6 Noded Degenerated Penta Elements', 'BRICK', (0, 1, 2, 2, 3, 4, 5, 5), 'brick', False),
+    'C3D8': ('8 Noded Brick Elements', 'BRICK', None, 'brick', False),
+    'C3D8I': ('8 Noded Brick Elements', 'BRICK', None, 'brick', False),
+    'C3D8R': ('8 Noded Brick Elements', 'BRICK', None, 'brick', False),
+    'COH3D8': ('8 Noded Cohesive Elements', 'BRICK', None, 'brick', False),
+    'SC8R': ('8 Noded Thick Shell Elements', 'BRICK', None, 'brick', False),
+    'C3D10': ('10 Noded Tetrahedral Elements', 'TETRA10', (0, 2, 1, 3, 6, 5, 4, 7, 9, 8), 'brick', True),
+    'C3D10M': ('10 Noded Tetrahedral Elements', 'TETRA10', (0, 2, 1, 3, 6, 5, 4, 7, 9, 8), 'brick', True),
+}
+
+
+####################################################################################################
+# Generator to format the element rows of one element store in chunks of card lines, the rows      #
+# are only formatted when the deck is written                                                      #
+####################################################################################################
+def format_element_rows(element_store, node_order, id_newline, order, chunk_size=100000):
+    element_ids = element_store['ids']
+    nodes = element_store['nodes']
+    nnodes = element_store['nnodes']
+    if node_order is None:
+        node_order = tuple(range(nnodes))
+    row_format = int_row_format(len(node_order) + 1, id_newline=id_newline)
+    in_order = len(node_order) == nnodes and node_order == tuple(range(nnodes))
+
+    for start in range(0, len(order), chunk_size):
+        chunk_order = order[start:start + chunk_size]
+        if in_order:
+            rows = [row_format(element_ids[index], *nodes[index * nnodes:(index + 1) * nnodes])
+                    for index in chunk_order]
+        else:
+            rows = [row_format(element_ids[index], *[nodes[index * nnodes + position] for position in node_order])
+                    for index in chunk_order]
+        yield '\n'.join(rows)
 
 
 ####################################################################################################
 # Function to convert elements data dictionary for output                                          #
 ####################################################################################################
-def convert_elements(non_numeric_references, elset_dicts, element_dicts, property_names, nsets, nset_counter):
+def convert_elements(elset_dicts, element_dicts, nsets, nset_counter, name_indexes):
     element_lines = []
     sh3n_list = []
     shell_list = []
     brick_list = []
     spring_list = []
+    element_id_lists = {'sh3n': sh3n_list, 'shell': shell_list, 'brick': brick_list, 'spring': spring_list}
 
     for element_type, element_list in element_dicts.items():
 
         for element_dict in element_list:
             elset = element_dict["ELSET"]
+            element_store = element_dict["elements"]
 
             # Determine the correct part name for comments
-            # For consolidated parts, find the grouping ELSET that contains this elset
-            part_name = elset  # Default to individual ELSET name
-            for grouping_elset, referenced_elsets in non_numeric_references.items():
-                if elset in referenced_elsets:
-                    # This elset is part of a grouping - check if it's consolidation
-                    if grouping_elset in property_names:
-                        # This is consolidation - use the grouping ELSET name
-                        part_name = grouping_elset
-                        break
+            # For consolidated parts (grouping ELSET is a property) use the grouping ELSET name
+            part_name = name_indexes['part_grouping'].get(elset, elset)
 
             property_id = element_dict["PROP_ID"]
             part_id = element_dict.get("PART_ID", property_id)  # Get part_id or fallback to prop_id
@@ -2974,246 +3312,63 @@ def convert_elements(non_numeric_references, elset_dicts, element_dicts, propert
                 element_lines.append(f"nodes with added mass from Elset {elset}")
                 element_lines.append("#   NODEID")
 
-                all_nodes = []  # Collect all nodes
-                for element in element_dict["elements"]:
-                    all_nodes.extend(element.get('nodes', []))  # Flatten node lists
+                all_nodes = element_store['nodes']
 
                 # Format output with 10 nodes per line
-                for i in range(0, len(all_nodes), 10):
-                    chunk = all_nodes[i:i+10]  # Take 10 nodes at a time
-                    formatted_nodes = ''.join(value.rjust(10) for value in chunk)  # Format as fixed-width
-                    element_lines.append(formatted_nodes)  # Append to output
+                if all_nodes:
+                    element_lines.append(format_id_rows(all_nodes))
+                continue
 
-            elif element_type.lower() == "conn3d2" or element_type.lower() == "springa":
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# Spring Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/SPRING/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to spring_list
-                    spring_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(', ')
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}{formatted_nodes}")
-
-            elif (element_type.lower() == "s3"
-                or element_type.lower() == "s3r"
-                or element_type.lower() == "r3d3"
-                or element_type.lower() == "m3d3"
-                ):
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# 3 Noded Shell Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/SH3N/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to sh3n_list
-                    sh3n_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(', ')
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}{formatted_nodes}")
-
-                    #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_id
-                    if elset in elset_dicts:
-                        elset_dict = elset_dicts[elset]
-                        elset_dict.append(element_id)
-
-            elif (element_type.lower() == "s4"
-                or element_type.lower() == "s4r"
-                or element_type.lower() == "r3d4"
-                or element_type.lower() == "m3d4r"
-                ):
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# 4 Noded Shell Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/SHELL/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to shell_list
-                    shell_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(', ')
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}{formatted_nodes}")
-
-                    #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_id
-                    if elset in elset_dicts:
-                        elset_dict = elset_dicts[elset]
-                        elset_dict.append(element_id)
-
-            elif element_type.lower() == "c3d4":
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# 4 Noded Tetrahedral Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/TETRA4/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to brick_list
-                    brick_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(', ')
-                    nodes = [nodes[0], nodes[2], nodes[1], nodes[3]]
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}{formatted_nodes}")
-
-                    #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_id
-                    if elset in elset_dicts:
-                        elset_dict = elset_dicts[elset]
-                        elset_dict.append(element_id)
-
-            elif element_type.lower() == "c3d6":
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# 6 Noded Degenerated Penta Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/BRICK/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to brick_list
-                    brick_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(', ')
-                    nodes = [nodes[0], nodes[1], nodes[2], nodes[2], nodes[3], nodes[4], nodes[5], nodes[5]]
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}{formatted_nodes}")
-
-                    #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_id
-                    if elset in elset_dicts:
-                        elset_dict = elset_dicts[elset]
-                        elset_dict.append(element_id)
-
-            elif element_type.lower() == "coh3d6":
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# 6 Noded Degenerated Penta Cohesive Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/BRICK/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to brick_list
-                    brick_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(', ')
-                    nodes = [nodes[0], nodes[1], nodes[2], nodes[2], nodes[3], nodes[4], nodes[5], nodes[5]]
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}{formatted_nodes}")
-
-                    #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_id
-                    if elset in elset_dicts:
-                        elset_dict = elset_dicts[elset]
-                        elset_dict.append(element_id)
-
-            elif element_type.lower() == "sc6r":
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# 6 Noded Degenerated Penta Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/BRICK/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to brick_list
-                    brick_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(', ')
-                    nodes = [nodes[0], nodes[1], nodes[2], nodes[2], nodes[3], nodes[4], nodes[5], nodes[5]]
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}{formatted_nodes}")
-
-                    #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_id
-                    if elset in elset_dicts:
-                        elset_dict = elset_dicts[elset]
-                        elset_dict.append(element_id)
-
-            elif (element_type.lower() == "c3d8"
-                or element_type.lower() == "c3d8i"
-                or element_type.lower() == "c3d8r"
-                ):
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# 8 Noded Brick Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/BRICK/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to brick_list
-                    brick_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(',')
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}{formatted_nodes}")
-
-                    #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_id
-                    if elset in elset_dicts:
-                        elset_dict = elset_dicts[elset]
-                        elset_dict.append(element_id)
-
-            elif element_type.lower() == "coh3d8":
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# 8 Noded Cohesive Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/BRICK/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to brick_list
-                    brick_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(',')
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}{formatted_nodes}")
-
-                    #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_id
-                    if elset in elset_dicts:
-                        elset_dict = elset_dicts[elset]
-                        elset_dict.append(element_id)
-
-            elif element_type.lower() == "sc8r":
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# 8 Noded Thick Shell Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/BRICK/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to brick_list
-                    brick_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(',')
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}{formatted_nodes}")
-
-                    #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_id
-                    if elset in elset_dicts:
-                        elset_dict = elset_dicts[elset]
-                        elset_dict.append(element_id)
-
-            elif (element_type.lower() == "c3d10"
-                or element_type.lower() == "c3d10m"
-                ):
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"# 10 Noded Tetrahedral Elements for PART: {part_name}, PID: {part_id}")
-                element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                element_lines.append(f"/TETRA10/{part_id}")  # Output section header - use part_id
-                for element in sorted(element_dict["elements"], key=lambda e: int(e.get('element_id', 0))):
-                    element_id = element.get('element_id', '')
-                    # Add element_id to brick_list
-                    brick_list.append(element_id)
-                    nodes = ', '.join(element.get('nodes', []))
-                    nodes = nodes.split(', ')
-                    nodes = [nodes[0], nodes[2], nodes[1], nodes[3], nodes[6], nodes[5], nodes[4], nodes[7], nodes[9], nodes[8]]
-                    formatted_nodes = ''.join([value.rjust(10) for value in nodes])
-                    element_lines.append(f"{element_id:>10}\n{formatted_nodes}")
-
-                    #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_id
-                    if elset in elset_dicts:
-                        elset_dict = elset_dicts[elset]
-                        elset_dict.append(element_id)
+            card_layout = element_card_layouts.get(element_type.upper())
+            if card_layout is None:
+                continue
+            comment_text, card_name, node_order, id_list_name, id_newline = card_layout
+
+            element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
+            element_lines.append(f"# {comment_text} for PART: {part_name}, PID: {part_id}")
+            element_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
+            element_lines.append(f"/{card_name}/{part_id}")  # Output section header - use part_id
+
+            if not element_count(element_store):
+                continue
+
+            order = element_order_by_id(element_store)
+            sorted_ids = [element_store['ids'][index] for index in order]
+            # Element rows are only formatted when the deck is written, see 'write_card_lines'
+            element_lines.append({'elements': element_store, 'node_order': node_order,
+                                  'id_newline': id_newline, 'order': array('q', order)})
+
+            # Add element ids to the element type list
+            element_id_lists[id_list_name].extend(sorted_ids)
+
+            #check if this elset is referenced in elset_dicts (means it maybe referenced by another card), add the element_ids
+            if id_list_name != 'spring' and elset in elset_dicts:
+                elset_dicts[elset].extend(sorted_ids)
 
     return elset_dicts, element_lines, sh3n_list, shell_list, brick_list, nsets, nset_counter
 
 
+####################################################################################################
+# Element ID set engine, the element ids of each element type are held in frozensets, an elset is  #
+# split by type with set intersections (cost follows the set sizes, not the largest element id)    #
+####################################################################################################
+def element_ids_of_type(elset_ids, type_ids):
+    return sorted(elset_ids & type_ids)
+
+
+def build_element_id_sets(sh3n_list, shell_list, brick_list):
+    return {
+        'sh3n': frozenset(sh3n_list),
+        'shell': frozenset(shell_list),
+        'brick': frozenset(brick_list),
+    }
+
+
 ####################################################################################################
 # Takes data from 'convert_elsets' and 'convert_elements' and writes the Radioss Groups            #
 # for 'Standalone' (not prop linked) Elsets                                                        #
 ####################################################################################################
-def write_element_groups(nset_counter, nsets, sh3n_list, shell_list, brick_list, elset_dicts):
+def write_element_groups(nset_counter, nsets, element_id_sets, elset_dicts):
     elset_mapping_set = {}  # Create empty dictionaries
     elset_blocks = []
     grnset_lines = []
@@ -3240,9 +3395,14 @@ def write_element_groups(nset_counter, nsets, sh3n_list, shell_list, brick_list,
                 print(f"### WARNING ###: Skipping non-integer value '{value}' in elset '{elset_name}'") # For debug
                 continue
 
-        elset_values_sh3n = list(set(numeric_values) & set(sh3n_list))
-        elset_values_shell = list(set(numeric_values) & set(shell_list))
-        elset_values_brick = list(set(numeric_values) & set(brick_list))
+        elset_ids = set(numeric_values)
+        invalid_ids = sorted(element_id for element_id in elset_ids if element_id <= 0)
+        if invalid_ids:
+            print(f"### WARNING ###: Skipping {len(invalid_ids)} invalid element ids {invalid_ids[:10]} in elset '{elset_name}'")
+            elset_ids.difference_update(invalid_ids)
+        elset_values_sh3n = element_ids_of_type(elset_ids, element_id_sets['sh3n'])
+        elset_values_shell = element_ids_of_type(elset_ids, element_id_sets['shell'])
+        elset_values_brick = element_ids_of_type(elset_ids, element_id_sets['brick'])
 
         # sh3n mapping
         # Initialize the mapped name based on the sh3n mapping
@@ -3386,22 +3546,9 @@ def write_element_groups(nset_counter, nsets, sh3n_list, shell_list, brick_list,
             # Append the value to the mapped name in the dictionary entry
             grngrn_store[elset_basename].append(nset_counter)
 
-        # Extract element IDs from elset_data
-        element_ids = elset_data
-        elements_per_line = []
-
-        # Iterate through element IDs and format them in 10 x 10 wide fixed format fields
-        for element_id in element_ids:
-            elements_per_line.append(f"{element_id:10d}")
-
-            # Check if we have collected 10 elements
-            if len(elements_per_line) == 10:
-                elset_lines.append("".join(elements_per_line))
-                elements_per_line = []
-
-        # If there are remaining elements, add them to the last line
-        if elements_per_line:
-            elset_lines.append("".join(elements_per_line))
+        # Format the element IDs in 10 x 10 wide fixed format fields
+        if elset_data:
+            elset_lines.append(format_id_rows(elset_data))
 
         # Formatted output for the elsets and nodesets
         elset_output = "\n".join(elset_lines)
@@ -3413,7 +3560,6 @@ def write_element_groups(nset_counter, nsets, sh3n_list, shell_list, brick_list,
 
     # Add one further Node Group, representing all nodes of the element groups
     for grelset, grnodids in grngrn_store.items():
-        formatted_grnodids = [f"{grnodid:10d}" for grnodid in grnodids]
 
         nset_counter += 1
         grnset_lines.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
@@ -3423,7 +3569,7 @@ def write_element_groups(nset_counter, nsets, sh3n_list, shell_list, brick_list,
         grnset_name = f"Node Group of all nodes of {grelset}"
         grnset_lines.append(f"{grnset_name}")
         grnset_lines.append("#  GRNODID")
-        grnset_lines.append("".join(formatted_grnodids))
+        grnset_lines.append(format_id_rows(grnodids, len(grnodids) or 1))
         nsets[grelset] = {'id': nset_counter} # Store the name/ID relationship
         if debug_mode:
             print(f"Created GRNOD for {grelset} with NSET ID: {nset_counter}") # For debug
@@ -3433,113 +3579,87 @@ def write_element_groups(nset_counter, nsets, sh3n_list, shell_list, brick_list,
     return elset_blocks, nset_counter, nsets, elset_dicts
 
 
-#####################################################################################
-# Function to convert segment data dictionary for later use by 'parse_surface_data' #
-#####################################################################################
-def convert_segments(element_dicts):
-    segment_dictionary = {}
-    segments_converted_already = False # Initialize a flag to track if we did this already
-
-    if not segments_converted_already:
-         segments_converted_already = True # Set the flag to True to indicate we have converted segments already
-         for element_type, element_list in element_dicts.items():
-             for element_dict in element_list:
-                 for element in element_dict["elements"]:
-                     element_id = element.get('element_id', '')
-                     nodes = element.get('nodes', [])
- ########### NB, all node indexing listed is from 0 (if there are 4 nodes in an element, they are nodes 0,1,2,3)
-                     if (element_type.lower() == 'c3d6'
-                         or element_type.lower() == 'coh3d6'
-                         or element_type.lower() == 'sc6r'
-                         ):
-                         s1_nodes = [nodes[0], nodes[2], nodes[1]]  # Order as 0, 2, 1
-                         s2_nodes = [nodes[5], nodes[3], nodes[4]]  # Order as 5, 3, 4
-                         s3_nodes = [nodes[0], nodes[1], nodes[4], nodes[3]]  # Order as 0, 1, 4, 3
-                         s4_nodes = [nodes[1], nodes[2], nodes[5], nodes[4]]  # Order as 1, 2, 5, 4
-                         s5_nodes = [nodes[2], nodes[0], nodes[3], nodes[5]]  # Order as 2, 0, 3, 5
-                         segment_dictionary[element_id] = {
-                             's1': s1_nodes,
-                             's2': s2_nodes, 
-                             's3': s3_nodes, 
-                             's4': s4_nodes, 
-                             's5': s5_nodes, 
-                         }
-                     elif (element_type.lower() == 'c3d8'
-                         or element_type.lower() == 'c3d8i'
-                         or element_type.lower() == 'coh3d8'
-                         or element_type.lower() == 'c3d8r'
-                         or element_type.lower() == 'sc8r'
-                         ):
-                         s1_nodes = [nodes[0], nodes[3], nodes[2], nodes[1]]  # Order as 0, 3, 2, 1
-                         s2_nodes = [nodes[7], nodes[4], nodes[5], nodes[6]]  # Order as 7, 4, 5, 6
-                         s3_nodes = [nodes[0], nodes[1], nodes[5], nodes[4]]  # Order as 0, 1, 5, 4
-                         s4_nodes = [nodes[1], nodes[2], nodes[6], nodes[5]]  # Order as 1, 2, 6, 5
-                         s5_nodes = [nodes[2], nodes[3], nodes[7], nodes[6]]  # Order as 2, 3, 7, 6
-                         s6_nodes = [nodes[3], nodes[0], nodes[4], nodes[7]]  # Order as 3, 0, 4, 7
-                         segment_dictionary[element_id] = {
-                             's1': s1_nodes,
-                             's2': s2_nodes,
-                             's3': s3_nodes, 
-                             's4': s4_nodes,
-                             's5': s5_nodes, 
-                             's6': s6_nodes, 
-                         }
-                     elif element_type.lower() == 'c3d4':
-                         s1_nodes = [nodes[0], nodes[2], nodes[1]]  # Order as 0, 2, 1
-                         s2_nodes = [nodes[0], nodes[1], nodes[3]]  # Order as 0, 1, 3
-                         s3_nodes = [nodes[1], nodes[2], nodes[3]]  # Order as 1, 2, 3
-                         s4_nodes = [nodes[2], nodes[0], nodes[3]]  # Order as 2, 0, 3
-                         segment_dictionary[element_id] = {
-                             's1': s1_nodes,
-                             's2': s2_nodes,
-                             's3': s3_nodes, 
-                             's4': s4_nodes, 
-                         }
-                     elif (element_type.lower() == 'c3d10'
-                         or element_type.lower() == 'c3d10m'):
-                         s1_nodes = [nodes[0], nodes[2], nodes[1]]  # Order as 0, 2, 1
-                         s2_nodes = [nodes[0], nodes[1], nodes[3]]  # Order as 0, 1, 3
-                         s3_nodes = [nodes[1], nodes[2], nodes[3]]  # Order as 1, 2, 3
-                         s4_nodes = [nodes[2], nodes[0], nodes[3]]  # Order as 2, 0, 3
-                         segment_dictionary[element_id] = {
-                             's1': s1_nodes,
-                             's2': s2_nodes,
-                             's3': s3_nodes, 
-                             's4': s4_nodes, 
-                         }
-                     elif (element_type.lower() == 's4'
-                         or element_type.lower() == 's4r'
-                         or element_type.lower() == 'r3d4'
-                         or element_type.lower() == 'm3d4r'):
-                         spos_nodes = [nodes[0], nodes[1], nodes[2], nodes[3]]  # Order as 0, 1, 2, 3
-                         sneg_nodes = [nodes[3], nodes[2], nodes[1], nodes[0]]  # Order as 3, 2, 1, 0
-                         segment_dictionary[element_id] = {
-                             'spos': spos_nodes,
-                             'sneg': sneg_nodes,
-                         }
-                     elif (element_type.lower() == 's3'
-                         or element_type.lower() == 's3r'
-                         or element_type.lower() == 'r3d3'
-                         or element_type.lower() == 'm3d3'
-                         ):
-                         spos_nodes = [nodes[0], nodes[1], nodes[2]]  # Order as 0, 1, 2
-                         sneg_nodes = [nodes[2], nodes[1], nodes[0]]  # Order as 2, 1, 0
-                         segment_dictionary[element_id] = {
-                             'spos': spos_nodes,
-                             'sneg': sneg_nodes,
-                         }
-         #print(f"segment dictionary is {segment_dictionary}") # FOR DEBUG
-         return segment_dictionary
+####################################################################################################
+# Face topology per element family, node positions of each segment (indexing from 0)               #
+####################################################################################################
+penta_face_topology = (
+    ('s1', (0, 2, 1)), ('s2', (5, 3, 4)), ('s3', (0, 1, 4, 3)), ('s4', (1, 2, 5, 4)), ('s5', (2, 0, 3, 5))
+)
+brick_face_topology = (
+    ('s1', (0, 3, 2, 1)), ('s2', (7, 4, 5, 6)), ('s3', (0, 1, 5, 4)),
+    ('s4', (1, 2, 6, 5)), ('s5', (2, 3, 7, 6)), ('s6', (3, 0, 4, 7))
+)
+tetra_face_topology = (
+    ('s1', (0, 2, 1)), ('s2', (0, 1, 3)), ('s3', (1, 2, 3)), ('s4', (2, 0, 3))
+)
+quad_face_topology = (('spos', (0, 1, 2, 3)), ('sneg', (3, 2, 1, 0)))
+tria_face_topology = (('spos', (0, 1, 2)), ('sneg', (2, 1, 0)))
+
+element_face_topology = {
+    'C3D6': penta_face_topology, 'COH3D6': penta_face_topology, 'SC6R': penta_face_topology,
+    'C3D8': brick_face_topology, 'C3D8I': brick_face_topology, 'COH3D8': brick_face_topology,
+    'C3D8R': brick_face_topology, 'SC8R': brick_face_topology,
+    'C3D4': tetra_face_topology, 'C3D10': tetra_face_topology, 'C3D10M': tetra_face_topology,
+    'S4': quad_face_topology, 'S4R': quad_face_topology, 'R3D4': quad_face_topology, 'M3D4R': quad_face_topology,
+    'S3': tria_face_topology, 'S3R': tria_face_topology, 'R3D3': tria_face_topology, 'M3D3': tria_face_topology,
+}
 
 
 ####################################################################################################
-# New Faster Function to parse segment surfaces, based on segment_dictionary                       #
+# Function to index element segments for later use by 'parse_surface_data', segments are only      #
+# built (and kept) for the elements looked up through 'element_segments'                           #
 ####################################################################################################
-def parse_surface_data(input_lines, elset_dicts, nset_counter, nsets,
-    segment_dictionary, property_names
-    ):
-    surf_id = 0 # Initialize surface id
-    surf_name_to_id = {} # Initialize surf id - name dictionary
+def convert_segments(element_dicts):
+    segment_lookup = {}  # element id -> position over all indexed element blocks
+    segment_offsets = []  # first position of each indexed element block
+    segment_blocks = []  # (face topology, element store) of each indexed element block
+    position = 0
+
+    for element_type, element_list in element_dicts.items():
+        face_topology = element_face_topology.get(element_type.upper())
+        if face_topology is None:
+            continue
+        for element_dict in element_list:
+            element_store = element_dict["elements"]
+            block_size = element_count(element_store)
+            if not block_size:
+                continue
+            # later definitions of the same element id replace earlier ones
+            segment_lookup.update(zip(element_store['ids'], range(position, position + block_size)))
+            segment_offsets.append(position)
+            segment_blocks.append((face_topology, element_store))
+            position += block_size
+
+    segment_dictionary = {
+        'lookup': segment_lookup, 'offsets': segment_offsets, 'blocks': segment_blocks, 'segments': {}
+    }
+    return segment_dictionary
+
+
+def has_segments(segment_dictionary, element_id):
+    return element_id in segment_dictionary['lookup']
+
+
+def element_segments(segment_dictionary, element_id):
+    segments = segment_dictionary['segments'].get(element_id)
+    if segments is None:
+        position = segment_dictionary['lookup'][element_id]
+        block = bisect_right(segment_dictionary['offsets'], position) - 1
+        face_topology, element_store = segment_dictionary['blocks'][block]
+        nodes = element_nodes(element_store, position - segment_dictionary['offsets'][block])
+        segments = {side: [nodes[i] for i in face_nodes] for side, face_nodes in face_topology}
+        segment_dictionary['segments'][element_id] = segments
+    return segments
+
+
+####################################################################################################
+# New Faster Function to parse segment surfaces, based on segment_dictionary                       #
+####################################################################################################
+def parse_surface_data(input_lines, elset_dicts, nset_counter, nsets,
+    segment_dictionary, property_names, name_indexes
+    ):
+    surf_id = 0 # Initialize surface id
+    surf_name_to_id = {} # Initialize surf id - name dictionary
     surface_lines = []
     current_surface_name = None
     current_node_surface_name = None
@@ -3624,13 +3744,12 @@ def parse_surface_data(input_lines, elset_dicts, nset_counter, nsets,
             if surface_el_byname is not None and allsurf is False and not surface_side:
                 # Look up the property IDs for the names in surf_el_byname
                 prop_id_list = []
-                for property_name, property_data in property_names.items():
-                   # Check if the property name matches the surface_el
-                    if property_name.lower() == surface_el_byname.lower():
-                        # Extract the part_id and add it to the list
-                        property_id = int(property_data['prop_id'])
-                        part_id = property_data.get('part_id', property_id)  # Use part_id for surface definition
-                        prop_id_list.append(part_id)
+                for property_name in name_indexes['property_lower'].get(surface_el_byname.lower(), ()):
+                    # Extract the part_id and add it to the list
+                    property_data = property_names[property_name]
+                    property_id = int(property_data['prop_id'])
+                    part_id = property_data.get('part_id', property_id)  # Use part_id for surface definition
+                    prop_id_list.append(part_id)
 
                 # Create a /SURF/PART/EXT entry
                 props_per_line = []
@@ -3677,10 +3796,9 @@ def parse_surface_data(input_lines, elset_dicts, nset_counter, nsets,
             surf_holder = []
 
             if surface_el is not None:
-                if surface_el in segment_dictionary:
-                    nodes = segment_dictionary[surface_el].get(surface_side, [])
-                    segment_nodes = ''.join([f"{node:>10}" for node in nodes])
-                    surf_holder.append(f"          {segment_nodes}")
+                if has_segments(segment_dictionary, surface_el):
+                    nodes = element_segments(segment_dictionary, surface_el).get(surface_side, [])
+                    surf_holder.append(format_segment_row(nodes))
 
             if surface_el_byname is not None and allsurf is False and surface_side:
                 for elset_name, surface_els in elset_dicts.items():
@@ -3692,7 +3810,7 @@ def parse_surface_data(input_lines, elset_dicts, nset_counter, nsets,
 
                         for surface_el in surface_els:
                             try:
-                                if surface_el not in segment_dictionary:
+                                if not has_segments(segment_dictionary, surface_el):
                                     print(f"### WARNING ###: Element {surface_el} referenced in surface '{surface_el_byname}' not found in segment dictionary. Skipping.")
                                     continue
 
@@ -3701,22 +3819,19 @@ def parse_surface_data(input_lines, elset_dicts, nset_counter, nsets,
                                         # Iterate over all possible surface sides and create a separate line for each side
                                         surface_sides = ['s1', 's2', 's3', 's4', 's5', 's6', 'spos', 'sneg']
                                         for surf_iter in surface_sides:
-                                            nodes = segment_dictionary[surface_el].get(surf_iter, [])
+                                            nodes = element_segments(segment_dictionary, surface_el).get(surf_iter, [])
                                             if nodes:  # Check if nodes exist (i.e., not an empty list)
-                                                segment_nodes = ''.join([f"{node:>10}" for node in nodes])
-                                                surf_holder.append(f"          {segment_nodes}")
+                                                surf_holder.append(format_segment_row(nodes))
                                     else:
-                                        nodes = segment_dictionary[surface_el].get(surface_side, [])
-                                        segment_nodes = ''.join([f"{node:>10}" for node in nodes])
-                                        surf_holder.append(f"          {segment_nodes}")
+                                        nodes = element_segments(segment_dictionary, surface_el).get(surface_side, [])
+                                        surf_holder.append(format_segment_row(nodes))
                                 else:
                                 # Iterate over all possible surface sides and create a separate line for each side
                                     surface_sides = ['s1', 's2', 's3', 's4', 's5', 's6', 'spos', 'sneg']
                                     for surf_iter in surface_sides:
-                                        nodes = segment_dictionary[surface_el].get(surf_iter, [])
+                                        nodes = element_segments(segment_dictionary, surface_el).get(surf_iter, [])
                                         if nodes:  # Check if nodes exist (i.e., not an empty list)
-                                            segment_nodes = ''.join([f"{node:>10}" for node in nodes])
-                                            surf_holder.append(f"          {segment_nodes}")
+                                            surf_holder.append(format_segment_row(nodes))
                             except (KeyError, TypeError, ValueError) as e:
                                 print(f"### WARNING ###: Error processing surface element {surface_el} in surface '{surface_el_byname}': {e}. Skipping this element.")
                                 continue
@@ -3998,9 +4113,10 @@ def convert_contacts(input_lines, property_names, surf_id, friction_dict, surf_n
 
 
 ####################################################################################################
-# Function to convert *TIE to Type2                                                                #
+# Function to read *TIE pairs for the Type2 tied interfaces: name, tie type, position tolerance,   #
+# and the ids of the node groups and surfaces they reference (cards are written by 'write_ties')   #
 ####################################################################################################
-def convert_ties(input_lines, surf_name_to_id, nsets, inter_id):
+def convert_ties(input_lines, surf_name_to_id, nsets):
     tied_contacts = []
     tied_contact_name = None
 
@@ -4043,75 +4159,82 @@ def convert_ties(input_lines, surf_name_to_id, nsets, inter_id):
                 tie_nset_id = nset_data['id'] if nset_data else 0
             #look up the surf counter for the referenced main surface
             tie_surf_id = surf_name_to_id.get(surface_to_tie_to, 0)
-            tie_holder = []
-            if radversion == 2025:
-                if tc_type == "node to surface" and tie_surf_id != 0 and tie_nset_id != 0:
+
+            #surf to surf ties: surf 1 as second surface (2025) or tied to the nodes of surf 2 (2023 symm tie)
+            s2s_second_surf_id = surf_name_to_id.get(surface_for_nodes, 0)
+            nset_data = nsets.get(f"{surface_to_tie_to}___nodes")
+            symm_tie_nset_id = nset_data['id'] if nset_data else 0
+
+            tied_contacts.append((tied_contact_name, tc_type, tc_postol_value, tie_nset_id, tie_surf_id,
+                                  s2s_second_surf_id, symm_tie_nset_id))
+
+        elif tied_contact_name and line.startswith('*'):
+            tied_contact_name = None
+
+    return tied_contacts
+
+
+####################################################################################################
+# Function to write the Type2 tied interfaces read by 'convert_ties' in the radversion format,     #
+# interface ids follow the contacts (inter_id is the last contact interface id)                    #
+####################################################################################################
+def write_ties(tied_contacts, inter_id):
+    tie_holder = []
+    for (tied_contact_name, tc_type, tc_postol_value, tie_nset_id, tie_surf_id,
+         s2s_second_surf_id, symm_tie_nset_id) in tied_contacts:
+        if radversion == 2025:
+            if tc_type == "node to surface" and tie_surf_id != 0 and tie_nset_id != 0:
+                inter_id += 1 # Increment the inter_id
+                #create the tie for each node to surface pair (nodes for surf 1, surfs for surf 2)
+                tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
+                tie_holder.append(f"#Tied interface definition (n2s): {tied_contact_name}")
+                tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
+                tie_holder.append(f"/INTER/TYPE2/{inter_id}\n{tied_contact_name}")
+                tie_holder.append("# Grnd_IDs  Surf_IDm    Ignore  Spotflag     Level   Isearch     Idel2  Surf_IDs             dSearch")
+                tie_holder.append(f"{tie_nset_id:>10}{tie_surf_id:>10}         3        {spotflag_default:>2}         0         0         2         0          {tc_postol_value:>10.8g}")
+                tie_holder.append("#              Stfac                Visc                          Istf")
+                tie_holder.append("                   0                   0                             0")
+
+            elif tc_type == "surface to surface":
+                #create surf to surf type tied contact
+                if tie_surf_id != 0 and s2s_second_surf_id != 0:
                     inter_id += 1 # Increment the inter_id
-                    #create the tie for each node to surface pair (nodes for surf 1, surfs for surf 2)
                     tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                    tie_holder.append(f"#Tied interface definition (n2s): {tied_contact_name}")
+                    tie_holder.append(f"#Tied interface definition (s2s): {tied_contact_name}")
                     tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
                     tie_holder.append(f"/INTER/TYPE2/{inter_id}\n{tied_contact_name}")
                     tie_holder.append("# Grnd_IDs  Surf_IDm    Ignore  Spotflag     Level   Isearch     Idel2  Surf_IDs             dSearch")
-                    tie_holder.append(f"{tie_nset_id:>10}{tie_surf_id:>10}         3        {spotflag_default:>2}         0         0         2         0          {tc_postol_value:>10.8g}")
+                    tie_holder.append(f"         0{tie_surf_id:>10}         3        {spotflag_default:>2}         0         0         2{s2s_second_surf_id:>10}          {tc_postol_value:>10.8g}")
                     tie_holder.append("#              Stfac                Visc                          Istf")
                     tie_holder.append("                   0                   0                             0")
 
-                elif tc_type == "surface to surface":
-                    #create surf to surf type tied contact
-                    s2s_main_surface = contact_groups[1].strip()
-                    s2s_second_surface = contact_groups[0].strip()
-                    s2s_main_surf_id = surf_name_to_id.get(s2s_main_surface, 0) #look up the surf counter for the referenced surface
-                    s2s_second_surf_id = surf_name_to_id.get(s2s_second_surface, 0) #look up the surf counter for the referenced surface
-                    if s2s_main_surf_id != 0 and s2s_second_surf_id != 0:
-                        inter_id += 1 # Increment the inter_id
-                        tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                        tie_holder.append(f"#Tied interface definition (s2s): {tied_contact_name}")
-                        tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                        tie_holder.append(f"/INTER/TYPE2/{inter_id}\n{tied_contact_name}")
-                        tie_holder.append("# Grnd_IDs  Surf_IDm    Ignore  Spotflag     Level   Isearch     Idel2  Surf_IDs             dSearch")
-                        tie_holder.append(f"         0{s2s_main_surf_id:>10}         3        {spotflag_default:>2}         0         0         2{s2s_second_surf_id:>10}          {tc_postol_value:>10.8g}")
-                        tie_holder.append("#              Stfac                Visc                          Istf")
-                        tie_holder.append("                   0                   0                             0")
-
-            elif radversion == 2023:
-                if tie_surf_id != 0 and tie_nset_id != 0:
+        elif radversion == 2023:
+            if tie_surf_id != 0 and tie_nset_id != 0:
+                inter_id += 1 # Increment the inter_id
+                #create the first tie for each surface pair (nodes for surf 1, surfs for surf 2)
+                tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
+                tie_holder.append(f"#Tied interface definition: {tied_contact_name}")
+                tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
+                tie_holder.append(f"/INTER/TYPE2/{inter_id}\n{tied_contact_name}")
+                tie_holder.append("#  Grnd_ID   Surf_id    Ignore  Spotflag     Level   Isearch     Idel2                       dSearch")
+                tie_holder.append(f"{tie_nset_id:>10}{tie_surf_id:>10}         3        {spotflag_default:>2}         0         0         2                    {tc_postol_value:>10.8g}")
+                tie_holder.append("#              Stfac                Visc                          Istf")
+                tie_holder.append("                   0                   0                             0")
+
+            if tc_type == "surface to surface":
+                #create a symmetric tie for each surf pair if type is surf - surf (surfs for surf 1, nodes for surf 2)
+                if s2s_second_surf_id != 0 and symm_tie_nset_id != 0:
                     inter_id += 1 # Increment the inter_id
-                    #create the first tie for each surface pair (nodes for surf 1, surfs for surf 2)
                     tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                    tie_holder.append(f"#Tied interface definition: {tied_contact_name}")
+                    tie_holder.append(f"#Tied interface definition (symm for s2s): {tied_contact_name}")
                     tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                    tie_holder.append(f"/INTER/TYPE2/{inter_id}\n{tied_contact_name}")
+                    tie_holder.append(f"/INTER/TYPE2/{inter_id}\n{tied_contact_name}_symm")
                     tie_holder.append("#  Grnd_ID   Surf_id    Ignore  Spotflag     Level   Isearch     Idel2                       dSearch")
-                    tie_holder.append(f"{tie_nset_id:>10}{tie_surf_id:>10}         3        {spotflag_default:>2}         0         0         2                    {tc_postol_value:>10.8g}")
+                    tie_holder.append(f"{symm_tie_nset_id:>10}{s2s_second_surf_id:>10}         3        {spotflag_default:>2}         0         0         2                    {tc_postol_value:>10.8g}")
                     tie_holder.append("#              Stfac                Visc                          Istf")
                     tie_holder.append("                   0                   0                             0")
 
-                if tc_type == "surface to surface":
-                    #create a symmetric tie for each surf pair if type is surf - surf (surfs for surf 1, nodes for surf 2)
-                    symm_surface_for_nodes = contact_groups[1].strip()
-                    symm_surface_to_tie_to = contact_groups[0].strip()
-                    symm_nodes_to_tie = f"{symm_surface_for_nodes}___nodes"
-                    nset_data = nsets.get(symm_nodes_to_tie)
-                    symm_tie_nset_id = nset_data['id'] if nset_data else 0 #look up the nset counter for the referenced nset (based on the surface)
-                    symm_tie_surf_id = surf_name_to_id.get(symm_surface_to_tie_to, 0) #look up the surf counter for the referenced surface
-                    if symm_tie_surf_id != 0 and symm_tie_nset_id != 0:
-                        inter_id += 1 # Increment the inter_id
-                        tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                        tie_holder.append(f"#Tied interface definition (symm for s2s): {tied_contact_name}")
-                        tie_holder.append("#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|")
-                        tie_holder.append(f"/INTER/TYPE2/{inter_id}\n{tied_contact_name}_symm")
-                        tie_holder.append("#  Grnd_ID   Surf_id    Ignore  Spotflag     Level   Isearch     Idel2                       dSearch")
-                        tie_holder.append(f"{symm_tie_nset_id:>10}{symm_tie_surf_id:>10}         3        {spotflag_default:>2}         0         0         2                    {tc_postol_value:>10.8g}")
-                        tie_holder.append("#              Stfac                Visc                          Istf")
-                        tie_holder.append("                   0                   0                             0")
-
-            tied_contacts.extend(tie_holder)
-
-        elif tied_contact_name and line.startswith('*'):
-            tied_contact_name = None
-
-    return tied_contacts, inter_id
+    return tie_holder
 
 
 ####################################################################################################
@@ -4768,26 +4891,8 @@ def convert_initial(input_lines, nset_counter, nsets):
             for iniv_name, iniv_mags in iniv_names:
                 nset_data = nsets.get(iniv_name)
                 ref_nset_counter = nset_data['id'] if nset_data else 0
-                iniv_mag_x = iniv_mags.get('iniv_mag_x')
-                iniv_mag_y = iniv_mags.get('iniv_mag_y')
-                iniv_mag_z = iniv_mags.get('iniv_mag_z')
-                if radversion == 2025:
-                    iniv_block = (
-                    "#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|\n"
-                    f"/INIVEL/TRA/{ref_nset_counter}\n{iniv_name}\n"
-                    "#                 Vx                  Vy                  Vz  Grnod_id   Skew_id\n"
-                    f"{iniv_mag_x:>20.15g}{iniv_mag_y:>20.15g}{iniv_mag_z:>20.15g}{ref_nset_counter:>10}\n"
-                    "#   Tstart   sens_ID\n"
-                    "       0.0         0"
-                    )
-                elif radversion ==2023:
-                    iniv_block = (
-                    "#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|\n"
-                    f"/INIVEL/TRA/{ref_nset_counter}\n{iniv_name}\n"
-                    "#                 Vx                  Vy                  Vz  Grnod_id   Skew_id\n"
-                    f"{iniv_mag_x:>20.15g}{iniv_mag_y:>20.15g}{iniv_mag_z:>20.15g}{ref_nset_counter:>10}"
-                    )
-                initial_blocks.append(iniv_block)
+                initial_blocks.append(("", ref_nset_counter, iniv_name, iniv_mags.get('iniv_mag_x'),
+                                       iniv_mags.get('iniv_mag_y'), iniv_mags.get('iniv_mag_z')))
             continue
 
         # Digit iniv_names with same iniv_mags values
@@ -4798,36 +4903,36 @@ def convert_initial(input_lines, nset_counter, nsets):
         iniv_grnod += "node group containing multiple nodes with same INIVEL values\n"
         iniv_grnod += "#   NODEID\n"
 
-        # Split iniv_names into chunks of 10 for formatting
-        for i in range(0, len(iniv_names), 10):
-            chunk = iniv_names[i:i+10]
-            iniv_grnod += "".join(f"{node:>10}" for node in chunk) + "\n"
+        # Split iniv_names into rows of 10 for formatting
+        if iniv_names:
+            iniv_grnod += format_id_rows(iniv_names) + "\n"
 
-        # Create INIVEL block
-        iniv_mag_x, iniv_mag_y, iniv_mag_z = mag_key
-        if radversion == 2025:
-            iniv_block = (
-            "#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|\n"
-            f"/INIVEL/TRA/{ref_nset_counter}\n"
-            "Shared INIVEL for group of nodes\n"
-            "#                 Vx                  Vy                  Vz  Grnod_id   Skew_id\n"
-            f"{iniv_mag_x:>20.15g}{iniv_mag_y:>20.15g}{iniv_mag_z:>20.15g}{ref_nset_counter:>10}\n"
-            "#   Tstart   sens_ID\n"
-            "       0.0         0"
-            )
-        elif radversion == 2023:
-            iniv_block = (
+        # INIVEL of the node group
+        initial_blocks.append((iniv_grnod, ref_nset_counter, "Shared INIVEL for group of nodes") + mag_key)
+
+    return initial_blocks, nset_counter
+
+
+####################################################################################################
+# Function to write the initial velocities read by 'convert_initial' in the radversion format:     #
+# (node group block or "", node group id, title, Vx, Vy, Vz) for each /INIVEL                      #
+####################################################################################################
+def write_initial(initial_blocks):
+    for iniv_grnod, ref_nset_counter, iniv_title, iniv_mag_x, iniv_mag_y, iniv_mag_z in initial_blocks:
+        if iniv_grnod:
+            yield iniv_grnod
+        iniv_block = (
             "#---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|\n"
-            f"/INIVEL/TRA/{ref_nset_counter}\n"
-            "Shared INIVEL for group of nodes\n"
+            f"/INIVEL/TRA/{ref_nset_counter}\n{iniv_title}\n"
             "#                 Vx                  Vy                  Vz  Grnod_id   Skew_id\n"
             f"{iniv_mag_x:>20.15g}{iniv_mag_y:>20.15g}{iniv_mag_z:>20.15g}{ref_nset_counter:>10}"
             )
-
-        initial_blocks.append(iniv_grnod)
-        initial_blocks.append(iniv_block)
-
-    return initial_blocks, nset_counter
+        if radversion == 2025:
+            iniv_block += (
+            "\n#   Tstart   sens_ID\n"
+            "       0.0         0"
+            )
+        yield iniv_block
 
 
 ####################################################################################################
@@ -5063,16 +5168,15 @@ def convert_pload(input_lines, nset_counter, surf_id, surf_name_to_id, elset_dic
                     except (ValueError, TypeError):
                         continue
                     try: 
-                        if elem_int not in segment_dictionary:
+                        if not has_segments(segment_dictionary, elem_int):
                             continue
                     except (ValueError, TypeError):
                         continue     
                     sides_to_try = [surface_side] if surface_side else all_sides
                     for side in sides_to_try:
-                        nodes = segment_dictionary[elem_int].get(side, [])
+                        nodes = element_segments(segment_dictionary, elem_int).get(side, [])
                         if nodes:
-                            segment_nodes = ''.join([f"{node:>10}" for node in nodes])
-                            surf_segs.append(f"          {segment_nodes}")
+                            surf_segs.append(format_segment_row(nodes))
                             # input (f"surf segs are : {surf_segs}") # FOR DEBUG
 
             if not surf_segs and not existing_surf_id:
@@ -5339,11 +5443,32 @@ def convert_rigids(
     return rigid_bodies, nset_counter, max_elem_id, property_names, material_names
 
 
+####################################################################################################
+# Function to find the first node of an NSET used as a ref node, from its indexed *NSET blocks     #
+####################################################################################################
+def nset_first_node(deck_lines, keyword_index, nset_name):
+    #to match a single value on a nset line for ref node
+    number_pattern = re.compile(r'\b(\d+),?\b')
+
+    for block in keyword_index.get('*NSET', []):
+        if block['params'].get('NSET', '').upper() != nset_name.upper():
+            continue
+        for line in deck_lines[block['start']:block['end']]:
+            refnodenumbermatch = number_pattern.search(line)
+            if refnodenumbermatch:
+                return refnodenumbermatch.group(1)
+            # Stop if a blank line appears
+            if not line.strip():
+                break
+
+    return None
+
+
 ####################################################################################################
 # Function to create /RBODY from *COUPLING KINEMATIC assumes all 6 DOF coupled                     #
 # *COUPLING, DISTRIBUTING are dealt with in RBE3 section                                           #
 ####################################################################################################
-def convert_coupling(input_lines, nsets, max_elem_id):
+def convert_coupling(input_lines, nsets, max_elem_id, deck_lines, keyword_index):
     coupling_holder = []
     coupling_name = None
     couplingk = False
@@ -5396,34 +5521,12 @@ def convert_coupling(input_lines, nsets, max_elem_id):
         if couplingk or kcoupling:
             if not rbody_id.isdigit():
                 print("ref node for rbody is a set, searching for value")
-                #pattern locate the set for the ref node
-                nset_pattern = r'^\s*\*nset\s*,\s*nset\s*=\s*{}\b'.format(re.escape(rbody_id))
-                #to match a single value on a nset line for ref node
-                number_pattern = r'\b(\d+),?\b'
-
-                in_nset_block = False
-
-                for line in input_lines:
-                    if in_nset_block:
-                        # Search for numbers in lines following the *nset header
-                        refnodenumbermatch = re.findall(number_pattern, line)
-                        if refnodenumbermatch:
-                            # Extract all matched numbers and update rbody_id
-                            # to the first found number (or handle multiple as needed)
-                            # Use the first found number as rbody_id
-                            rbody_id = refnodenumbermatch[0]
-                            print(f"Extracted rbody ref node number: {rbody_id}") # Debug print
-                            couplingk = False
-                            kcoupling = False
-                            break
-                        # Stop if a non-number line or blank line appears
-                        if not line.strip() or line.startswith("*"):
-                            in_nset_block = False  # End the block search
-
-                    # Detect the *nset line to start the block
-                    refnodesetmatch = re.search(nset_pattern, line, re.IGNORECASE)
-                    if refnodesetmatch:
-                        in_nset_block = True  # Start reading numbers in subsequent
+                refnodenumber = nset_first_node(deck_lines, keyword_index, rbody_id)
+                if refnodenumber:
+                    rbody_id = refnodenumber
+                    print(f"Extracted rbody ref node number: {rbody_id}") # Debug print
+                    couplingk = False
+                    kcoupling = False
 
             max_elem_id += 1 # increment max element id to use as rigid body id
 
@@ -5468,7 +5571,7 @@ def convert_coupling(input_lines, nsets, max_elem_id):
 ####################################################################################################
 # Function to create /RBE3 from *COUPLING assigns weights on main nodes                            #
 ####################################################################################################
-def convert_discoup(input_lines, nsets, max_elem_id):
+def convert_discoup(input_lines, nsets, max_elem_id, deck_lines, keyword_index):
     discoup_data = []
     discoup_holder = []
     discoup_name = None
@@ -5522,32 +5625,10 @@ def convert_discoup(input_lines, nsets, max_elem_id):
 
         if not ref_node.isdigit():
             print("ref node for rbe3 is a set, searching for value")
-            #pattern locate the set for the ref node
-            nset_pattern = r'^\s*\*nset\s*,\s*nset\s*=\s*{}\b'.format(re.escape(ref_node))
-            #to match a single value on a nset line for ref node
-            number_pattern = r'\b(\d+),?\b'
-
-            in_nset_block = False
-
-            for line in input_lines:
-                if in_nset_block:
-                    # Search for numbers in lines following the *nset header
-                    refnodenumbermatch = re.findall(number_pattern, line)
-                    if refnodenumbermatch:
-                        # Extract all matched numbers and update rbody_id
-                        # to the first found number (or handle multiple as needed)
-                        # Use the first found number as rbody_id
-                        ref_node = refnodenumbermatch[0]
-                        print(f"Extracted rbe3 ref node number: {ref_node}") # Debug print
-                        break
-                    # Stop if a non-number line or blank line appears
-                    if not line.strip() or line.startswith("*"):
-                        in_nset_block = False  # End the block search
-
-                # Detect the *nset line to start the block
-                refnodesetmatch = re.search(nset_pattern, line, re.IGNORECASE)
-                if refnodesetmatch:
-                    in_nset_block = True  # Start reading numbers in subsequent
+            refnodenumber = nset_first_node(deck_lines, keyword_index, ref_node)
+            if refnodenumber:
+                ref_node = refnodenumber
+                print(f"Extracted rbe3 ref node number: {ref_node}") # Debug print
 
         if id_value:
 
@@ -5977,6 +6058,44 @@ def convert_elements_at(input_lines):
     return element_lines
 
 
+####################################################################################################
+# Function to index the deck once by keyword: header line, parameters and data line span           #
+####################################################################################################
+def build_keyword_index(input_lines):
+    keyword_index = {}
+    current_block = None
+
+    for line_number, line in enumerate(input_lines):
+        if not line.startswith('*'):
+            continue
+
+        if current_block is not None:
+            current_block['end'] = line_number
+
+        keyword, params = parse_keyword_header(line)
+        current_block = {'line': line_number, 'params': params, 'start': line_number + 1,
+                         'end': len(input_lines)}
+        keyword_index.setdefault(keyword, []).append(current_block)
+
+    return keyword_index
+
+
+####################################################################################################
+# Function to collect the header and data lines of the given keywords only, in deck order          #
+####################################################################################################
+def keyword_block_lines(input_lines, keyword_index, *keywords):
+    blocks = []
+    for keyword in keywords:
+        blocks.extend(keyword_index.get(keyword, []))
+    blocks.sort(key=lambda block: block['line'])
+
+    block_lines = []
+    for block in blocks:
+        block_lines.extend(input_lines[block['line']:block['end']])
+
+    return block_lines
+
+
 ####################################################################################################
 #                                                                                                  #
 #-  Main Conversion  Tasks Function and input/output below                                         #
@@ -5987,188 +6106,196 @@ def main_conversion_sp(input_lines, simple_file_name, elsets_for_expansion_dict,
     non_numeric_references, relsets_for_expansion_dict, nset_references
     ):
 
-    transform_lines, transform_data = convert_transforms(input_lines)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Transforms Done:         {elapsed_time:8.3f} seconds")
-
+    deck_line_count = len(input_lines)
     node_data, input_lines = read_nodes(input_lines)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Nodes Read:              {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Nodes Read", deck_line_count, sum(len(node_block) for node_block in node_data.values()))
 
     node_lines = convert_nodes(node_data)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Nodes Done:              {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Nodes Done", None, sum(len(node_table['ids']) for node_table in node_lines.values()))
 
     input_lines = convert_distcoup(input_lines)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Dist Coups Prep Done:    {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Dist Coups Prep Done", len(input_lines))
 
     nsets, nset_counter, input_lines = convert_nsets(input_lines, nset_references)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Nsets Read:              {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Nsets Read", len(input_lines), len(nsets))
+
+    # The deck lines are not rewritten after this point, so index them once by keyword
+    # and hand each keyword based converter only the blocks it deals with
+    keyword_index = build_keyword_index(input_lines)
+    stage_checkpoint("Keyword Index Done", len(input_lines), len(keyword_index))
 
+    # The stages below run one after the other: each takes the counters (nset, surface, function,
+    # property and element ids) and the sets of the stages before it, so they cannot run in parallel.
+    # With --jobs > 1 only the parsing of large *NODE and *ELEMENT blocks is split over processes
     nset_blocks = create_nblocks(nsets)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Nsets Done:              {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Nsets Done", None, len(nset_blocks))
 
     material_names, extra_material_names, fct_id, nset_counter = convert_materials(input_lines, nset_counter)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Materials Done:          {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Materials Done", len(input_lines), len(material_names))
 
     # Build ELSET to element type mapping
-    elset_element_types = build_elset_element_type_mapping(input_lines)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Elset Type Mapping Done: {elapsed_time:8.3f} seconds")
+    element_header_lines = keyword_block_lines(input_lines, keyword_index, '*ELEMENT')
+    elset_element_types = build_elset_element_type_mapping(element_header_lines)
+    stage_checkpoint("Elset Type Mapping Done", len(element_header_lines), len(elset_element_types))
 
     property_names, prop_id = convert_props(input_lines, material_names, non_numeric_references, elset_element_types)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Props/Parts Done:        {elapsed_time:8.3f} seconds")
+    name_indexes = build_name_indexes(property_names, non_numeric_references)
+    stage_checkpoint("Props/Parts Done", len(input_lines), len(property_names))
 
     elset_dicts = prepare_elsets(input_lines, elsets_for_expansion_dict, relsets_for_expansion_dict)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Elset Prep Done:         {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Elset Prep Done", len(input_lines), len(elset_dicts))
 
     #new dictionary based version for element writing
     (elset_dicts, element_lines, element_dicts, sh3n_list, shell_list, brick_list, property_names,
         max_elem_id, input_lines, nsets, nset_counter
-        ) = parse_element_data(input_lines, elset_dicts, property_names, non_numeric_references,
-        nsets, nset_counter
+        ) = parse_element_data(input_lines, elset_dicts, property_names, nsets, nset_counter,
+        name_indexes
         )
 
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Elements Done:           {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Elements Done", len(input_lines), sum(
+        element_count(element_dict["elements"]) for element_list in element_dicts.values()
+        for element_dict in element_list
+        ))
 
+    element_id_sets = build_element_id_sets(sh3n_list, shell_list, brick_list)
     elset_blocks, nset_counter, nsets, elset_dicts = write_element_groups(nset_counter, nsets,
-        sh3n_list, shell_list, brick_list, elset_dicts
+        element_id_sets, elset_dicts
         )
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Elsets Done:             {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Elsets Done", None, len(elset_blocks))
 
     segment_dictionary = convert_segments(element_dicts)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Segments Done:           {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Segments Done", None, len(segment_dictionary['lookup']))
 
     (surface_lines, surf_id, surf_name_to_id, nset_counter, nsets, elset_dicts,
      input_lines) = parse_surface_data(input_lines, elset_dicts, nset_counter,
-     nsets, segment_dictionary, property_names
+     nsets, segment_dictionary, property_names, name_indexes
      )
 
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Surf Sets Done:          {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Surf Sets Done", len(input_lines), len(surface_lines))
 
-    friction_dict = parse_surface_interaction_data(input_lines)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Friction Done:           {elapsed_time:8.3f} seconds")
+    friction_dict = parse_surface_interaction_data(
+        keyword_block_lines(input_lines, keyword_index, '*SURFACE INTERACTION', '*FRICTION')
+        )
+    stage_checkpoint("Friction Done", None, len(friction_dict))
 
-    contacts, surf_id, inter_id = convert_contacts(input_lines, property_names, surf_id,
+    contact_lines = keyword_block_lines(input_lines, keyword_index, '*CONTACT', '*CONTACT PAIR',
+        '*CONTACT INCLUSIONS', '*CONTACT EXCLUSIONS', '*CONTACT PROPERTY ASSIGNMENT',
+        '*SURFACE INTERACTION'
+        )
+    contacts, surf_id, inter_id = convert_contacts(contact_lines, property_names, surf_id,
         friction_dict, surf_name_to_id
         )
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Contacts Done:           {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Contacts Done", len(contact_lines), len(contacts))
 
-    tied_contacts, inter_id = convert_ties(input_lines, surf_name_to_id, nsets, inter_id)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Tied Contacts Done:      {elapsed_time:8.3f} seconds")
+    tied_contacts = convert_ties(keyword_block_lines(input_lines, keyword_index, '*TIE'), surf_name_to_id, nsets)
+    stage_checkpoint("Tied Contacts Done", None, len(tied_contacts))
 
-    functs_dict, fct_id = read_amplitudes(input_lines, fct_id)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Functions Done:          {elapsed_time:8.3f} seconds")
+    functs_dict, fct_id = read_amplitudes(keyword_block_lines(input_lines, keyword_index, '*AMPLITUDE'),
+        fct_id
+        )
+    stage_checkpoint("Functions Done", None, len(functs_dict))
 
-    boundary_blocks, nset_counter, fct_id = convert_boundary(input_lines, nset_counter,
+    boundary_blocks, nset_counter, fct_id = convert_boundary(
+        keyword_block_lines(input_lines, keyword_index, '*BOUNDARY', '*CLOAD'), nset_counter,
         nsets, functs_dict, fct_id
         )
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Boundaries Done:         {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Boundaries Done", None, len(boundary_blocks))
 
     function_blocks = write_functions(functs_dict)
 
-    initial_blocks, nset_counter = convert_initial(input_lines, nset_counter, nsets)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Ini Conditions Done:     {elapsed_time:8.3f} seconds")
+    initial_blocks, nset_counter = convert_initial(
+        keyword_block_lines(input_lines, keyword_index, '*INITIAL CONDITIONS'), nset_counter, nsets
+        )
+    stage_checkpoint("Ini Conditions Done", None, len(initial_blocks))
 
-    dload_blocks, nset_counter, fct_id = convert_dloads(input_lines, nset_counter, nsets,
+    dload_blocks, nset_counter, fct_id = convert_dloads(
+        keyword_block_lines(input_lines, keyword_index, '*DLOAD'), nset_counter, nsets,
         property_names, functs_dict, fct_id
         )
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Gravity Done:            {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Gravity Done", None, len(dload_blocks))
 
-    pload_blocks, nset_counter, surf_id, fct_id = convert_pload(input_lines, nset_counter,
+    pload_blocks, nset_counter, surf_id, fct_id = convert_pload(
+        keyword_block_lines(input_lines, keyword_index, '*DLOAD', '*DSLOAD'), nset_counter,
         surf_id, surf_name_to_id, elset_dicts, segment_dictionary, functs_dict, fct_id
         )
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Pressure Loads Done:     {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Pressure Loads Done", None, len(pload_blocks))
 
-    mpc_ties, mpc_rigids, prop_id, max_elem_id = convert_mpc_ties(input_lines, prop_id,
+    mpc_ties, mpc_rigids, prop_id, max_elem_id = convert_mpc_ties(
+        keyword_block_lines(input_lines, keyword_index, '*MPC'), prop_id,
         max_elem_id
         )
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"MPC-Springs Done:        {elapsed_time:8.3f} seconds")
+    stage_checkpoint("MPC-Springs Done", None, len(mpc_ties))
 
     conn_beams = convert_connbeams(property_names)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Spring Beams Done:       {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Spring Beams Done", None, len(conn_beams))
 
-    rigid_bodies, nset_counter, max_elem_id, property_names, material_names = convert_rigids(input_lines,
+    rigid_bodies, nset_counter, max_elem_id, property_names, material_names = convert_rigids(
+        keyword_block_lines(input_lines, keyword_index, '*RIGID BODY'),
         property_names, material_names, nsets, nset_counter, relsets_for_expansion_dict, mpc_rigids, max_elem_id
         )
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Part Rbodies Done:       {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Part Rbodies Done", None, len(rigid_bodies))
 
-    couplings, max_elem_id = convert_coupling(input_lines, nsets, max_elem_id)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Coupling Rbodies Done:   {elapsed_time:8.3f} seconds")
+    couplings, max_elem_id = convert_coupling(
+        keyword_block_lines(input_lines, keyword_index, '*COUPLING', '*KINEMATIC COUPLING'), nsets,
+        max_elem_id, input_lines, keyword_index
+        )
+    stage_checkpoint("Coupling Rbodies Done", None, len(couplings))
 
-    discoups, max_elem_id = convert_discoup(input_lines, nsets, max_elem_id)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"DisCoups Done:           {elapsed_time:8.3f} seconds")
+    discoups, max_elem_id = convert_discoup(keyword_block_lines(input_lines, keyword_index, '*DISCOUP'),
+        nsets, max_elem_id, input_lines, keyword_index
+        )
+    stage_checkpoint("DisCoups Done", None, len(discoups))
 
-    engine_file = parse_control_data(input_lines, simple_file_name)
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Engine File Done:        {elapsed_time:8.3f} seconds")
+    transform_lines, transform_data = convert_transforms(keyword_block_lines(input_lines, keyword_index, '*SYSTEM'))
+    stage_checkpoint("Transforms Done", None, len(transform_lines))
+
+    control_lines = keyword_block_lines(input_lines, keyword_index, '*VARIABLE MASS SCALING',
+        '*FIXED MASS SCALING', '*DYNAMIC', '*OUTPUT'
+        )
+    engine_file = parse_control_data(control_lines, simple_file_name)
+    stage_checkpoint("Engine File Done", len(control_lines), len(engine_file))
 
     return (
             transform_lines, transform_data, node_lines, nsets, nset_blocks, material_names,
             extra_material_names, property_names, element_lines, elset_blocks,
-            surface_lines, contacts, tied_contacts, boundary_blocks, function_blocks,
+            surface_lines, contacts, inter_id, tied_contacts, boundary_blocks, function_blocks,
             initial_blocks, dload_blocks, pload_blocks, rigid_bodies, couplings, discoups,
             mpc_ties, conn_beams, engine_file
            )
 
 
+####################################################################################################
+# Function to write a section of card lines in batches, items are card lines (a newline is added)  #
+# or generators of pre-joined chunks of card lines, as made by 'format_element_rows'               #
+####################################################################################################
+def write_card_lines(output_file, card_lines, batch_size=10000):
+    batch = []
+    for card_line in card_lines:
+        if isinstance(card_line, dict):
+            card_line = format_element_rows(card_line['elements'], card_line['node_order'],
+                                            card_line['id_newline'], card_line['order'])
+        if isinstance(card_line, str):
+            batch.append(card_line)
+            if len(batch) < batch_size:
+                continue
+        if batch:
+            batch.append('')
+            output_file.write('\n'.join(batch))
+            batch = []
+        if not isinstance(card_line, str):
+            for card_chunk in card_line:
+                output_file.write(card_chunk + '\n')
+    if batch:
+        batch.append('')
+        output_file.write('\n'.join(batch))
+
+
 ####################################################################################################
 # Define Text Blocks for headers of each Radioss deck section                                      #
 ####################################################################################################
 def write_output(transform_lines, transform_data, node_lines, nset_blocks, material_names,
  extra_material_names, property_names, non_numeric_references, nsets, element_lines,
- elset_blocks, surface_lines, contacts, tied_contacts, boundary_blocks, function_blocks,
+ elset_blocks, surface_lines, contacts, inter_id, tied_contacts, boundary_blocks, function_blocks,
  initial_blocks, dload_blocks, pload_blocks, rigid_bodies, couplings, discoups, mpc_ties,
  conn_beams, engine_file, simple_file_name, output_file_name, output_file_path, engine_file_name,
  engine_file_path
@@ -6244,7 +6371,7 @@ def write_output(transform_lines, transform_data, node_lines, nset_blocks, mater
 ####################################################################################################
 # Write output to Radioss Starter deck  (_0000.rad)                                                #
 ####################################################################################################
-    with open(output_file_path, "w") as output_file:
+    with open(output_file_path, "w", buffering=output_buffer_size) as output_file:
 
         if run_timer:
             elapsed_time = time.time() - start_time
@@ -6473,9 +6600,7 @@ def write_output(transform_lines, transform_data, node_lines, nset_blocks, mater
                 # Write the card format for materials with rigid properties
                 write_rigid_material(material_id, material_name, rho, output_file)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"Materials Written:       {elapsed_time:8.3f} seconds")
+        stage_checkpoint("Materials Written")
 
         #MASS
         for material_name, properties in material_names.items():
@@ -6486,9 +6611,7 @@ def write_output(transform_lines, transform_data, node_lines, nset_blocks, mater
                 # Write the card format for /ADMAS masses
                 write_admas(material_name, nsets, mass, output_file)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"ADMAS Written:           {elapsed_time:8.3f} seconds")
+        stage_checkpoint("ADMAS Written")
 
 
         # Write parts and properties
@@ -6498,150 +6621,100 @@ def write_output(transform_lines, transform_data, node_lines, nset_blocks, mater
         write_props(property_names, output_file)
         output_file.write(nodes_header)  # Write the node section header
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"Parts/Props Written:     {elapsed_time:8.3f} seconds")
+        stage_checkpoint("Parts/Props Written")
 
-        for transform_id, lines in node_lines.items():
+        for transform_id, node_table in node_lines.items():
             if transform_id in transform_data:
                 output_file.write(f"//SUBMODEL/{transform_id}\n")
                 output_file.write(f"Submodel for Transform Skew {transform_id}\n")
                 output_file.write("         0         0         0         0         0         0         0\n")
 
             output_file.write("/NODE\n")
-            for node_line in lines:
-                #print(node_line)
-                output_file.write(node_line + '\n')
+            write_node_table(output_file, node_table)
 
             if transform_id in transform_data:
                 output_file.write(f"//ENDSUB\n")
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"Nodes Written:           {elapsed_time:8.3f} seconds")
+        stage_checkpoint("Nodes Written")
 
         output_file.write(elements_header)  # Write the element section header
-        for element_line in element_lines:
-            output_file.write(element_line + '\n')
+        write_card_lines(output_file, element_lines)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"Elements Written:        {elapsed_time:8.3f} seconds")
+        stage_checkpoint("Elements Written")
 
         output_file.write(group_and_th_header)  # Write the group and th section header
         for nset_block in nset_blocks:
-            for block in nset_block:
-                output_file.write(block)
+            output_file.writelines(nset_block)
 
-        for elset_block in elset_blocks:
-            # Only write the block if it's not just a newline
-            if elset_block.strip():
-                output_file.write(elset_block + '\n')
+        # Only write the block if it's not just a newline
+        write_card_lines(output_file, (elset_block for elset_block in elset_blocks if elset_block.strip()))
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"Sets Written:            {elapsed_time:8.3f} seconds")
+        stage_checkpoint("Sets Written")
 
 
         output_file.write(boundary_header)  # Write the boundary condition section header
-        for boundary_block in boundary_blocks:
-            output_file.write(boundary_block + '\n')
+        write_card_lines(output_file, boundary_blocks)
 
 
-        for initial_block in initial_blocks:
-            output_file.write(initial_block + '\n')
+        write_card_lines(output_file, write_initial(initial_blocks))
 
 
-        for dload_block in dload_blocks:
-            output_file.write(dload_block + '\n')
+        write_card_lines(output_file, dload_blocks)
 
-        for pload_block in pload_blocks:
-            output_file.write(pload_block + '\n')
+        write_card_lines(output_file, pload_blocks)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"BCS/Loads Written:       {elapsed_time:8.3f} seconds")
+        stage_checkpoint("BCS/Loads Written")
 
 
         output_file.write(functions_header) # Write the functions section header
-        for functions in function_blocks:
-            output_file.write(functions + '\n')
+        write_card_lines(output_file, function_blocks)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"Functions Written:       {elapsed_time:8.3f} seconds")
+        stage_checkpoint("Functions Written")
 
 
         output_file.write(rigidp_header)  # Write the rigid entity section header for parts
-        for rigid_body in rigid_bodies:
-            output_file.write(rigid_body + '\n')
+        write_card_lines(output_file, rigid_bodies)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"PART RBODYs Written:     {elapsed_time:8.3f} seconds")
+        stage_checkpoint("PART RBODYs Written")
 
         output_file.write(rigidc_header)  # Write the rigid entity section header for couplings
-        for coupling in couplings:
-            output_file.write(coupling + '\n')
+        write_card_lines(output_file, couplings)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"COUP RBODYs Written:     {elapsed_time:8.3f} seconds")
+        stage_checkpoint("COUP RBODYs Written")
 
         output_file.write(rbe3_header)  # Write the RBE3 section header for couplings
-        for discoup in discoups:
-            output_file.write(discoup + '\n')
+        write_card_lines(output_file, discoups)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"RBE3s Written:           {elapsed_time:8.3f} seconds")
+        stage_checkpoint("RBE3s Written")
 
         output_file.write(mpc_header)  # Write the mpc section header for ties
-        for mpc_tie in mpc_ties:
-            output_file.write(mpc_tie + '\n')
+        write_card_lines(output_file, mpc_ties)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"SpringTies Written:      {elapsed_time:8.3f} seconds")
+        stage_checkpoint("SpringTies Written")
 
-        for conn_beam in conn_beams:
-            output_file.write(conn_beam + '\n')
+        write_card_lines(output_file, conn_beams)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"SpringBeams Written:     {elapsed_time:8.3f} seconds")
+        stage_checkpoint("SpringBeams Written")
 
         output_file.write(tied_header)  # Write the tied contact section header for ties
-        for tied_contact in tied_contacts:
-            output_file.write(tied_contact + '\n')
+        write_card_lines(output_file, write_ties(tied_contacts, inter_id))
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"Tied Contacts Written:   {elapsed_time:8.3f} seconds")
+        stage_checkpoint("Tied Contacts Written")
 
         output_file.write(contact_header)  # Write the contact section header for contacts
-        for contact in contacts:
-            output_file.write(contact + '\n')
+        write_card_lines(output_file, contacts)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"Contacts Written:        {elapsed_time:8.3f} seconds")
+        stage_checkpoint("Contacts Written")
 
         output_file.write(surface_header)  # Write the surface section header for surfaces
-        for surface_line in surface_lines:
-            output_file.write(surface_line + '\n')
+        write_card_lines(output_file, surface_lines)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"Surf Sets Written:       {elapsed_time:8.3f} seconds")
+        stage_checkpoint("Surf Sets Written")
 
         output_file.write(transforms_header)  # Write the transform section header for transforms
-        for transform_line in transform_lines:
-            output_file.write(transform_line + '\n')
+        write_card_lines(output_file, transform_lines)
 
-        if run_timer:
-            elapsed_time = time.time() - start_time
-            print(f"Transforms Written:      {elapsed_time:8.3f} seconds")
+        stage_checkpoint("Transforms Written")
 
         output_file.write(footer)  # Write the /END card footer
 
@@ -6649,13 +6722,10 @@ def write_output(transform_lines, transform_data, node_lines, nset_blocks, mater
 ####################################################################################################
 # Write output to Radioss Engine file (_0001.rad)                                                  #
 ####################################################################################################
-    with open(engine_file_path, "w") as engine_output:
-        for engine_file_lines in engine_file:
-            engine_output.write(engine_file_lines)  # Write the engine file
+    with open(engine_file_path, "w", buffering=output_buffer_size) as engine_output:
+        engine_output.writelines(engine_file)  # Write the engine file
 
-    if run_timer:
-        elapsed_time = time.time() - start_time
-        print(f"Engine Written:          {elapsed_time:8.3f} seconds")
+    stage_checkpoint("Engine Written")
 
     if or_gui:
         end_time = time.time()
@@ -6680,14 +6750,325 @@ def write_output(transform_lines, transform_data, node_lines, nset_blocks, mater
         print("")
         print(f"Total Processing time: {elapsed_time:8.3f} seconds")
 
-    if not or_gui:
-        input("Press Enter to exit...")
-
     output_done = True
 
     return output_done
 
 
+####################################################################################################
+# Model file: the converted model (all data passed to 'write_output') saved as a small JSON        #
+# manifest (_model.json) holding the structure and a binary file (_model.bin) holding the node     #
+# tables, element stores and long integer lists as columns (aligned raw arrays, native byte order) #
+# In the manifest dicts are {"d": [[key, value], ...]}, tuples {"t": [...]} and columns            #
+# {"c": column} (array) or {"l": column} (list of integers)                                        #
+####################################################################################################
+def encode_model_value(value, columns):
+    if isinstance(value, (array, memoryview)):
+        columns.append(value)
+        return {'c': len(columns) - 1}
+    if isinstance(value, dict):
+        return {'d': [[encode_model_value(key, columns), encode_model_value(item, columns)]
+                      for key, item in value.items()]}
+    if isinstance(value, tuple):
+        return {'t': [encode_model_value(item, columns) for item in value]}
+    if isinstance(value, list):
+        if len(value) >= model_column_min_length and all(type(item) is int for item in value):
+            try:
+                columns.append(array('q', value))
+                return {'l': len(columns) - 1}
+            except OverflowError:
+                pass
+        return [encode_model_value(item, columns) for item in value]
+    return value
+
+
+def decode_model_value(value, columns):
+    if isinstance(value, list):
+        return [decode_model_value(item, columns) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if 'd' in value:
+        return {decode_model_value(key, columns): decode_model_value(item, columns) for key, item in value['d']}
+    if 't' in value:
+        return tuple(decode_model_value(item, columns) for item in value['t'])
+    if 'l' in value:
+        return columns[value['l']].tolist()
+    return columns[value['c']]
+
+
+def save_model(model_path_base, simple_file_name, model_data):
+    columns = []
+    encoded_data = encode_model_value(model_data, columns)
+
+    column_table = []
+    with open(model_path_base + "_model.bin", "wb") as column_file:
+        for column in columns:
+            column_bytes = column.tobytes() if isinstance(column, array) else bytes(column)
+            column_table.append([column.typecode if isinstance(column, array) else column.format,
+                                 column_file.tell(), len(column_bytes)])
+            column_file.write(column_bytes)
+            column_file.write(bytes(-len(column_bytes) % 8))  # keep the columns 8 byte aligned
+
+    with open(model_path_base + "_model.json", "w") as manifest_file:
+        json.dump({
+            'format': 'inp2rad model', 'version': 2, 'byteorder': sys.byteorder,
+            'deck': simple_file_name, 'radversion': radversion, 'spotflag_default': spotflag_default,
+            'columns': column_table, 'data': encoded_data,
+            }, manifest_file)
+
+    print(f"Model written to: {model_path_base}_model.json")
+
+
+def load_model(model_path, keep_radversion):
+    global radversion, spotflag_default
+    with open(model_path) as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get('format') != 'inp2rad model':
+        raise ValueError(f"{model_path} is not an inp2rad model file")
+    if manifest.get('version') != 2:
+        raise ValueError(f"{model_path} was saved by an older inp2rad, save the model again")
+    if manifest['byteorder'] != sys.byteorder:
+        raise ValueError(f"{model_path} was written on a platform with a different byte order")
+
+    # Without --radv the deck is written in the Radioss version the model was converted for, the
+    # version dependent cards (properties, ties, initial velocities) are formatted when written
+    if keep_radversion:
+        radversion = manifest['radversion']
+    spotflag_default = manifest['spotflag_default']
+
+    # The columns are memory mapped, node and element arrays are read from the file when written
+    column_path = os.path.splitext(model_path)[0] + ".bin"
+    columns = []
+    if manifest['columns']:
+        with open(column_path, "rb") as column_file:
+            column_map = memoryview(mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ))
+        for typecode, offset, length in manifest['columns']:
+            columns.append(column_map[offset:offset + length].cast(typecode))
+
+    return decode_model_value(manifest['data'], columns), manifest['deck']
+
+
+####################################################################################################
+# Generator to stream the lines of a deck, *INCLUDE files (also nested) are read when reached,     #
+# relative include paths are resolved from the directory of the including file                     #
+####################################################################################################
+include_pattern = re.compile(r'\*INCLUDE\s*,\s*INPUT\s*=\s*(.+)', re.IGNORECASE)
+
+def read_deck_lines(deck_path, include_chain=()):
+    include_chain = include_chain + (os.path.normcase(os.path.abspath(deck_path)),)
+
+    with open(deck_path, "rb" if mmap_bulk_data or incremental_state_dir else "r") as deck_file:
+        if incremental_state_dir:
+            deck_lines = incremental_deck_lines(deck_file)
+        else:
+            deck_lines = mmap_deck_lines(deck_file) if mmap_bulk_data else deck_file
+        for line in deck_lines:
+            match = include_pattern.match(line.strip())
+            if not match:
+                yield line
+                continue
+
+            include_path = match.group(1).strip()
+            include_path = os.path.normpath(os.path.join(os.path.dirname(deck_path), include_path))  # Resolve relative path
+            if not os.path.exists(include_path):
+                print(f"### WARNING ###: Included file {include_path} not found. Keeping original reference.")
+                yield line
+            elif os.path.normcase(os.path.abspath(include_path)) in include_chain:
+                print(f"### WARNING ###: Included file {include_path} includes itself. Keeping original reference.")
+                yield line
+            else:
+                print(f"Including file: {include_path}")
+                yield from read_deck_lines(include_path, include_chain)
+
+    if incremental_state_dir and len(include_chain) == 1:
+        prune_incremental_state(deck_path)
+
+
+####################################################################################################
+# Generator used with 'mmap_bulk_data': the deck file is memory mapped, *NODE data blocks are      #
+# parsed from the mapped bytes into node tables (no line strings), everything else is yielded as   #
+# text lines. The *NODE header gets a 'BULK BLOCK=' reference to its table in 'bulk_node_blocks'.  #
+# A 'node_table' function (deck map, data start, data end) can give the tables instead of parsing  #
+####################################################################################################
+deck_header_pattern = re.compile(rb'^\*(?!\*)[^\r\n]*(?:\r\n|\r|\n)?', re.MULTILINE)
+
+def mmap_deck_lines(deck_file, node_table=None):
+    deck_encoding = locale.getpreferredencoding(False)
+
+    def text_lines(text_start, text_end):
+        deck_map.seek(text_start)
+        while deck_map.tell() < text_end:
+            line = deck_map.readline().decode(deck_encoding)
+            if line.endswith('\r\n'):
+                line = line[:-2] + '\n'
+            yield line
+
+    def node_block(node_end):
+        if node_table is None:
+            return parse_node_bytes(deck_map[node_start:node_end])
+        return node_table(deck_map, node_start, node_end)
+
+    if os.fstat(deck_file.fileno()).st_size == 0:
+        return
+
+    with mmap.mmap(deck_file.fileno(), 0, access=mmap.ACCESS_READ) as deck_map:
+        text_start = 0
+        node_start = None
+
+        for header_match in deck_header_pattern.finditer(deck_map):
+            if node_start is not None:
+                bulk_node_blocks.append(node_block(header_match.start()))
+                node_start = None
+                text_start = header_match.start()
+
+            header_line = header_match.group(0).decode(deck_encoding)
+            if not is_node_data_header(header_line):
+                continue
+
+            yield from text_lines(text_start, header_match.start())
+            yield f"{header_line.rstrip()}, BULK BLOCK={len(bulk_node_blocks)}\n"
+            node_start = header_match.end()
+
+        if node_start is not None:
+            bulk_node_blocks.append(node_block(len(deck_map)))
+        else:
+            yield from text_lines(text_start, len(deck_map))
+
+
+####################################################################################################
+# Function to parse the bytes of a memory mapped *NODE data block into a node table                #
+####################################################################################################
+def parse_node_bytes(node_bytes):
+    lines = node_bytes.strip().split(b'\n')
+
+    # Regular 'id, x, y, z' blocks (3 commas on every line) are converted straight from the bytes
+    if b'*' not in node_bytes and {line.count(b',') for line in lines} == {3}:
+        fields = b','.join(lines).split(b',')
+        node_ids = array('q', map(int, fields[0::4]))
+        del fields[0::4]
+        return node_ids, array('d', map(float, fields))
+
+    # Anything else (comments, short lines) goes through the line parser
+    node_lines = [
+        line for line in io.StringIO(node_bytes.decode(locale.getpreferredencoding(False)), newline=None)
+        if line.strip() and not line.startswith('**')
+        ]
+    return parse_node_block(node_lines)
+
+
+####################################################################################################
+# Generator used with 'incremental_state_dir': the node tables of every deck / include file are    #
+# kept in the state directory under the hash of the file. The text of the file is always read      #
+# again (memory mapped, see 'mmap_deck_lines'), only the *NODE data blocks of unchanged files are  #
+# taken from the state instead of parsed, for changed files they are parsed and stored             #
+####################################################################################################
+def incremental_deck_lines(deck_file):
+    file_hash = hashlib.sha256()
+    for chunk in iter(lambda: deck_file.read(output_buffer_size), b''):
+        file_hash.update(chunk)
+    deck_file.seek(0)
+    state_key = file_hash.hexdigest()
+    state_base = os.path.join(incremental_state_dir, state_key)
+    incremental_state_used.add(state_key)
+
+    file_node_blocks = []
+    try:
+        with open(state_base + ".json") as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get('version') != 2 or manifest.get('byteorder') != sys.byteorder:
+            raise ValueError("state written by an older inp2rad or on a different platform")
+        with open(state_base + ".nodes", "rb") as nodes_file:
+            for node_count in manifest['node_blocks']:
+                node_ids, node_coords = array('q'), array('d')
+                node_ids.fromfile(nodes_file, node_count)
+                node_coords.fromfile(nodes_file, 3 * node_count)
+                file_node_blocks.append((node_ids, node_coords))
+    except (OSError, ValueError, KeyError, EOFError):
+        # No (complete) state for this file content, parse it and store the state
+        file_node_blocks = None
+
+    if file_node_blocks is not None:
+        if debug_mode:
+            print(f"Parse state reused for: {deck_file.name}")
+        stored_node_blocks = iter(file_node_blocks)
+        yield from mmap_deck_lines(deck_file, lambda deck_map, node_start, node_end: next(stored_node_blocks))
+        return
+
+    file_node_blocks = []
+
+    def parse_node_table(deck_map, node_start, node_end):
+        file_node_blocks.append(parse_node_bytes(deck_map[node_start:node_end]))
+        return file_node_blocks[-1]
+
+    yield from mmap_deck_lines(deck_file, parse_node_table)
+
+    os.makedirs(incremental_state_dir, exist_ok=True)
+    partial_base = f"{state_base}.{os.getpid()}.tmp"
+    with open(partial_base + ".nodes", "wb") as nodes_file:
+        for node_ids, node_coords in file_node_blocks:
+            node_ids.tofile(nodes_file)
+            node_coords.tofile(nodes_file)
+    with open(partial_base + ".json", "w") as manifest_file:
+        json.dump({
+            'version': 2,
+            'file': os.path.basename(deck_file.name),
+            'byteorder': sys.byteorder,
+            'node_blocks': [len(node_ids) for node_ids, node_coords in file_node_blocks],
+            }, manifest_file)
+    # The manifest is renamed last, it marks the state as complete
+    for extension in (".nodes", ".json"):
+        os.replace(partial_base + extension, state_base + extension)
+    # Text copy of the file kept by older versions of the state
+    try:
+        os.remove(state_base + ".lines")
+    except OSError:
+        pass
+
+
+####################################################################################################
+# Function to remove the parse state of files that are no longer part of the deck. Each deck lists #
+# its state entries in 'deck_<hash of deck path>.json', only entries of the previous list of this  #
+# deck that neither this run nor another deck uses are removed, and only state files (hex hash     #
+# name with .json/.lines/.nodes/.tmp extension), other files and directories are never touched     #
+####################################################################################################
+state_file_pattern = re.compile(r'([0-9a-f]{64})(?:\.\d+\.tmp)?\.(?:json|lines|nodes)')
+deck_list_pattern = re.compile(r'deck_[0-9a-f]{64}\.json')
+
+def prune_incremental_state(deck_path):
+    deck_key = hashlib.sha256(os.path.normcase(os.path.abspath(deck_path)).encode('utf-8')).hexdigest()
+    deck_list_path = os.path.join(incremental_state_dir, f"deck_{deck_key}.json")
+    try:
+        with open(deck_list_path) as deck_list_file:
+            previous_entries = set(json.load(deck_list_file)['entries'])
+    except (OSError, ValueError, KeyError, TypeError):
+        previous_entries = set()
+
+    os.makedirs(incremental_state_dir, exist_ok=True)
+    with open(f"{deck_list_path}.{os.getpid()}", "w") as deck_list_file:
+        json.dump({'deck': os.path.abspath(deck_path), 'entries': sorted(incremental_state_used)}, deck_list_file)
+    os.replace(f"{deck_list_path}.{os.getpid()}", deck_list_path)
+
+    stale_entries = previous_entries - incremental_state_used
+    if not stale_entries:
+        return
+    with os.scandir(incremental_state_dir) as directory_entries:
+        directory_entries = list(directory_entries)
+    for entry in directory_entries:
+        if entry.name != os.path.basename(deck_list_path) and deck_list_pattern.fullmatch(entry.name):
+            try:
+                with open(entry.path) as deck_list_file:
+                    stale_entries -= set(json.load(deck_list_file)['entries'])
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+    for entry in directory_entries:
+        state_file = state_file_pattern.fullmatch(entry.name)
+        if state_file and state_file.group(1) in stale_entries and entry.is_file(follow_symlinks=False):
+            try:
+                os.remove(entry.path)
+            except OSError as e:
+                print(f"### WARNING ###: parse state file {entry.path} not removed: {e}")
+
+
 ####################################################################################################
 # Function to Read input file and then run the code on it, starting a progress timer               #
 ####################################################################################################
@@ -6714,50 +7095,31 @@ def input_read(input_file_path):
     else:
         print("Converting .inp file, Please wait...")
 
-    with open(input_file_path, "r") as input_file:
-
 
 ####################################################################################################
 # Start a timer to check script performance                                                        #
 ####################################################################################################
 
-        if run_timer:
-            start_time = time.time()
-            print("Starting Timer:             0.000 seconds")
-
-        if or_gui:
-            start_time = time.time()
+    if run_timer:
+        start_time = time.time()
+        print("Starting Timer:             0.000 seconds")
 
+    if or_gui:
+        start_time = time.time()
 
-####################################################################################################
-# Pass the input lines from the .inp deck as a list                                                #
-####################################################################################################
+    start_profile()
 
-        original_lines = input_file.readlines()
 
 ####################################################################################################
-# Check for INCLUDE files and process contents                                                     #
+# Pass the input lines from the .inp deck (with INCLUDE files) as a stream, the first stage        #
+# reading it ('preprocess_lines') builds the only full list of the deck                            #
 ####################################################################################################
 
-    expanded_lines = []
-    include_pattern = re.compile(r'\*INCLUDE\s*,\s*INPUT\s*=\s*(.+)', re.IGNORECASE)
+    bulk_node_blocks.clear()
+    incremental_state_used.clear()
+    original_lines = read_deck_lines(input_file_path)
 
-    for line in original_lines:
-        match = include_pattern.match(line.strip())
-        if match:
-            include_path = match.group(1).strip()
-            include_path = os.path.normpath(os.path.join(os.path.dirname(input_file_path), include_path))  # Resolve relative path
-            if os.path.exists(include_path):
-                print(f"Including file: {include_path}")
-                with open(include_path, "r") as include_file:
-                    expanded_lines.extend(include_file.readlines())
-            else:
-                print(f"### WARNING ###: Included file {include_path} not found. Keeping original reference.")
-                expanded_lines.append(line)
-        else:
-            expanded_lines.append(line)
-
-    return (expanded_lines, input_file_name, simple_file_name, output_file_name,
+    return (original_lines, input_file_name, simple_file_name, output_file_name,
             output_file_path, engine_file_name, engine_file_path)
 
 
@@ -7507,6 +7869,49 @@ def ppm_rigids(input_lines):
     return [line.rstrip() + '\n' for line in modified_ppm_lines]  # Ensure lines end with a newline
 
 
+####################################################################################################
+# Function to resolve sets referencing other sets by name (NSET and ELSET), set_items holds the    #
+# ids and referenced set names of each set. Each set is resolved once, after the sets it           #
+# references (depth first, no recursion), into a sorted array of unique ids. A set that includes   #
+# itself through other sets is an error, a direct self reference or an unknown name is skipped     #
+####################################################################################################
+def resolve_set_references(set_items, set_kind, set_names=None):
+    resolved_sets = {}
+
+    for set_name in set_items if set_names is None else set_names:
+        if set_name in resolved_sets or set_name not in set_items:
+            continue
+        walk_names = [set_name]
+        walk_items = [iter(set_items[set_name])]
+
+        while walk_names:
+            current_name = walk_names[-1]
+            for item in walk_items[-1]:
+                if (isinstance(item, str) and item != current_name and item in set_items
+                        and item not in resolved_sets and not item.isdigit()):
+                    if item in walk_names:
+                        cycle = walk_names[walk_names.index(item):] + [item]
+                        raise ValueError(f"{set_kind} references form a cycle: {' -> '.join(cycle)}")
+                    walk_names.append(item)
+                    walk_items.append(iter(set_items[item]))
+                    break
+            else:
+                # every referenced set is resolved, collect the ids
+                set_ids = set()
+                for item in set_items[current_name]:
+                    if isinstance(item, int):
+                        set_ids.add(item)
+                    elif item.isdigit():
+                        set_ids.add(int(item))
+                    elif item in resolved_sets:
+                        set_ids.update(resolved_sets[item])
+                resolved_sets[current_name] = array('q', sorted(set_ids))
+                walk_names.pop()
+                walk_items.pop()
+
+    return resolved_sets
+
+
 ####################################################################################################
 # Find referenced elsets (reference other elsets by name)                                          #
 ####################################################################################################
@@ -7546,30 +7951,9 @@ def find_referenced_elsets(input_lines):
 
         i += 1
 
-    # Step 2: Resolve all references so each elset only contains numbers
-    def resolve_elset(elset_name):
-
-        resolved_values = []
-        for item in elset_references.get(elset_name, []):
-            # Check if item is already an integer
-            if isinstance(item, int):
-                resolved_values.append(item)
-            # If it's a string representation of a number, convert it to an integer
-            elif item.isdigit():
-                resolved_values.append(int(item))
-            else:  # Another elset name, resolve it recursively
-                #input(f"this is the item: {item}")
-                if item != elset_name:
-                    resolved_values.extend(resolve_elset(item))  # Recursively resolve
-
-        # Update the current elset with resolved numeric values only (keeps duplicates for each set)
-        elset_references[elset_name] = resolved_values
-        return resolved_values
-
-    # Step 3: Resolve all elsets in the dictionary
-    for elset_name in list(elset_references.keys()):
-        resolve_elset(elset_name)
-    elset_references = {name: values for name, values in elset_references.items() if any(isinstance(v, int) for v in values)}
+    # Step 2: Resolve all references so each elset only contains (unique, sorted) numbers
+    resolved_elsets = resolve_set_references(elset_references, "ELSET")
+    elset_references = {name: element_ids.tolist() for name, element_ids in resolved_elsets.items() if element_ids}
     non_numeric_references = {k: v for k, v in non_numeric_references.items() if v}
     #print(elset_references)
     return elset_references, non_numeric_references
@@ -7660,22 +8044,33 @@ def start(input_file_path):
 # Prepare input file (removes comments, special characters)                                        #
 ####################################################################################################
         input_lines = preprocess_lines(original_lines)
+        stage_checkpoint("Deck Read", None, len(input_lines))
         input_lines = expand_elset_ranges(input_lines)
+        stage_checkpoint("Elset Ranges Done", len(input_lines))
         elset_references, non_numeric_references = find_referenced_elsets(input_lines)
         nset_references = find_referenced_nsets(input_lines)
+        stage_checkpoint("References Found", 2 * len(input_lines),
+            len(elset_references) + len(non_numeric_references) + len(nset_references)
+            )
         input_lines = create_part_elsets(input_lines)
+        stage_checkpoint("Part Elsets Done", None, len(input_lines))
         input_lines = create_rigid_elsets(input_lines, elset_references)
+        stage_checkpoint("Rigid Elsets Done", None, len(input_lines))
         input_lines = ppm_rigids(input_lines)
+        stage_checkpoint("PPM Rigids Done", None, len(input_lines))
         (input_lines, elsets_for_expansion_dict, relsets_for_expansion_dict
          ) = replace_elsets_in_sections(input_lines, elset_references)
+        stage_checkpoint("Section Elsets Done", len(input_lines), len(elsets_for_expansion_dict)
+            + len(relsets_for_expansion_dict)
+            )
 
 ####################################################################################################
 # Call the main_conversion function to get the necessary data from the conversion blocks           #
 ####################################################################################################
         (transform_lines, transform_data, node_lines, nsets, nset_blocks, material_names,
          extra_material_names, property_names, element_lines, elset_blocks, surface_lines,
-         contacts, tied_contacts, boundary_blocks, function_blocks, initial_blocks, dload_blocks,
-         pload_blocks, rigid_bodies, couplings, discoups, mpc_ties, conn_beams, engine_file
+         contacts, inter_id, tied_contacts, boundary_blocks, function_blocks, initial_blocks,
+         dload_blocks, pload_blocks, rigid_bodies, couplings, discoups, mpc_ties, conn_beams, engine_file
          ) = main_conversion_sp(input_lines, simple_file_name, elsets_for_expansion_dict,
          non_numeric_references, relsets_for_expansion_dict, nset_references
          )
@@ -7683,41 +8078,108 @@ def start(input_file_path):
 ####################################################################################################
 # Call the output function to write data to Radioss from the conversion blocks                     #
 ####################################################################################################
-        output_done = write_output(transform_lines, transform_data, node_lines, nset_blocks,
-                                   material_names, extra_material_names, property_names,
-                                   non_numeric_references, nsets, element_lines, elset_blocks,
-                                   surface_lines, contacts, tied_contacts, boundary_blocks,
-                                   function_blocks, initial_blocks, dload_blocks, pload_blocks,
-                                   rigid_bodies, couplings, discoups, mpc_ties, conn_beams,
-                                   engine_file, simple_file_name, output_file_name,
-                                   output_file_path, engine_file_name, engine_file_path
+        model_data = dict(
+            transform_lines=transform_lines, transform_data=transform_data, node_lines=node_lines,
+            nset_blocks=nset_blocks, material_names=material_names,
+            extra_material_names=extra_material_names, property_names=property_names,
+            non_numeric_references=non_numeric_references, nsets=nsets, element_lines=element_lines,
+            elset_blocks=elset_blocks, surface_lines=surface_lines, contacts=contacts,
+            inter_id=inter_id, tied_contacts=tied_contacts, boundary_blocks=boundary_blocks,
+            function_blocks=function_blocks, initial_blocks=initial_blocks,
+            dload_blocks=dload_blocks, pload_blocks=pload_blocks, rigid_bodies=rigid_bodies,
+            couplings=couplings, discoups=discoups, mpc_ties=mpc_ties, conn_beams=conn_beams,
+            engine_file=engine_file
+            )
+
+        output_done = write_output(**model_data, simple_file_name=simple_file_name,
+                                   output_file_name=output_file_name, output_file_path=output_file_path,
+                                   engine_file_name=engine_file_name, engine_file_path=engine_file_path
                                    )
 
+        # The model is an extra output: the deck is written first and a failure is only reported
+        if save_model_file and output_done:
+            try:
+                save_model(os.path.join(os.path.dirname(output_file_path), simple_file_name), simple_file_name, model_data)
+                stage_checkpoint("Model Saved")
+            except (OSError, TypeError, ValueError) as e:
+                print(f"### WARNING ###: Model not saved: {e}")
+
+        if profile_report:
+            write_profile_report(os.path.join(os.path.dirname(output_file_path), simple_file_name))
+
+        if output_done and not or_gui:
+            input("Press Enter to exit...")
+
 ####################################################################################################
 # Return Status (True if script completed )                                                        #
 ####################################################################################################
         return output_done
 
     except Exception as e:
-        # Log the error and return failure
-        if or_gui:
-        # Provide a simple error message for GUI usage
-            print("------------------------------------------------------------")
-            print("### ERROR ###: An error occurred during inp2rad conversion.")
-            print(f"Error in inp2rad: {e}")
-            print("run inp2rad in command line for more details")
-            print("------------------------------------------------------------")
+        print_conversion_error(e)
+        return False
 
-        else:
-            # Provide full traceback for command-line usage
-            print("------------------------------------------------------------")
-            print("### ERROR ###: Full traceback below:")
-            import traceback
-            traceback.print_exc()
+    finally:
+        # Stop the worker processes used with --jobs
+        close_conversion_pool()
+
+
+####################################################################################################
+# Function to write the Radioss deck from a model file saved by an earlier conversion              #
+####################################################################################################
+def start_from_model(model_path, keep_radversion):
+    global start_time
+    try:
+        print("Writing Radioss deck from model file, Please wait...")
+        start_time = time.time()
+        if run_timer:
+            print("Starting Timer:             0.000 seconds")
+        start_profile()
+
+        model_data, simple_file_name = load_model(model_path, keep_radversion)
+        stage_checkpoint("Model Loaded")
+
+        output_directory = os.path.dirname(model_path)
+        output_file_name = simple_file_name + "_0000.rad"
+        engine_file_name = simple_file_name + "_0001.rad"
+        output_done = write_output(**model_data, simple_file_name=simple_file_name,
+                                   output_file_name=output_file_name,
+                                   output_file_path=os.path.join(output_directory, output_file_name),
+                                   engine_file_name=engine_file_name,
+                                   engine_file_path=os.path.join(output_directory, engine_file_name)
+                                   )
+
+        if profile_report:
+            write_profile_report(os.path.join(output_directory, simple_file_name))
 
+        if output_done and not or_gui:
+            input("Press Enter to exit...")
+
+        return output_done
+
+    except Exception as e:
+        print_conversion_error(e)
         return False
 
 
+def print_conversion_error(e):
+    # Log the error and return failure
+    if or_gui:
+    # Provide a simple error message for GUI usage
+        print("------------------------------------------------------------")
+        print("### ERROR ###: An error occurred during inp2rad conversion.")
+        print(f"Error in inp2rad: {e}")
+        print("run inp2rad in command line for more details")
+        print("------------------------------------------------------------")
+
+    else:
+        # Provide full traceback for command-line usage
+        print("------------------------------------------------------------")
+        print("### ERROR ###: Full traceback below:")
+        import traceback
+        traceback.print_exc()
+
+
 def execute_gui(input_deck,tm):
     input_file_path=input_deck
     run_timer = tm
@@ -7731,6 +8193,9 @@ def execute_gui(input_deck,tm):
         return False
 
 if __name__ == "__main__":
+    # Worker processes of --jobs started from a frozen (pyinstaller) executable run
+    # the executable again, freeze_support makes them run their task and exit
+    freeze_support()
 
 #---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|
 #-  FOR Subprocess based INPUT (called from command line or OpenRadioss gui submission tool)
@@ -7747,6 +8212,7 @@ if __name__ == "__main__":
             sys.exit()
         or_gui = False
         run_timer = True
+        model_input = False
 
         # Ask the user if they want a rad file compatible with HM
         if messagebox.askyesno("Compatibility Question", "Do you want latest Radioss format (2025)?\n 'No' will return 2023 format for legacy compatibility"):
@@ -7760,11 +8226,31 @@ if __name__ == "__main__":
         parser.add_argument('input_file', nargs='?', help="Path to the input file")
         parser.add_argument('--timer', '-t', action='store_true', help="Run with timer")
         parser.add_argument('--radv' , '-rv', type=int, choices=[2023, 2025], help='RAD file version (2023 or 2025)')
+        parser.add_argument('--mmap', action='store_true', help="Memory map the deck and parse *NODE data in bulk (large decks)")
+        parser.add_argument('--jobs', '-j', type=int, default=1, help="Number of processes used for the conversion")
+        parser.add_argument('--profile', action='store_true', help="Write a per stage profile report (JSON and CSV)")
+        parser.add_argument('--save-model', action='store_true', help="Save the converted model (_model.json and _model.bin)")
+        parser.add_argument('--from-model', action='store_true', help="Input file is a _model.json, write the Radioss deck from it "
+                                 "(in the RAD version of the model unless --radv is given)")
+        parser.add_argument('--incremental', nargs='?', const='', metavar='STATE_DIR',
+                            help="Keep the parse state per include file: the *NODE tables of unchanged files are "
+                                 "reused, elements, sets and surfaces are always parsed again "
+                                 "(state in STATE_DIR/inp2rad_state, default: <deck>_inp2rad_state next to the deck)")
         args = parser.parse_args()
 
         or_gui = False    # When run in Batch mode, True avoids interaction.
         run_timer = args.timer
         input_file_path = args.input_file
+        mmap_bulk_data = args.mmap
+        conversion_jobs = max(1, args.jobs)
+        profile_report = args.profile
+        save_model_file = args.save_model
+        model_input = args.from_model
+        if args.incremental is not None:
+            if args.incremental:
+                incremental_state_dir = os.path.join(os.path.abspath(args.incremental), "inp2rad_state")
+            else:
+                incremental_state_dir = os.path.splitext(os.path.abspath(input_file_path))[0] + "_inp2rad_state"
         if args.radv:
             radversion = args.radv
         else:
@@ -7772,5 +8258,8 @@ if __name__ == "__main__":
 #---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|
 #-  FOR SELF CONTAINED INPUT (opens a file browser if script is called without file argument)
 #---1----|----2----|----3----|----4----|----5----|----6----|----7----|----8----|----9----|---10----|
-    start(input_file_path)
+    if model_input:
+        start_from_model(input_file_path, not args.radv)
+    else:
+        start(input_file_path)
   
@@ -31,6 +31,7 @@ import subprocess
 from tkinter import filedialog
 from tkinter import messagebox
 from job_holder import JobHolder
+import process_supervisor
 
 try:
     from vortex_radioss.animtod3plot.Anim_to_D3plot import readAndConvert
@@ -54,13 +55,14 @@ class openradioss_gui:
         self.debug=debug
         self.script_dir=script_dir
         self.mpi_path = ''
+        self.core_budget = process_supervisor.available_cores()
         self.current_platform = platform.system()
 
         self.load_config()
 
-        self.job_holder = JobHolder(self.debug)
+        self.job_holder = JobHolder(self.debug,self.core_budget)
         # Check if the user has selected a valid MPI path
-        self.Window     = gui_def.window(vd3penabled, vtkhdfenabled,self.mpi_path,self.single_status,self.starter_status,self.vtk_status,self.csv_status,self.vtkhdf_status,self.d3plot_status,script_dir)
+        self.Window     = gui_def.window(vd3penabled, vtkhdfenabled,self.mpi_path,self.single_status,self.starter_status,self.vtk_status,self.csv_status,self.vtkhdf_status,self.d3plot_status,script_dir,self.core_budget)
      
         self.job_file_entry=self.Window.file('Job file (.rad, .key, or .k, or .inp)', self.select_file, self.Window.icon_folder)
      
@@ -100,6 +102,7 @@ class openradioss_gui:
       #----------------------------------------------------------------------------
       def close_window(self):
          if self.job_holder.is_empty() or messagebox.askokcancel('Close Window', 'Job is running. Close?'):
+           if process_supervisor.process_supervisor: process_supervisor.process_supervisor.terminate_all()
            self.Window.close()
            quit()
 
@@ -150,6 +153,10 @@ class openradioss_gui:
            self.job_holder.clear_queue()
 
       def run_job(self):
+           if self.core_budget != self.Window.core_budget:
+               self.core_budget = self.Window.core_budget
+               self.job_holder.set_core_budget(self.core_budget)
+               self.save_config()
            self.job_holder.run_job()
            self.Window.root.after(1000, self.run_job)
            return
@@ -198,6 +205,7 @@ class openradioss_gui:
            config['np'] = self.np_entry.get_user_input()
            config['nt'] = self.nt_entry.get_user_input()
            config['mpi_path'] = self.mpi_path
+           config['core_budget'] = self.core_budget
 
            # Open File & Write Json file
            if self.current_platform == 'Windows': 
@@ -247,6 +255,17 @@ class openradioss_gui:
                    else:
                       self.mpi_path = ''
                    #
+                   if "core_budget" in config_file:
+                     core_budget = config_file['core_budget']
+                     cores = process_supervisor.available_cores()
+                     if type(core_budget) is not int or core_budget < 1:
+                        print(" *** Warning: core_budget", repr(core_budget), "in", json_file, "is not a number >= 1, using", cores, "cores")
+                     elif core_budget > cores:
+                        print(" *** Warning: core_budget", core_budget, "in", json_file, "is larger than the", cores, "available cores, using", cores)
+                        self.core_budget = cores
+                     else:
+                        self.core_budget = core_budget
+                   #
                    if "sp" in config_file:
                         self.single_status=config_file['sp']
                    else:
@@ -0,0 +1,216 @@
+# Copyright 1986-2026 Altair Engineering Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+# IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Headless job queue: runs a list of OpenRadioss jobs with RunOpenRadioss.batch_run,
+# several at a time, without Tk. Each job runs in its own Python process writing its
+# output in a log file, the queue writes a json summary with the status and the wall
+# time of each phase of every job.
+import os
+import sys
+import argparse
+import csv
+import json
+import signal
+import subprocess
+import time
+
+from process_supervisor import available_cores
+
+# Fields of a job, in the order of the command built by the GUI (add_job)
+job_fields = ['file', 'nt', 'np', 'precision', 'anim_to_vtk', 'th_to_csv', 'starter_only', 'anim_to_d3plot', 'anim_to_vtkhdf', 'mpi_path']
+job_defaults = ['', '1', '1', 'dp', 'no', 'no', 'no', 'no', 'no', '']
+# Seconds between two checks of the running jobs
+poll_interval = 1.0
+
+# --------------------------------------------------------------
+# Convert a job of the job list (list of fields or dict with
+# job_fields keys) to the 10 field command of RunOpenRadioss
+# --------------------------------------------------------------
+def job_command(job, list_directory):
+    if isinstance(job, dict):
+        unknown_keys = set(job) - set(job_fields)
+        if unknown_keys:
+            raise ValueError('unknown job fields: ' + ', '.join(sorted(unknown_keys)))
+        job = [job.get(field, default) for field, default in zip(job_fields, job_defaults)]
+    if not job or len(job) > len(job_fields):
+        raise ValueError('a job has 1 to ' + str(len(job_fields)) + ' fields: ' + str(job))
+    command = [str(value).strip() for value in job] + job_defaults[len(job):]
+    command = [value if value else default for value, default in zip(command, job_defaults)]
+    if not command[0]:
+        raise ValueError('job without input file: ' + str(job))
+    # input files are relative to the job list
+    command[0] = os.path.normpath(os.path.join(list_directory, command[0]))
+    return command
+
+# --------------------------------------------------------------
+# Read the job list: json (list of jobs) or csv (one job per line,
+# fields in job_fields order, optional header line, # comments)
+# --------------------------------------------------------------
+def read_job_list(job_list):
+    list_directory = os.path.dirname(os.path.abspath(job_list))
+    with open(job_list, newline='') as file:
+        if job_list.lower().endswith('.json'):
+            jobs = json.load(file)
+        else:
+            jobs = [row for row in csv.reader(file) if row and row[0].strip() and not row[0].lstrip().startswith('#')]
+            if jobs and [value.strip() for value in jobs[0]] == job_fields[:len(jobs[0])]:
+                jobs = [dict(zip(job_fields, row)) for row in jobs[1:]]
+    return [job_command(job, list_directory) for job in jobs]
+
+# --------------------------------------------------------------
+# Run one job (child process of the queue), the result is written
+# as json in result_file
+# --------------------------------------------------------------
+def run_single_job(command, result_file, timeout, cores, debug):
+    from runopenradioss import RunOpenRadioss
+    from process_supervisor import get_supervisor
+
+    # the queue stops a job with SIGTERM: stop its processes like Ctrl-C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    # converter processes of the job, the cores are shared by the jobs running at the same time
+    if cores: get_supervisor().set_core_budget(cores)
+    run_or = RunOpenRadioss(command, debug)
+    run_or.timeout = timeout
+    try:
+        run_or.batch_run()
+    except KeyboardInterrupt:
+        print(' *** Job stopped')
+    except Exception as e:
+        print(' *** Error: ', str(e))
+        run_or.status = 'error: ' + str(e)
+    finally:
+        sys.stdout.flush()
+        with open(result_file, 'w') as file:
+            json.dump({'status': run_or.status, 'phase_times': run_or.phase_times}, file)
+    return run_or.status == 'finished'
+
+class BatchQueue():
+
+    def __init__(self, commands, max_jobs, log_dir, timeout, debug):
+        self.commands = commands
+        self.max_jobs = max(1, max_jobs)
+        self.log_dir = log_dir
+        self.timeout = timeout
+        self.debug = debug
+        self.running_jobs = []
+        self.results = []
+
+    def start_job(self, index, command):
+        jobname = os.path.splitext(os.path.basename(command[0]))[0]
+        log_file = os.path.join(self.log_dir, f'{index:04d}_{jobname}.log')
+        result_file = log_file[:-4] + '.json'
+        if os.path.exists(result_file):
+            os.remove(result_file)
+        job_command_line = [sys.executable, os.path.abspath(__file__), '-run_job', json.dumps(command), '-result', result_file]
+        if self.timeout: job_command_line.extend(['-timeout', str(self.timeout)])
+        job_command_line.extend(['-cores', str(max(1, available_cores() // self.max_jobs))])
+        if self.debug == 1: job_command_line.append('-d')
+        print(f' Job {index}: {command[0]} started, log: {log_file}')
+        sys.stdout.flush()
+        log = open(log_file, 'w')
+        process = subprocess.Popen(job_command_line, stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, cwd=os.path.dirname(command[0]) or None)
+        log.close()
+        self.running_jobs.append({'index': index, 'command': command, 'process': process, 'log': log_file,
+                                  'result_file': result_file, 'start_time': time.perf_counter()})
+
+    def finish_job(self, job):
+        result = {'status': 'error: job process exited with code ' + str(job['process'].returncode), 'phase_times': {}}
+        try:
+            with open(job['result_file']) as file:
+                result = json.load(file)
+            os.remove(job['result_file'])
+        except (OSError, ValueError):
+            pass
+        result.update({'index': job['index'], 'file': job['command'][0], 'command': job['command'], 'log': job['log'],
+                       'wall_time': round(time.perf_counter() - job['start_time'], 3)})
+        result['phase_times'] = {phase: round(seconds, 3) for phase, seconds in result['phase_times'].items()}
+        print(f" Job {job['index']}: {job['command'][0]} {result['status']} ({result['wall_time']} s)")
+        sys.stdout.flush()
+        self.results.append(result)
+
+    def run(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        start_time = time.perf_counter()
+        pending = list(enumerate(self.commands, 1))
+        pending.reverse()
+        try:
+            while pending or self.running_jobs:
+                for job in [job for job in self.running_jobs if job['process'].poll() is not None]:
+                    self.running_jobs.remove(job)
+                    self.finish_job(job)
+                while pending and len(self.running_jobs) < self.max_jobs:
+                    self.start_job(*pending.pop())
+                if self.running_jobs:
+                    time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            print(' Interrupted, stopping the running jobs')
+            for job in self.running_jobs:
+                job['process'].terminate()
+            for job in self.running_jobs:
+                job['process'].wait()
+                self.finish_job(job)
+            for index, command in reversed(pending):
+                self.results.append({'index': index, 'file': command[0], 'command': command, 'status': 'not started', 'phase_times': {}})
+
+        self.results.sort(key=lambda result: result['index'])
+        return {'jobs': self.results,
+                'finished': sum(1 for result in self.results if result['status'] == 'finished'),
+                'failed': sum(1 for result in self.results if result['status'] != 'finished'),
+                'wall_time': round(time.perf_counter() - start_time, 3)}
+
+# ===========================================
+# Main entry point
+# ===========================================
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description='OpenRadioss headless job queue')
+  parser.add_argument('job_list', nargs='?', help='Job list: .json (list of jobs, each a list of fields or a dict) or .csv (one job per line). Fields: ' + ' '.join(job_fields))
+  parser.add_argument('-j', '--max_jobs', type=int, default=1, metavar='n', help='Number of jobs running at the same time (default 1)')
+  parser.add_argument('-log_dir', '--log_dir', type=str, help='Directory of the job logs (default: <job list>_logs)')
+  parser.add_argument('-summary', '--summary', type=str, help='json summary file (default: <job list>_summary.json)')
+  parser.add_argument('-timeout', '--timeout', type=float, metavar='s', help='Seconds after which a starter, engine or converter process is stopped')
+  parser.add_argument('-run_job', '--run_job', type=str, help=argparse.SUPPRESS)
+  parser.add_argument('-result', '--result', type=str, help=argparse.SUPPRESS)
+  parser.add_argument('-cores', '--cores', type=int, help=argparse.SUPPRESS)
+  parser.add_argument('-d', '--debug', action='store_true', default=False, help='Enable debug mode')
+  args = parser.parse_args()
+  debug = 1 if args.debug else 0
+
+  if args.run_job:
+      exit(0 if run_single_job(json.loads(args.run_job), args.result, args.timeout, args.cores, debug) else 1)
+
+  if not args.job_list:
+      parser.print_help()
+      exit(1)
+
+  try:
+      commands = read_job_list(args.job_list)
+  except (OSError, ValueError) as e:
+      print('Error: cannot read job list '+args.job_list+': '+str(e))
+      exit(1)
+
+  list_base = os.path.splitext(os.path.abspath(args.job_list))[0]
+  log_dir = os.path.abspath(args.log_dir) if args.log_dir else list_base + '_logs'
+  summary_file = args.summary if args.summary else list_base + '_summary.json'
+
+  print(f' {len(commands)} jobs, {max(1, args.max_jobs)} running at the same time')
+  summary = BatchQueue(commands, args.max_jobs, log_dir, args.timeout, debug).run()
+  with open(summary_file, 'w') as file:
+      json.dump(summary, file, indent=4)
+  print(f" {summary['finished']} jobs finished, {summary['failed']} failed, summary: {summary_file}")
+  exit(0 if summary['failed'] == 0 else 1)
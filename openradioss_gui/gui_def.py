@@ -32,13 +32,14 @@ elif arch=='Linux':
     button_width=8
 
 class window:
-    def __init__(self, vd3penabled, vtkhdfenabled,mpi_path,sp_status,starter_status,vtk_status,csv_status,vtkhdf_status,d3plot_status,script_dir):
+    def __init__(self, vd3penabled, vtkhdfenabled,mpi_path,sp_status,starter_status,vtk_status,csv_status,vtkhdf_status,d3plot_status,script_dir,core_budget):
 
         self.root = tk.Tk()
         self.root.title('OpenRadioss')
         self.vd3penabled = vd3penabled
         self.vtkhdfenabled = vtkhdfenabled
         self.mpi_path = mpi_path
+        self.core_budget = core_budget
 
         if arch == 'Windows':
             self.root.geometry('700x105')
@@ -129,6 +130,7 @@ class window:
         self.menubar.add_cascade(label="Info", menu=self.about_menu)
         #
         self.config_menu.add_command(label="MPI Path", command=self._set_mpi_path_dialog)
+        self.config_menu.add_command(label="Core Budget", command=self._set_core_budget_dialog)
         #
         self.about_menu.add_command(label="Get the latest version of OpenRadioss (github link)", command=self._latestv_dialog)
         self.about_menu.add_command(label="Documentation and Latest Version of this gui (github_link)", command=self._latestgui_dialog)
@@ -174,3 +176,7 @@ class window:
         value = simpledialog.askstring("MPI Path", "Enter the ROOT directory of MPI installation:                      ", initialvalue=self.mpi_path)
         if value is not None:
             self.mpi_path = value
+    def _set_core_budget_dialog(self):
+        value = simpledialog.askinteger("Core Budget", "Number of cores (-nt x -np) shared by the jobs running at the same time:", initialvalue=self.core_budget, minvalue=1)
+        if value is not None:
+            self.core_budget = value
@@ -27,19 +27,46 @@ from tkinter import ttk
 
 from button_with_highlight import ButtonWithHighlight
 from job_window import JobWindow
+from process_supervisor import available_cores, get_supervisor
 
 class State(Enum):
 
     WAITING = 0
     RUNNING = 1
 
+# Number of cores used by a job: -nt threads for each of the -np MPI processes
+def job_cores(command):
+    try:
+        return max(1, int(command[1] or 1)) * max(1, int(command[2] or 1))
+    except ValueError:
+        return 1
+
 class JobHolder():
 
-    def __init__(self,debug):
+    def __init__(self,debug,core_budget=None):
         self.state = State.WAITING
         self.deque = deque()
+        self.running_jobs = []
         self.is_showing_queue = False
         self.debug = debug
+# Cores shared by the running jobs, all available cores by default
+        self.set_core_budget(core_budget or available_cores())
+# Jobs allowed to start before the blocked first job of the queue (backfill), so it is not delayed forever
+        self.backfill_limit = 10
+        self.backfill_count = 0
+
+# The converter processes of the running jobs share the same budget
+    def set_core_budget(self, cores):
+        self.core_budget = cores
+        get_supervisor().set_core_budget(cores)
+
+    def used_cores(self):
+        return sum(job_cores(command) for command, job_window in self.running_jobs)
+
+    def start_job(self, command):
+        if self.debug==1: print('Start job:', command[0], 'cores:', job_cores(command), 'used:', self.used_cores(), 'budget:', self.core_budget)
+        self.running_jobs.append((command, JobWindow(command,self.debug)))
+        self.state = State.RUNNING
 
     def submit_next_job(self):
         if not self.deque:
@@ -48,7 +75,7 @@ class JobHolder():
 # Get the next job from the queue
         command = self.deque.popleft()
 # Open a new instance of JobWindow with the next job
-        job_window_instance = JobWindow(command,self.debug)
+        self.start_job(command)
 # Show the updated queue if it's open
         if self.is_showing_queue:
             self.print_queue()
@@ -60,7 +87,7 @@ class JobHolder():
 # Get the next job from the queue
         command = self.deque.pop()
 # Open a new instance of JobWindow with the next job
-        job_window_instance = JobWindow(command,self.debug)
+        self.start_job(command)
 # Show the updated queue if it's open
         if self.is_showing_queue:
             self.print_queue()
@@ -75,16 +102,36 @@ class JobHolder():
         return True
 
     def update_state(self):
-        if self.state == State.RUNNING and self.running_job.is_finished:
+        running_count = len(self.running_jobs)
+        self.running_jobs = [job for job in self.running_jobs if not job[1].is_finished]
+        if not self.running_jobs:
             self.state = State.WAITING
+        return len(self.running_jobs) != running_count
 
+# Start the queued jobs fitting in the free cores, first in first out.
+# When the first job does not fit, smaller jobs behind it are started in the free cores (backfill)
+# until backfill_limit jobs passed it, then the queue waits for the first job.
+# A job needing more cores than the budget is started alone.
     def run_job(self):
-        self.update_state()
-        if self.state == State.RUNNING: return
-        if not self.deque: return
-        self.state = State.RUNNING
-        self.running_job = JobWindow(self.deque.popleft(),self.debug)
-        if self.is_showing_queue: self.print_queue()
+        changed = self.update_state()
+        free_cores = self.core_budget - self.used_cores()
+        index = 0
+        while index < len(self.deque):
+            if index > 0 and self.backfill_count >= self.backfill_limit: break
+            command = self.deque[index]
+            cores = job_cores(command)
+            if cores <= free_cores or (index == 0 and not self.running_jobs):
+                del self.deque[index]
+                self.start_job(command)
+                free_cores -= cores
+                changed = True
+                if index == 0:
+                    self.backfill_count = 0
+                else:
+                    self.backfill_count += 1
+                continue
+            index += 1
+        if changed and self.is_showing_queue: self.print_queue()
 
     def clear_queue(self):
         if not self.deque:
@@ -96,7 +143,9 @@ class JobHolder():
 
     def print_queue(self):
         self.queue_list.delete(*self.queue_list.get_children())
-        for command in self.deque:
+        jobs = [('running', command) for command, job_window in self.running_jobs]
+        jobs.extend(('waiting', command) for command in self.deque)
+        for state, command in jobs:
             dir = os.path.dirname(command[0])
             job = os.path.basename(command[0])
             nt = command[1]
@@ -106,11 +155,13 @@ class JobHolder():
             csv = command[5]
             d3plot = command[7]
             vtkhdf = command[8]
-            self.queue_list.insert(parent='', index='end', values=(dir, job, nt, np, sp, vtk, vtkhdf, d3plot, csv))
+            self.queue_list.insert(parent='', index='end', values=(state, dir, job, nt, np, sp, vtk, vtkhdf, d3plot, csv))
+        self.queue_window.title(f'Job Queue - {self.used_cores()}/{self.core_budget} cores used')
 
     def cancel_next_job(self):
         if self.deque:
             self.deque.popleft()
+            self.backfill_count = 0
             self.print_queue()
 
     def cancel_last_job(self):
@@ -137,8 +188,9 @@ class JobHolder():
         self.queue_window.protocol('WM_DELETE_WINDOW', self.close_queue)
         self.queue_window.grid_rowconfigure(0, weight=1)
         self.queue_window.grid_columnconfigure(0, weight=1)
-        self.queue_list = ttk.Treeview(self.queue_window, columns=('directory', 'job name', '-nt', '-np', 'sp', 'vtk', 'vtkhdf', 'd3plot', 'csv'))
+        self.queue_list = ttk.Treeview(self.queue_window, columns=('state', 'directory', 'job name', '-nt', '-np', 'sp', 'vtk', 'vtkhdf', 'd3plot', 'csv'))
         self.queue_list.column('#0', width=0, stretch=False)
+        self.queue_list.column('state', anchor='center', width=70, stretch=False)
         self.queue_list.column('directory', anchor='w', width=600, stretch=True)
         self.queue_list.column('job name', anchor='w', width=300, stretch=True)
         self.queue_list.column('-nt', anchor='center', width=50, stretch=False)
@@ -148,6 +200,7 @@ class JobHolder():
         self.queue_list.column('vtkhdf', anchor='center', width=50, stretch=False)
         self.queue_list.column('d3plot', anchor='center', width=50, stretch=False)
         self.queue_list.column('csv', anchor='center', width=50, stretch=False)
+        self.queue_list.heading('state', text='state', anchor='center')
         self.queue_list.heading('directory', text='directory', anchor='w')
         self.queue_list.heading('job name', text='job name', anchor='w')
         self.queue_list.heading('-nt', text='-nt', anchor='center')
@@ -20,13 +20,12 @@
 import os
 import re
 import platform
-import contextlib
-import subprocess
-import threading
+import queue
 import tkinter as tk
 from tkinter import scrolledtext
 from tkinter import messagebox
 from runopenradioss import RunOpenRadioss
+from process_supervisor import get_supervisor
 from button_with_highlight import ButtonWithHighlight
 
 try:
@@ -43,18 +42,13 @@ except ImportError:
 
 current_platform = platform.system()
 
-
-class RedirectText:
-    def __init__(self, widget):
-        self.widget = widget
-
-    def write(self, string):
-        self.widget.insert(tk.END, string)
-        self.widget.see(tk.END)
-        self.widget.update_idletasks()
-
-    def flush(self):
-        pass  # Required for compatibility with sys.stdout
+# Job output: the reader thread writes every line in the full log file (<jobname>_run.log) and
+# queues it for the window, the Tk main loop shows the queued lines every log_refresh_ms.
+# When the window falls behind, lines are dropped from the window (never from the log file)
+# so the solver output pipe is never slowed down by the window.
+log_queue_size = 20000    # lines waiting to be shown in the window
+log_refresh_ms = 100      # time between two window updates
+log_max_lines = 50000     # lines kept in the window, older lines are removed
 
 class JobWindow():
 
@@ -65,7 +59,6 @@ class JobWindow():
         self.debug=debug
         self.command = command
         self.job_dir = os.path.dirname(command[0])
-        self.stop_after_starter=False
         jnm1 = command[0]
         mpi_path= command[9]
 
@@ -76,6 +69,15 @@ class JobWindow():
         # Gather the jobname, run_id, job directory from the command
 
         self.is_finished = False
+        self.log_queue = queue.Queue(maxsize=log_queue_size)
+        self.dropped_lines = 0
+        self.log_done = False
+        self.log_file_path = os.path.join(self.job_dir, self.job_name + '_run.log')
+        try:
+            self.log_file = open(self.log_file_path, mode='w', encoding='utf-8', errors='replace')
+        except OSError as e:
+            if self.debug==1:print("Full log file not written: ",str(e))
+            self.log_file = None
 
         self.window = tk.Toplevel()
         self.window.title(self.job_name)
@@ -117,9 +119,11 @@ class JobWindow():
         self.close_button = ButtonWithHighlight(self.frame_control, text='Close', state='disable', command=self.on_close, padx=30)
         self.close_button.pack(side=tk.LEFT, padx=5)
         
-        # Start the thread
-        self.th = threading.Thread(target=self.run_single_job)
-        self.th.start()
+        # Run the job in the process supervisor, the window shows its output every log_refresh_ms
+        self.runOpenRadioss.output = self.log
+        self.shown_phase = None
+        self.job_future = get_supervisor().submit(self.run_single_job())
+        self.window.after(log_refresh_ms, self.show_log)
 
     # ------------------------------------------------
     # Close : Close the window
@@ -131,46 +135,43 @@ class JobWindow():
     # Stop button : Stop after Starter or Stop Engine
     # ------------------------------------------------
     def stop_job(self):
-        if self.run_number == 0:
+        if self.runOpenRadioss.run_number == 0:
            # Starter Phase - Stop after Starter
-            if self.stop_after_starter is True:
+            if self.runOpenRadioss.stop_after_starter is True:
                 messagebox.showinfo('Already Stopping', 'Job stop already requested, will stop at end of Starter')
             else:
                 if messagebox.askokcancel('Stop', 'Stop job at end of starter phase?'):
-                    self.stop_after_starter = True
+                    self.runOpenRadioss.stop_after_starter = True
         else :
             # Behavior for 'running_en_' files
             if messagebox.askokcancel('Stop', 'Stop Job?'):
-                f = open(self.job_dir + '/' + self.job_name+"_"+str( self.run_number).zfill(4)+ '.ctl', mode='w')
+                f = open(self.job_dir + '/' + self.job_name+"_"+str( self.runOpenRadioss.run_number).zfill(4)+ '.ctl', mode='w')
                 f.write('/STOP')
                 f.close()
-                self.stop_after_engine = True
+                self.runOpenRadioss.stop_after_engine = True
     # ------------------------------------------------
     # KILL button : Kill after Starter or Stop Engine
     # ------------------------------------------------
     def kill_job(self):
-        if self.run_number == 0:
-            # Starter Phase - Stop after Starter
-            if self.stop_after_starter is True:
-                messagebox.showinfo('Already Stopping', 'Job stop already requested, will stop at end of Starter')
-            else:
-                if messagebox.askokcancel('Kill', 'Stop job at end of starter phase?'):
-                    self.stop_after_starter = True
+        if self.runOpenRadioss.run_number == 0:
+            # Starter Phase - Kill the Starter
+            if messagebox.askokcancel('Kill', 'Kill Starter?'):
+                self.runOpenRadioss.kill()
         else:
             if messagebox.askokcancel('Kill', 'Kill Job?'):
-                f = open(self.job_dir + '/' + self.job_name+"_"+str( self.run_number).zfill(4)+ '.ctl', mode='w')
+                f = open(self.job_dir + '/' + self.job_name+"_"+str( self.runOpenRadioss.run_number).zfill(4)+ '.ctl', mode='w')
                 f.write('/KILL')
                 f.close()
-                self.stop_after_engine = True
+                self.runOpenRadioss.stop_after_engine = True
 
     # ------------------------------------------------
     # ANIM button : Write animation
     # ------------------------------------------------
     def anim_job(self):
-        if self.run_number == 0:
+        if self.runOpenRadioss.run_number == 0:
             messagebox.showinfo('Starter Phase', 'Job is still in starter phase.\nCannot write Animation file')
         else:
-            f = open(self.job_dir + '/' + self.job_name+"_"+str( self.run_number).zfill(4)+ '.ctl', mode='w')
+            f = open(self.job_dir + '/' + self.job_name+"_"+str( self.runOpenRadioss.run_number).zfill(4)+ '.ctl', mode='w')
             f.write('/ANIM')
             f.close()
 
@@ -178,10 +179,10 @@ class JobWindow():
     # H3D button : Write H3D File
     # ------------------------------------------------
     def h3d_job(self):
-        if self.run_number == 0:
+        if self.runOpenRadioss.run_number == 0:
             messagebox.showinfo('Starter Phase', 'Job is still in starter phase.\nCannot write H3D State')
         else:
-            f = open(self.job_dir + '/' + self.job_name+"_"+str( self.run_number).zfill(4)+ '.ctl', mode='w')
+            f = open(self.job_dir + '/' + self.job_name+"_"+str( self.runOpenRadioss.run_number).zfill(4)+ '.ctl', mode='w')
             f.write('/H3D')
             f.close()
 
@@ -192,7 +193,7 @@ class JobWindow():
         if vd3penabled is False:
             messagebox.showinfo('D3Plot Not available', 'D3Plot Converter is not available')
         else:
-            if self.run_number == 0:
+            if self.runOpenRadioss.run_number == 0:
                 messagebox.showinfo('Starter Phase', 'Job is still in starter phase.\nCannot convert Anim files to d3plot')
             else:
                 anim_pattern = re.compile(self.job_name + r"A[0-9]{3,}(?:[0-9])?$")
@@ -208,169 +209,72 @@ class JobWindow():
                     except Exception as e:
                         messagebox.showinfo('Error', 'Error in d3plot conversion: ' + str(e))
 
-    # -------------------------------------------------------------------------
-    # Job Process : Run Starter and Engine(s) with environment / Stdout in GUI
-    # -------------------------------------------------------------------------
-    def job_process(self,starter_command_line,custom_env,exec_dir):
-        if current_platform == 'Windows':
-            self.process = subprocess.Popen(starter_command_line, env=custom_env,cwd=exec_dir,shell=True,stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-        else:
-            self.process = subprocess.Popen(starter_command_line, env=custom_env,cwd=exec_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-        while True:
-            line = self.process.stdout.readline().decode('utf8', 'replace')
-            if line:
-                self.log_text.insert(tk.END, line)
-                self.log_text.see(tk.END)
-            if not line and self.process.poll() is not None:
-                break
-
-    # --------------------------
-    # Print : Print line in GUI
-    # --------------------------
-    def print(self, line):
-        self.log_text.insert(tk.END, line)
-        self.log_text.insert(tk.END, "\n")
-        self.log_text.see(tk.END)
-
     # ----------------------------------------------------------------
-    # Main entrance from job_holder : Create Output Windows & Run Job
+    # Log : write text in the full log file and queue it for the window
+    # (called from the job, never waits for the window)
     # ----------------------------------------------------------------
-    def run_single_job(self):
-        #Initialise variables
-
-        # Set the job environment variables
-        custom_env = self.runOpenRadioss.environment()
-
-        self.print("")
-        self.print("")
-        self.print(" JobName: "+self.jobname)
-        self.print(" ----------------------------")
-        self.print(" Number of MPI processes : "+self.command[2])
-        self.print(" Number of OpenMP threads: "+self.command[1])
-        self.print("")
-
-        if self.decktype == 'inp':
-        # Decktype is inp : Run inp2rad conversion
-        # -----------------------------------------------
-
-            # Temporarily disable buttons while inp2rad is running
-            self.stop_button['state'] = 'disable'
-            self.kill_button['state'] = 'disable'
-            self.anim_button['state'] = 'disable'
-            self.h3d_button['state'] = 'disable'
-            if vd3penabled:
-                    self.d3p_button['state'] = 'disable'
-
-            inp2rad_successful = False  # Flag to track success of conversion
-
-            # Redirect inp2rad stdout and stderr to GUI text widget
-            redirect_text = RedirectText(self.log_text)
-            with contextlib.redirect_stdout(redirect_text), contextlib.redirect_stderr(redirect_text):
-                    # Attempt to execute the conversion
-                    success = self.runOpenRadioss.inp2rad_conversion()
-
-                # Check if the process completed successfully
-            if success:  # Assuming `success` is a boolean or status code
-                    self.command[0] = self.command[0][:-4] + '.rad'
-                    inp2rad_successful = True
-            else:
-                    self.close_button['state'] = 'normal'
-                    self.window.protocol('WM_DELETE_WINDOW', self.on_close)
-                    self.is_finished = True
-
-            # Only re-enable buttons if the operation was successful
-            if inp2rad_successful:
-                    self.stop_button['state'] = 'active'
-                    self.kill_button['state'] = 'active'
-                    self.anim_button['state'] = 'active'
-                    self.h3d_button['state'] = 'active'
-                    if vd3penabled:
-                        self.d3p_button['state'] = 'active'
-
-            # Stop further execution if the inp2rad operation was unsuccessful
-            else:
-                self.print(" ---------------------------------------------------------")
-                self.print(" Stopping execution due to unsuccessful inp2rad conversion")
-                self.print(" ---------------------------------------------------------")
-                return  # Exit this function early and prevent further execution
-
-
-        # Starter Deck - execute Starter
-        # -------------------------------
-        self.run_number = self.run_id
-        if self.run_id==0:
+    def log(self, text):
+        if self.log_file:
+            self.log_file.write(text)
+        try:
+            if self.dropped_lines:
+                self.log_queue.put_nowait(self.dropped_lines_message())
+                self.dropped_lines = 0
+            self.log_queue.put_nowait(text)
+        except queue.Full:
+            self.dropped_lines += text.count("\n")
+
+    def dropped_lines_message(self):
+        return f" ... {self.dropped_lines} lines not shown, see {self.log_file_path}\n"
 
-            # First Delete previous result in the directory"
-            self.runOpenRadioss.delete_previous_results()
-
-            # Set Run Number to 0 (Starter)
-            starter_command_line=self.runOpenRadioss.get_starter_command()
-            if self.debug==1:print("StarterCommand: ",starter_command_line)
-            if self.debug==1:print("ExecDir: ",self.exec_dir)
-            # Run Starter Command
-            self.job_process(starter_command_line,custom_env,self.exec_dir)
-            self.run_number = self.run_number + 1
-
-        # Go to Engine : proceed or not
-        starter_only=self.command[6]
-        if starter_only=='no' and self.stop_after_starter is False:
-
-            # Execute Engine(s)
-            # ------------------
-
-            # Get Engine Input File List
-            if self.run_id==0:
-                engine_file_list = self.runOpenRadioss.get_engine_input_file_list()
-            else:
-                engine_file_list=[self.command[0]]
-            if self.debug==1:print("Engine_file_list:",engine_file_list)
-            self.stop_after_engine = False
-            for engine_file in engine_file_list:
-                if self.stop_after_engine is True:
-                    break
-                engine_command_line = self.runOpenRadioss.get_engine_command(engine_file)
-                if self.debug==1:print("EngineCommand: ",engine_command_line)
-                self.job_process(engine_command_line,custom_env,self.exec_dir)
-                self.run_number = self.run_number + 1
-
-            # Execute TH to CSV
-            # --------------------
-            # Redirect stdout and stderr to GUI text widget
-            redirect_text = RedirectText(self.log_text)
-            with contextlib.redirect_stdout(redirect_text), contextlib.redirect_stderr(redirect_text):
-                # Attempt to execute the conversion
-                self.runOpenRadioss.convert_th_to_csv()
-
-            # Execute Anim to VTK
-            # --------------------
-            redirect_text = RedirectText(self.log_text)
-            with contextlib.redirect_stdout(redirect_text), contextlib.redirect_stderr(redirect_text):
-                # Attempt to execute the conversion
-                self.runOpenRadioss.convert_anim_to_vtk()
-
-            # Execute Anim to D3Plot
-            # ----------------------
-            # Redirect stdout and stderr to GUI text widget
-            redirect_text = RedirectText(self.log_text)
-            with contextlib.redirect_stdout(redirect_text), contextlib.redirect_stderr(redirect_text):
-                # Attempt to execute the conversion
-                self.runOpenRadioss.d3plot_conversion()
+    # ----------------------------------------------------------------
+    # Show log : insert the queued text in the window, in one batch
+    # (Tk main loop, every log_refresh_ms)
+    # ----------------------------------------------------------------
+    def show_log(self):
+        log_done = self.log_done
+        texts = []
+        try:
+            while True:
+                texts.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if log_done and self.dropped_lines:
+            texts.append(self.dropped_lines_message())
+            self.dropped_lines = 0
+        if texts:
+            self.log_text.insert(tk.END, ''.join(texts))
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > log_max_lines:
+                self.log_text.delete('1.0', f'{line_count - log_max_lines + 1}.0')
+            self.log_text.see(tk.END)
+        if log_done:
+            self.finish_job()
+        else:
+            self.show_phase()
+            self.window.after(log_refresh_ms, self.show_log)
 
-            # Execute Anim to VTKHDF
-            # --------------------
-            redirect_text = RedirectText(self.log_text)
-            with contextlib.redirect_stdout(redirect_text), contextlib.redirect_stderr(redirect_text):
-                # Attempt to execute the conversion
-                self.runOpenRadioss.convert_anim_to_vtkhdf()
+    # ----------------------------------------------------------------
+    # Show phase : buttons acting on the solver are disabled during the
+    # inp2rad conversion
+    # ----------------------------------------------------------------
+    def show_phase(self):
+        phase = self.runOpenRadioss.phase
+        if phase == self.shown_phase:
+            return
+        self.shown_phase = phase
+        button_state = 'disable' if phase == 'inp2rad' else 'active'
+        self.stop_button['state'] = button_state
+        self.kill_button['state'] = button_state
+        self.anim_button['state'] = button_state
+        self.h3d_button['state'] = button_state
+        if vd3penabled:
+            self.d3p_button['state'] = button_state
 
-        # Job Finished
-        # ------------
-        self.print(" ")
-        self.print(" ")
-        self.print(" --------------------")
-        self.print(" Job Finished")
-        self.print(" --------------------")    
-        self.is_finished = True
+    # ----------------------------------------------------------------
+    # Finish job : all the job output is shown, enable Close
+    # ----------------------------------------------------------------
+    def finish_job(self):
         self.log_text['state'] = 'disable'
         self.stop_button['state'] = 'disable'
         self.kill_button['state'] = 'disable'
@@ -384,4 +288,27 @@ class JobWindow():
         stopping_st_file = self.job_dir + '/stopping_st_' + self.job_name
         if os.path.exists(stopping_st_file):
             os.remove(stopping_st_file)
+        self.is_finished = True
+
+    # --------------------------
+    # Print : Print line in GUI
+    # --------------------------
+    def print(self, line):
+        self.log(line + "\n")
 
+    # ----------------------------------------------------------------
+    # Main entrance from job_holder : Run Job in the process supervisor
+    # ----------------------------------------------------------------
+    async def run_single_job(self):
+        try:
+            if self.log_file:
+                self.print(" Full log: "+self.log_file_path)
+            await self.runOpenRadioss.run_job()
+            if self.decktype == 'inp' and self.runOpenRadioss.status != 'inp2rad failed':
+                self.command[0] = self.command[0][:-4] + '.rad'
+        except Exception as e:
+            self.print(" *** Error: "+str(e))
+        finally:
+            if self.log_file:
+                self.log_file.close()
+            self.log_done = True
@@ -0,0 +1,226 @@
+# Copyright 1986-2026 Altair Engineering Inc.
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the "Software"),
+# to deal in the Software without restriction, including without limitation
+# the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+# sell copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+# IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+
+# Process supervisor: one asyncio event loop, in one thread, runs the jobs (starter, engine,
+# converters) of all windows. Output of the processes is streamed line by line, processes are
+# stopped on timeout and when their job is killed or cancelled. Python converters (inp2rad,
+# d3plot, vtkhdf) run in the thread pool of the loop.
+import asyncio
+import concurrent.futures
+import contextlib
+import os
+import platform
+import shutil
+import signal
+import subprocess
+import threading
+
+current_platform = platform.system()
+
+# Longest output line read from a process
+output_line_limit = 16 * 1024 * 1024
+# Seconds a stopped process gets to exit before it is killed
+kill_grace = 5
+# Seconds given to killed jobs to stop their processes when a blocking run is interrupted
+kill_wait = 10
+
+# Cores this process may run on (CPU affinity, cgroup cpusets), all cores where it is not known
+def available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+# Raised by run_process when the process ran longer than its timeout (it is stopped)
+class ProcessTimeout(Exception):
+    pass
+
+# Send a stop (force: kill) signal to a process and to the processes it started
+async def signal_process(process, force):
+    try:
+        if current_platform == 'Windows':
+            if force:
+                # taskkill /T also stops the children (mpiexec ranks)
+                taskkill = await asyncio.create_subprocess_exec('taskkill', '/T', '/F', '/PID', str(process.pid),
+                                                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                await taskkill.wait()
+            else:
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+        else:
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+    except (ProcessLookupError, OSError):
+        pass
+
+# Stop a process, kill it if it is still running after kill_grace seconds
+async def stop_process(process):
+    if process.returncode is not None:
+        return
+    await signal_process(process, False)
+    try:
+        await asyncio.wait_for(process.wait(), kill_grace)
+    except asyncio.TimeoutError:
+        await signal_process(process, True)
+        await process.wait()
+
+class ProcessSupervisor():
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.job_processes = {}
+        # Converter processes (anim_to_vtk) of all jobs running at the same time, see set_core_budget
+        self.converter_slots = available_cores()
+        self.running_converters = 0
+        self.converter_condition = None
+        self.thread = threading.Thread(target=self.loop.run_forever, name='process_supervisor', daemon=True)
+        self.thread.start()
+
+    # --------------------------------------------------------------
+    # Run a coroutine in the supervisor loop (from any thread),
+    # returns a concurrent.futures.Future
+    # --------------------------------------------------------------
+    def submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    # --------------------------------------------------------------
+    # Run a coroutine and wait for its result (batch mode). On
+    # Ctrl-C the coroutine is cancelled, which stops its processes
+    # --------------------------------------------------------------
+    def run(self, coroutine):
+        done = threading.Event()
+        task = self.submit(self.start_task(coroutine, done)).result()
+        try:
+            done.wait()
+            return task.result()
+        except KeyboardInterrupt:
+            # wait for the cancelled task to stop its processes
+            self.loop.call_soon_threadsafe(task.cancel)
+            done.wait(kill_wait)
+            raise
+
+    async def start_task(self, coroutine, done):
+        task = asyncio.ensure_future(coroutine)
+        task.add_done_callback(lambda task: done.set())
+        return task
+
+    # --------------------------------------------------------------
+    # Run a process, output lines are passed to output (or written
+    # in stdout_file). Returns the exit code of the process, raises
+    # ProcessTimeout when it was stopped after timeout seconds
+    # --------------------------------------------------------------
+    async def run_process(self, command_line, output, cwd=None, env=None, stdout_file=None, timeout=None, job=None):
+        stdout = stdout_file if stdout_file else subprocess.PIPE
+        stderr = None if stdout_file else subprocess.STDOUT
+        if current_platform == 'Windows':
+            # the executable (mpiexec) is searched in the PATH of the job environment, the process runs
+            # without shell in its own process group: stopping it reaches the solver and its children
+            executable = shutil.which(command_line[0], path=(env or os.environ).get('PATH')) or command_line[0]
+            process = await asyncio.create_subprocess_exec(executable, *command_line[1:], cwd=cwd, env=env,
+                                                           creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
+                                                           stdout=stdout, stderr=stderr, limit=output_line_limit)
+        else:
+            # own process group: terminate reaches the children of the process (mpirun ranks, shell scripts)
+            process = await asyncio.create_subprocess_exec(*command_line, cwd=cwd, env=env, start_new_session=True,
+                                                           stdout=stdout, stderr=stderr, limit=output_line_limit)
+        processes = self.job_processes.setdefault(job, set())
+        processes.add(process)
+        try:
+            await asyncio.wait_for(self.stream_output(process, output), timeout)
+        except asyncio.TimeoutError:
+            output(f" *** Timeout: {command_line[0]} stopped after {timeout} s\n")
+            await stop_process(process)
+            raise ProcessTimeout(f"{command_line[0]} stopped after {timeout} s")
+        finally:
+            # cancelled job: do not leave the process running
+            await stop_process(process)
+            processes.discard(process)
+            if not processes:
+                self.job_processes.pop(job, None)
+        return process.returncode
+
+    async def stream_output(self, process, output):
+        if process.stdout:
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                output(line.decode('utf8', 'replace'))
+        return await process.wait()
+
+    # --------------------------------------------------------------
+    # Limit the converter processes to the cores shared by the jobs
+    # (from any thread), at most the available cores
+    # --------------------------------------------------------------
+    def set_core_budget(self, cores):
+        self.converter_slots = max(1, min(cores, available_cores()))
+        self.submit(self.notify_converters())
+
+    async def notify_converters(self):
+        if self.converter_condition is not None:
+            async with self.converter_condition:
+                self.converter_condition.notify_all()
+
+    # Hold one of the converter_slots shared by the jobs while a converter process runs
+    @contextlib.asynccontextmanager
+    async def converter_slot(self):
+        if self.converter_condition is None:
+            self.converter_condition = asyncio.Condition()
+        async with self.converter_condition:
+            await self.converter_condition.wait_for(lambda: self.running_converters < self.converter_slots)
+            self.running_converters += 1
+        try:
+            yield
+        finally:
+            async with self.converter_condition:
+                self.running_converters -= 1
+                self.converter_condition.notify_all()
+
+    # --------------------------------------------------------------
+    # Run a blocking Python function in the thread pool of the loop
+    # --------------------------------------------------------------
+    async def run_function(self, function, *args):
+        return await self.loop.run_in_executor(None, function, *args)
+
+    # --------------------------------------------------------------
+    # Stop the running processes of a job (from any thread)
+    # --------------------------------------------------------------
+    def terminate(self, job):
+        asyncio.run_coroutine_threadsafe(self.terminate_processes(job), self.loop)
+
+    # Stop the processes of all jobs and wait for them (closing the GUI)
+    def terminate_all(self):
+        future = asyncio.run_coroutine_threadsafe(self.terminate_all_processes(), self.loop)
+        try:
+            future.result(timeout=kill_wait)
+        except concurrent.futures.TimeoutError:
+            pass
+
+    async def terminate_all_processes(self):
+        processes = [process for job_processes in self.job_processes.values() for process in job_processes]
+        await asyncio.gather(*(stop_process(process) for process in processes))
+
+    async def terminate_processes(self, job):
+        await asyncio.gather(*(stop_process(process) for process in list(self.job_processes.get(job, ()))))
+
+process_supervisor = None
+
+# The supervisor shared by all jobs of the Python process, started on first use
+def get_supervisor():
+    global process_supervisor
+    if process_supervisor is None:
+        process_supervisor = ProcessSupervisor()
+    return process_supervisor
@@ -17,12 +17,17 @@
 # WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
 # IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 import os
+import asyncio
 import platform
 import glob
-import subprocess
 import re
-import tkinter as tk
-from tkinter import messagebox
+import sys
+import json
+import shutil
+import hashlib
+import time
+import threading
+from process_supervisor import get_supervisor, ProcessTimeout
 # Inp2rad import
 try:
     import inp2rad
@@ -49,6 +54,48 @@ except ImportError:
 current_platform = platform.system()
 cpu=platform.machine()
 
+# inp2rad conversion cache: the .rad files of a converted .inp deck are reused when the deck, its
+# *INCLUDE files and the converter settings did not change. OPENRADIOSS_INP2RAD_CACHE optionally
+# points to a cache directory shared by all decks, holding at most inp2rad_cache_entries conversions
+inp2rad_cache_dir = os.environ.get("OPENRADIOSS_INP2RAD_CACHE", "")
+inp2rad_cache_entries = 20
+inp2rad_hash_chunk = 16 * 1024 * 1024
+# inp2rad keeps the deck being converted in module globals: the .inp conversions of jobs running
+# at the same time (several job windows, see JobHolder) are done one at a time
+converter_lock = threading.Lock()
+# Job whose Python converter (inp2rad, d3plot, vtkhdf) runs in the current thread, see ConverterOutput
+converter_thread = threading.local()
+
+# sys.stdout / sys.stderr of the process once a Python converter ran: what a converter thread prints
+# goes to the output of its job, the other threads print to the original stream
+class ConverterOutput():
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        job = getattr(converter_thread, 'job', None)
+        if job is None:
+            return self.stream.write(text)
+        # the job output may be this stream (batch mode): write it as any other thread
+        converter_thread.job = None
+        try:
+            job.write(text)
+        finally:
+            converter_thread.job = job
+        return len(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+def install_converter_output():
+    if not isinstance(sys.stdout, ConverterOutput):
+        sys.stdout = ConverterOutput(sys.stdout)
+    if not isinstance(sys.stderr, ConverterOutput):
+        sys.stderr = ConverterOutput(sys.stderr)
+
+inp2rad_include_pattern = re.compile(rb'^[ \t]*\*INCLUDE[ \t]*,[ \t]*INPUT[ \t]*=[ \t]*([^\r\n]+)', re.IGNORECASE | re.MULTILINE)
+
 # Tiny tool to get the runid from the file name
 def get_deck_runid(file):
     jobname, extension = os.path.splitext(os.path.basename(file))
@@ -61,6 +108,29 @@ def get_deck_runid(file):
     
     return run_id
 
+# Tiny tool to hash a deck and, recursively, its *INCLUDE files (resolved like inp2rad does)
+def hash_deck_files(deck, deck_hash, include_chain=()):
+    include_chain = include_chain + (os.path.normcase(os.path.abspath(deck)),)
+    deck_hash.update(os.path.basename(deck).encode('utf8', 'replace'))
+    includes = []
+    tail = b''
+    with open(deck, 'rb') as deck_file:
+        while True:
+            chunk = deck_file.read(inp2rad_hash_chunk)
+            deck_hash.update(chunk)
+            # keep the last partial line, an *INCLUDE card may be split between two chunks
+            text = tail + chunk
+            last_newline = text.rfind(b'\n') + 1 if chunk else len(text)
+            includes.extend(inp2rad_include_pattern.findall(text, 0, last_newline))
+            tail = text[last_newline:]
+            if not chunk:
+                break
+
+    for include in includes:
+        include_path = os.path.normpath(os.path.join(os.path.dirname(deck), include.decode('utf8', 'replace').strip()))
+        if os.path.exists(include_path) and os.path.normcase(os.path.abspath(include_path)) not in include_chain:
+            hash_deck_files(include_path, deck_hash, include_chain)
+
 class RunOpenRadioss():
     # Initialize the class, common variables are saved here
     def __init__(self, command,debug):
@@ -129,6 +199,19 @@ class RunOpenRadioss():
        self.mpi_path          = command[9]
        self.debug             = debug
        self.inp2rad_enabled   = inp2rad_enabled
+       self.status            = 'not started'
+       self.phase_times       = {}
+       self.phase             = None
+       self.run_number        = run_id
+       self.stop_after_starter= False
+       self.stop_after_engine = False
+       self.killed            = False
+       # First phase whose process was stopped on timeout (None: no timeout)
+       self.timed_out_phase   = None
+       # Seconds after which a starter, engine or converter process is stopped (None: no limit)
+       self.timeout           = None
+       # Job messages and process output, the GUI replaces it to show them in the job window
+       self.output            = sys.stdout.write
 
        if self.debug==1:
            print("RunOpenRadioss Class Initialized")
@@ -356,43 +439,78 @@ class RunOpenRadioss():
 # --------------------------------------------------------------
 # Runs the anim to vtk converter
 # --------------------------------------------------------------
-    def convert_anim_to_vtk(self):
+    async def convert_anim_to_vtk(self):
 
         if self.anim_to_vtk !='yes':
             return
         animation_file_list = self.get_animation_list()
         if self.debug==1:print("Animation_file_list:",animation_file_list)
         if len(animation_file_list)>0:
-            print("")
-            print("")
-            print(" ------------------------------------------------------")
-            print(" Anim-vtk option selected, Converting Anim Files to vtk")
-            print(" ------------------------------------------------------")
-            print("")
-            for anim_file in animation_file_list:
-                print(" Anim File Being Converted is "+anim_file)
-                anim_to_vtk_exec = os.path.join("exec","anim_to_vtk_"+self.arch+self.bin_extension)
-                animtovtk_output_name = os.path.join(self.running_directory, anim_file + ".vtk")
-
-                with open(animtovtk_output_name, 'w') as animtovtk_output_file:
-                    animtovtk_command = [ os.path.join(self.openradioss_path, anim_to_vtk_exec), 
-                                          os.path.join(self.running_directory, anim_file) ]
-                    # Redirect the output to the output file
-                    subprocess.run(animtovtk_command, env=self.custom_env, cwd=self.running_directory, stdout=animtovtk_output_file)
-            print("")
-            print(" ------------------------------------")
-            print(" Anim file conversion to vtk complete")
-            print(" ------------------------------------")
+            self.print("")
+            self.print("")
+            self.print(" ------------------------------------------------------")
+            self.print(" Anim-vtk option selected, Converting Anim Files to vtk")
+            self.print(" ------------------------------------------------------")
+            self.print("")
+            # Anim files are converted at the same time in the converter slots shared by all jobs (core budget),
+            # progress is reported in frame order (A999 before A1000), a failed file does not stop the others
+            animation_file_list.sort(key=lambda anim_file: int(anim_file[len(self.jobname) + 1:]))
+            conversions = [asyncio.ensure_future(self.convert_anim_file_to_vtk(anim_file)) for anim_file in animation_file_list]
+            failed_files = []
+            try:
+                for count, (anim_file, conversion) in enumerate(zip(animation_file_list, conversions), 1):
+                    error = await conversion
+                    if error:
+                        failed_files.append(anim_file)
+                        self.print(f" *** Anim File {anim_file} not converted: {error}")
+                    else:
+                        self.print(f" Anim File Converted is {anim_file} ({count}/{len(animation_file_list)})")
+            finally:
+                for conversion in conversions:
+                    conversion.cancel()
+            self.print("")
+            if failed_files:
+                if self.status == 'finished':
+                    self.status = 'anim_to_vtk failed'
+                self.print(" ------------------------------------------------------")
+                self.print(f" Anim file conversion to vtk failed for {len(failed_files)} of {len(animation_file_list)} files")
+                self.print(" ------------------------------------------------------")
+            else:
+                self.print(" ------------------------------------")
+                self.print(" Anim file conversion to vtk complete")
+                self.print(" ------------------------------------")
 
         else:
-            print("")
-            print("")
-            print(" ----------------------------------------------------------------")
-            print(" NB: Anim-vtk option selected, but no Anim files found to convert")
-            print(" ----------------------------------------------------------------")
+            self.print("")
+            self.print("")
+            self.print(" ----------------------------------------------------------------")
+            self.print(" NB: Anim-vtk option selected, but no Anim files found to convert")
+            self.print(" ----------------------------------------------------------------")
 
 
 
+# --------------------------------------------------------------
+# Converts one anim file to vtk, returns None or the error
+# --------------------------------------------------------------
+    async def convert_anim_file_to_vtk(self, anim_file):
+        async with get_supervisor().converter_slot():
+            anim_to_vtk_exec = os.path.join("exec","anim_to_vtk_"+self.arch+self.bin_extension)
+            animtovtk_output_name = os.path.join(self.running_directory, anim_file + ".vtk")
+            animtovtk_command = [ os.path.join(self.openradioss_path, anim_to_vtk_exec), 
+                                  os.path.join(self.running_directory, anim_file) ]
+            try:
+                with open(animtovtk_output_name, 'w') as animtovtk_output_file:
+                    # Redirect the output to the output file
+                    return_code = await self.job_process(animtovtk_command, stdout_file=animtovtk_output_file)
+            except OSError as e:
+                return_code = str(e)
+            if return_code:
+                # do not leave an incomplete vtk file
+                if os.path.exists(animtovtk_output_name):
+                    os.remove(animtovtk_output_name)
+                return return_code if isinstance(return_code, str) else "exit code " + str(return_code)
+            return None
+
 # --------------------------------------------------------------
 # Get Time History files list
 # --------------------------------------------------------------
@@ -409,189 +527,365 @@ class RunOpenRadioss():
 # --------------------------------------------------------------
 # Runs Time History to CSV converter
 # --------------------------------------------------------------
-    def convert_th_to_csv(self):
+    async def convert_th_to_csv(self):
         if self.th_to_csv !='yes':
             return
         th_list=self.get_th_list()
         if self.debug==1:print("TH List: ",th_list)
 
         if len(th_list)>0:
-            print("")
-            print("")
-            print(" ------------------------------------------------------")
-            print(" TH-csv option selected, Converting TH Files to csv")
-            print(" ------------------------------------------------------")
-            print("")
+            self.print("")
+            self.print("")
+            self.print(" ------------------------------------------------------")
+            self.print(" TH-csv option selected, Converting TH Files to csv")
+            self.print(" ------------------------------------------------------")
+            self.print("")
 
             for th_file in th_list:
-                print(" Time History File Being Converted is "+th_file)
+                self.print(" Time History File Being Converted is "+th_file)
                 th_to_csv_exec =os.path.join("exec","th_to_csv_"+self.arch+self.bin_extension)
     
                 thtocsv_command = [ os.path.join(self.openradioss_path, th_to_csv_exec), 
                                     th_file  ]
-                # Redirect the output to the th-csv converter
-                subprocess.run(thtocsv_command, env=self.custom_env, cwd=self.running_directory)
+                await self.job_process(thtocsv_command)
 
-            print("")
-            print(" ------------------------------------")
-            print(" TH file conversion to csv complete")
-            print(" ------------------------------------")
+            self.print("")
+            self.print(" ------------------------------------")
+            self.print(" TH file conversion to csv complete")
+            self.print(" ------------------------------------")
         else:
-            print("")
-            print("")
-            print(" -------------------------------------------------------------")
-            print(" NB: TH-csv option selected, but no TH files found to convert")
-            print(" -------------------------------------------------------------")
+            self.print("")
+            self.print("")
+            self.print(" -------------------------------------------------------------")
+            self.print(" NB: TH-csv option selected, but no TH files found to convert")
+            self.print(" -------------------------------------------------------------")
 
     def convert_anim_to_vtkhdf(self):
         if self.anim_to_vtkhdf !='yes':
              return
         if not vtkhdfenabled:
-                print(" ----------------------------------------------------------------------")
-                print(" NB: Anim-vtkhdf option selected, but VortexRadioss module not found  ")
-                print(" ----------------------------------------------------------------------")
+                self.print(" ----------------------------------------------------------------------")
+                self.print(" NB: Anim-vtkhdf option selected, but VortexRadioss module not found  ")
+                self.print(" ----------------------------------------------------------------------")
                 return
         animation_file_list = self.get_animation_list()
         if self.debug==1:print("Animation_file_list:",animation_file_list)
         if len(animation_file_list)>0:
-            print("")
-            print("")
-            print(" ----------------------------------------------------------")
-            print(" Anim-vtkhdf option selected, Converting Anim Files to vtkhdf")
-            print(" ----------------------------------------------------------")
-            print("")
+            self.print("")
+            self.print("")
+            self.print(" ----------------------------------------------------------")
+            self.print(" Anim-vtkhdf option selected, Converting Anim Files to vtkhdf")
+            self.print(" ----------------------------------------------------------")
+            self.print("")
             converter = AnimToVTKHDF(verbose=False, static=True)
             animation_files_for_vtkhdf = [os.path.join(self.running_directory, file) for file in animation_file_list]
             output_file_for_vtkhdf = os.path.join(self.running_directory, self.jobname+".vtkhdf")
             try:
                         converter.convert(inputf=animation_files_for_vtkhdf, outputf=output_file_for_vtkhdf)
             except Exception as e:
-                    print(" *** Error during Anim to d3plot conversion: ", str(e))
-                    print(" ----------------------------------------------------------------")
+                    self.print(" *** Error during Anim to d3plot conversion: ", str(e))
+                    self.print(" ----------------------------------------------------------------")
 
-            print(" -----------------------------------------")
-            print(" Anim file conversion to vtkhdf complete")
-            print(" -----------------------------------------")
+            self.print(" -----------------------------------------")
+            self.print(" Anim file conversion to vtkhdf complete")
+            self.print(" -----------------------------------------")
         else:
-            print("")
-            print("")
-            print(" ----------------------------------------------------------------")
-            print(" NB: Anim-vtkhdf option selected, but no Anim files found to convert")
-            print(" ----------------------------------------------------------------")
+            self.print("")
+            self.print("")
+            self.print(" ----------------------------------------------------------------")
+            self.print(" NB: Anim-vtkhdf option selected, but no Anim files found to convert")
+            self.print(" ----------------------------------------------------------------")
 
     def d3plot_conversion(self):
          if self.anim_to_d2plot !='yes':
              return
          if not vd3penabled:
-             print(" ----------------------------------------------------------------------")
-             print(" NB: Anim-d3plot option selected, but VortexRadioss module not found  ")
-             print(" ----------------------------------------------------------------------")
+             self.print(" ----------------------------------------------------------------------")
+             self.print(" NB: Anim-d3plot option selected, but VortexRadioss module not found  ")
+             self.print(" ----------------------------------------------------------------------")
              return
          animation_file_list = self.get_animation_list()
          if self.debug==1:print("Animation_file_list:",animation_file_list)
          if len(animation_file_list)>0:
-             print("")
-             print("")
-             print(" ------------------------------------------------------")
-             print(" Anim-d3plot option selected, Converting Anim Files to d3plot")
-             print(" ------------------------------------------------------")
-             print("")
+             self.print("")
+             self.print("")
+             self.print(" ------------------------------------------------------")
+             self.print(" Anim-d3plot option selected, Converting Anim Files to d3plot")
+             self.print(" ------------------------------------------------------")
+             self.print("")
              file_stem = os.path.join(self.running_directory, self.jobname)
              try:
                     readAndConvert(file_stem,silent=True)
              except Exception as e:
-                    print(" *** Error during Anim to d3plot conversion: ", str(e))
-                    print(" ----------------------------------------------------------------")
+                    self.print(" *** Error during Anim to d3plot conversion: ", str(e))
+                    self.print(" ----------------------------------------------------------------")
 
-             print("")
-             print(" ---------------------------------------")
-             print(" Anim file conversion to d3plot complete")
-             print(" ---------------------------------------")
+             self.print("")
+             self.print(" ---------------------------------------")
+             self.print(" Anim file conversion to d3plot complete")
+             self.print(" ---------------------------------------")
 
          else:
-             print("")
-             print("")
-             print(" ----------------------------------------------------------------")
-             print(" NB: Anim-d3plot option selected, but no Anim files found to convert")
-             print(" ----------------------------------------------------------------")
+             self.print("")
+             self.print("")
+             self.print(" ----------------------------------------------------------------")
+             self.print(" NB: Anim-d3plot option selected, but no Anim files found to convert")
+             self.print(" ----------------------------------------------------------------")
+
+    # --------------------------------------------------------------
+    # inp2rad conversion cache
+    # --------------------------------------------------------------
+    def inp2rad_output_files(self):
+        return [os.path.join(self.running_directory, self.jobname + "_0000.rad"),
+                os.path.join(self.running_directory, self.jobname + "_0001.rad")]
+
+    def inp2rad_cache_key(self):
+        # The deck, all its include files, the converter settings and the converter itself
+        deck_hash = hashlib.sha256()
+        hash_deck_files(self.initial_file, deck_hash)
+        deck_hash.update(f"radversion={inp2rad.radversion};spotflag={inp2rad.spotflag_default}".encode())
+        with open(inp2rad.__file__, 'rb') as converter_file:
+            deck_hash.update(converter_file.read())
+        return deck_hash.hexdigest()
+
+    def inp2rad_stamp_file(self):
+        return os.path.join(self.running_directory, self.jobname + "_inp2rad.cache")
+
+    def read_inp2rad_stamp(self):
+        try:
+            with open(self.inp2rad_stamp_file()) as stamp_file:
+                return json.load(stamp_file)
+        except (OSError, ValueError):
+            return {}
+
+    def write_inp2rad_stamp(self, cache_key):
+        # size and modification time of the outputs detect .rad files edited after the conversion
+        outputs = {}
+        for output_file in self.inp2rad_output_files():
+            file_stat = os.stat(output_file)
+            outputs[os.path.basename(output_file)] = [file_stat.st_size, file_stat.st_mtime_ns]
+        with open(self.inp2rad_stamp_file(), 'w') as stamp_file:
+            json.dump({'key': cache_key, 'outputs': outputs}, stamp_file, indent=4)
+
+    def inp2rad_outputs_unchanged(self, stamp, cache_key):
+        if stamp.get('key') != cache_key:
+            return False
+        for output_file in self.inp2rad_output_files():
+            try:
+                file_stat = os.stat(output_file)
+            except OSError:
+                return False
+            if stamp['outputs'].get(os.path.basename(output_file)) != [file_stat.st_size, file_stat.st_mtime_ns]:
+                return False
+        return True
+
+    def restore_inp2rad_cache_entry(self, cache_key):
+        if not inp2rad_cache_dir:
+            return False
+        cache_entry = os.path.join(inp2rad_cache_dir, cache_key)
+        if not os.path.isdir(cache_entry):
+            return False
+        for output_file in self.inp2rad_output_files():
+            shutil.copyfile(os.path.join(cache_entry, os.path.basename(output_file)), output_file)
+        # Touching the entry keeps it recently used for the LRU eviction
+        os.utime(cache_entry)
+        return True
+
+    def store_inp2rad_cache_entry(self, cache_key):
+        if not inp2rad_cache_dir:
+            return
+        cache_entry = os.path.join(inp2rad_cache_dir, cache_key)
+        if not os.path.isdir(cache_entry):
+            os.makedirs(inp2rad_cache_dir, exist_ok=True)
+            # Copy to a temporary directory first, a concurrent job never sees a partial entry
+            partial_entry = cache_entry + f".{os.getpid()}.tmp"
+            os.makedirs(partial_entry, exist_ok=True)
+            for output_file in self.inp2rad_output_files():
+                shutil.copyfile(output_file, os.path.join(partial_entry, os.path.basename(output_file)))
+            try:
+                os.rename(partial_entry, cache_entry)
+            except OSError:
+                shutil.rmtree(partial_entry, ignore_errors=True)
+
+        # LRU eviction, least recently used entries first
+        cache_entries = [os.path.join(inp2rad_cache_dir, entry) for entry in os.listdir(inp2rad_cache_dir) if not entry.endswith(".tmp")]
+        cache_entries.sort(key=os.path.getmtime)
+        for old_entry in cache_entries[:max(0, len(cache_entries) - inp2rad_cache_entries)]:
+            shutil.rmtree(old_entry, ignore_errors=True)
+
+    def inp2rad_cached_conversion(self, cache_key):
+        if self.inp2rad_outputs_unchanged(self.read_inp2rad_stamp(), cache_key):
+            return True
+        if self.restore_inp2rad_cache_entry(cache_key):
+            self.write_inp2rad_stamp(cache_key)
+            return True
+        return False
 
     def inp2rad_conversion(self):
          if self.inp2rad_enabled:
-           print(" --------------------------------------------------------")
-           print(" Input file is an .inp file, Converting to Radioss format")
-           print(" --------------------------------------------------------")
-           print("")
+           try:
+               cache_key = self.inp2rad_cache_key()
+           except OSError as e:
+               if self.debug==1:print("inp2rad cache disabled: ",str(e))
+               cache_key = None
+
+           if cache_key and self.inp2rad_cached_conversion(cache_key):
+                self.print(" ------------------------------------------------------")
+                self.print(" Input file and include files unchanged since last")
+                self.print(" conversion, reusing "+self.jobname+"_0000.rad")
+                self.print(" ------------------------------------------------------")
+                self.print(" ")
+                self.print(" ")
+                return True
+
+           self.print(" --------------------------------------------------------")
+           self.print(" Input file is an .inp file, Converting to Radioss format")
+           self.print(" --------------------------------------------------------")
+           self.print("")
            success = inp2rad.execute_gui(self.initial_file, True)
            if success:  
-                print(" ------------------------------------------------------")
-                print(" Conversion to Radioss format complete")
-                print(" ------------------------------------------------------")
-                print(" ")
-                print(" ")
+                if cache_key:
+                    try:
+                        self.write_inp2rad_stamp(cache_key)
+                        self.store_inp2rad_cache_entry(cache_key)
+                    except OSError as e:
+                        self.print(" *** Warning: conversion cache not updated: ", str(e))
+                self.print(" ------------------------------------------------------")
+                self.print(" Conversion to Radioss format complete")
+                self.print(" ------------------------------------------------------")
+                self.print(" ")
+                self.print(" ")
            else :
-                print(" ------------------------------------------------------")
-                print(" Conversion to Radioss format failed")
-                print(" Please try debugging in standalone mode")
-                print(" by running inp2rad from command line")
-                print(" ------------------------------------------------------")
+                self.print(" ------------------------------------------------------")
+                self.print(" Conversion to Radioss format failed")
+                self.print(" Please try debugging in standalone mode")
+                self.print(" by running inp2rad from command line")
+                self.print(" ------------------------------------------------------")
                 success = False
          else:
-                print(" ----------------------------------------------------------------------")
-                print(" Input file is an .inp file, Conversion to Radioss format not possible ")
-                print(" Check presence of inp2rad.py in the same directory              ")
-                print(" ----------------------------------------------------------------------")
+                self.print(" ----------------------------------------------------------------------")
+                self.print(" Input file is an .inp file, Conversion to Radioss format not possible ")
+                self.print(" Check presence of inp2rad.py in the same directory              ")
+                self.print(" ----------------------------------------------------------------------")
                 success = False
          return success
 
     # -------------------------------------------------------------------------
-    # Job Process : Run Starter and Engine(s) with environment / Stdout in GUI
+    # Print : job messages go to output (console or job window)
     # -------------------------------------------------------------------------
-    def job_process(self,starter_command_line,custom_env,exec_dir):
-        if current_platform == 'Windows':
-            self.process = subprocess.Popen(starter_command_line, env=custom_env,cwd=exec_dir,shell=True,stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-        else:
-            self.process = subprocess.Popen(starter_command_line, env=custom_env,cwd=exec_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-        while True:
-            line = self.process.stdout.readline().decode('utf8', 'replace')
-            if line:
-                print("  "+line.strip())
-            if not line and self.process.poll() is not None:
-                break
+    def print(self, *args):
+        self.output(' '.join(str(arg) for arg in args) + "\n")
 
-    def batch_run(self):
-        custom_env = self.environment()
+    # file like object, to redirect the stdout of the Python converters to output
+    def write(self, text):
+        self.output(text)
+
+    def flush(self):
+        pass
+
+    # -------------------------------------------------------------------------
+    # Run one phase of the job (inp2rad, starter, engine, conversions) and
+    # add its wall time in seconds to phase_times
+    # -------------------------------------------------------------------------
+    async def timed_phase(self, phase, awaitable):
+        self.phase = phase
+        start_time = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.phase_times[phase] = self.phase_times.get(phase, 0.0) + time.perf_counter() - start_time
+
+    # Python converters run in the supervisor thread pool, their stdout goes to output.
+    # exclusive converters (inp2rad) of the jobs run one at a time
+    async def run_function(self, function, exclusive=False):
+        def redirected_function():
+            converter_thread.job = self
+            try:
+                if not exclusive:
+                    return function()
+                if not converter_lock.acquire(blocking=False):
+                    self.print(" Waiting for the .inp conversion of another job")
+                    converter_lock.acquire()
+                try:
+                    return function()
+                finally:
+                    converter_lock.release()
+            finally:
+                converter_thread.job = None
+        install_converter_output()
+        return await get_supervisor().run_function(redirected_function)
+
+    # -------------------------------------------------------------------------
+    # Job Process : Run Starter, Engine(s) or converter with environment, the
+    # output is streamed to output (or written in stdout_file), returns the exit code
+    # or the error of a process stopped on timeout
+    # -------------------------------------------------------------------------
+    async def job_process(self, command_line, stdout_file=None):
+        try:
+            return await get_supervisor().run_process(command_line, self.output, cwd=self.exec_dir, env=self.custom_env,
+                                                      stdout_file=stdout_file, timeout=self.timeout, job=self)
+        except ProcessTimeout as e:
+            if self.timed_out_phase is None:
+                self.timed_out_phase = self.phase
+            return "timeout: " + str(e)
+
+    # -------------------------------------------------------------------------
+    # Kill : stop the running process and the next phases of the job
+    # -------------------------------------------------------------------------
+    def kill(self):
+        self.killed = True
+        self.stop_after_starter = True
+        self.stop_after_engine = True
+        get_supervisor().terminate(self)
+
+    # -------------------------------------------------------------------------
+    # Run the job phases in the process supervisor, returns True when all phases
+    # succeeded. status and phase_times report the outcome and the wall time of each phase
+    # -------------------------------------------------------------------------
+    async def run_job(self):
+        self.environment()
         self.job_name,self.decktype = self.get_decktype()
         self.jobname,self.run_id,self.exec_dir=self.get_jobname_runid_rundirectory()
 
+        self.print("")
+        self.print("")
+        self.print(" JobName: "+self.jobname)
+        self.print(" ----------------------------")
+        self.print(" Number of MPI processes : "+self.np)
+        self.print(" Number of OpenMP threads: "+self.nt)
+        self.print("")
 
-        print("")
-        print("")
-        print(" JobName: "+self.jobname)
-        print(" ----------------------------")
-        print(" Number of MPI processes : "+self.np)
-        print(" Number of OpenMP threads: "+self.nt)
-        print("")
-
+        try:
+            await self.run_job_phases()
+        finally:
+            if self.killed:
+                self.status = 'killed'
+            elif self.timed_out_phase:
+                self.status = self.timed_out_phase + ' timeout'
+            self.phase = None
+        return self.status == 'finished'
+
+    async def run_job_phases(self):
         if self.decktype == 'inp':
         # Decktype is inp : Run inp2rad conversion
         # -----------------------------------------------
-           inp2rad_successful = False  # Flag to track success of conversion
-           success = self.inp2rad_conversion()
+           success = await self.timed_phase('inp2rad', self.run_function(self.inp2rad_conversion, exclusive=True))
            if success:  # Assuming `success` is a boolean or status code
                 self.deck = self.jobname + '.rad'
-                inp2rad_successful = True
            else:
-                inp2rad_successful = False
-                print(" ---------------------------------------------------------")
-                print(" Stopping execution due to unsuccessful inp2rad conversion")
-                print(" ---------------------------------------------------------")
+                self.print(" ---------------------------------------------------------")
+                self.print(" Stopping execution due to unsuccessful inp2rad conversion")
+                self.print(" ---------------------------------------------------------")
+                self.status = 'inp2rad failed'
                 return  # Exit if inp2rad conversion failed
 
+        self.status = 'finished'
+
 
         # Starter Deck - execute Starter
         # -------------------------------
         self.run_number = self.run_id
-        if self.run_id==0:
+        if self.run_id==0 and not self.killed:
 
             # First Delete previous result in the directory"
             self.delete_previous_results()
@@ -601,11 +895,13 @@ class RunOpenRadioss():
             if self.debug==1:print("StarterCommand: ",starter_command_line)
             if self.debug==1:print("ExecDir: ",self.exec_dir)
             # Run Starter Command
-            self.job_process(starter_command_line,custom_env,self.exec_dir)
+            return_code = await self.timed_phase('starter', self.job_process(starter_command_line))
+            if return_code:
+                self.status = 'starter failed'
             self.run_number = self.run_number + 1
 
         # Go to Engine : proceed or not
-        if self.starter_only=='no' :
+        if self.starter_only=='no' and self.stop_after_starter is False:
 
             # Execute Engine(s)
             # ------------------
@@ -617,35 +913,49 @@ class RunOpenRadioss():
                 engine_file_list=[self.deck]
 
             if self.debug==1:print("Engine_file_list:",engine_file_list)
-            self.stop_after_engine = False
             for engine_file in engine_file_list:
                 if self.stop_after_engine is True:
                     break
                 engine_command_line = self.get_engine_command(engine_file)
                 if self.debug==1:print("EngineCommand: ",engine_command_line)
-                self.job_process(engine_command_line,custom_env,self.exec_dir)
+                return_code = await self.timed_phase('engine', self.job_process(engine_command_line))
+                if return_code and self.status == 'finished':
+                    self.status = 'engine failed'
                 self.run_number = self.run_number + 1
 
+            if self.killed:
+                return
+
             # Execute TH to CSV
             # --------------------
-            self.convert_th_to_csv()
+            await self.timed_phase('th_to_csv', self.convert_th_to_csv())
 
             # Execute Anim to VTK
             # --------------------
-            self.convert_anim_to_vtk()
+            await self.timed_phase('anim_to_vtk', self.convert_anim_to_vtk())
 
             # Execute Anim to D3Plot
             # ----------------------
-            self.d3plot_conversion()
+            await self.timed_phase('anim_to_d3plot', self.run_function(self.d3plot_conversion))
 
             # Execute Anim to VTKHDF
             # --------------------
-            self.convert_anim_to_vtkhdf()
+            await self.timed_phase('anim_to_vtkhdf', self.run_function(self.convert_anim_to_vtkhdf))
 
         # Job Finished
         # ------------
-        print(" ")
-        print(" ")
-        print(" --------------------")
-        print(" Job Finished")
-        print(" --------------------")    
+        self.print(" ")
+        self.print(" ")
+        self.print(" --------------------")
+        self.print(" Job Finished")
+        self.print(" --------------------")
+
+    # -------------------------------------------------------------------------
+    # Run the job without GUI, returns True when all phases succeeded
+    # -------------------------------------------------------------------------
+    def batch_run(self):
+        try:
+            return get_supervisor().run(self.run_job())
+        except KeyboardInterrupt:
+            self.status = 'killed'
+            raise